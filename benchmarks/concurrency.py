@@ -0,0 +1,104 @@
+# ~/Alx_CapstoneProject/benchmarks/concurrency.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from .runner import percentile, unthrottled
+
+
+def summarize(timings, elapsed, statuses, peak_threads):
+    timings.sort()
+    return {
+        'requests': len(timings),
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'requests_per_second': round(len(timings) / elapsed, 1),
+        'errors': sum(1 for status in statuses if status is None or status >= 400),
+        'peak_threads': peak_threads,
+    }
+
+
+def send(client, request):
+    """
+    GETs a (path, headers) request; POSTs a (path, headers, data) one as JSON.
+    Returns what the client returns (a coroutine for AsyncClient).
+    """
+    path, headers, *data = request
+    if data:
+        return client.post(path, data[0], content_type='application/json', headers=headers)
+    return client.get(path, headers=headers)
+
+
+def run_wsgi(requests, concurrency):
+    """
+    Sends `requests` (see send()) through the WSGI handler from `concurrency`
+    threads, the way a threaded WSGI server would serve them. A request that
+    raises (e.g. OperationalError from the database) counts as an error.
+    """
+    timings, statuses = [], []
+    queue = iter(requests)
+    lock = threading.Lock()
+    peak_threads = threading.active_count()
+
+    def worker():
+        nonlocal peak_threads
+        client = Client()
+        try:
+            while True:
+                with lock:
+                    request = next(queue, None)
+                    peak_threads = max(peak_threads, threading.active_count())
+                if request is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    status = send(client, request).status_code
+                except Exception:
+                    status = None
+                duration = (time.perf_counter() - start) * 1000
+                with lock:
+                    timings.append(duration)
+                    statuses.append(status)
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with unthrottled(), ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(worker) for _ in range(concurrency)]
+        for future in futures:
+            future.result() # Re-raises anything that stopped a worker early
+    return summarize(timings, time.perf_counter() - started, statuses, peak_threads)
+
+
+def run_asgi(requests, concurrency):
+    """
+    Sends the same requests through the ASGI handler from `concurrency` coroutines
+    sharing one event loop, the way an ASGI server would serve them.
+    """
+    timings, statuses = [], []
+    peak_threads = threading.active_count()
+
+    async def worker(queue):
+        nonlocal peak_threads
+        client = AsyncClient()
+        for request in queue:
+            start = time.perf_counter()
+            response = await send(client, request)
+            timings.append((time.perf_counter() - start) * 1000)
+            statuses.append(response.status_code)
+            peak_threads = max(peak_threads, threading.active_count())
+
+    async def main():
+        queue = iter(requests)
+        await asyncio.gather(*(worker(queue) for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    with unthrottled():
+        asyncio.run(main())
+    return summarize(timings, time.perf_counter() - started, statuses, peak_threads)
@@ -0,0 +1,124 @@
+# ~/Alx_CapstoneProject/benchmarks/management/commands/benchmark_api.py
+
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from benchmarks.runner import find_regressions, run_benchmarks, test_database
+from benchmarks.seed import seed
+
+# Recorded with the default options. Runs are compared with its query counts unless
+# --baseline (which also compares p95 latency) or --no-baseline is given.
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / 'baselines' / 'wsgi-sqlite.json'
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the REST API in-process against a throwaway test database: seeds users "
+        "and tasks, then reports p50/p95/p99 latency, requests/s and queries per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help="Number of users to seed.")
+        parser.add_argument('--tasks-per-user', type=int, default=100, help="Number of tasks seeded per user.")
+        parser.add_argument('--iterations', type=int, default=50, help="Measured requests per endpoint.")
+        parser.add_argument(
+            '--client', choices=['wsgi', 'asgi'], default='wsgi',
+            help="Drive the app through the WSGI (test Client) or ASGI (AsyncClient) handler.",
+        )
+        parser.add_argument(
+            '--endpoint', action='append', dest='endpoints',
+            help="Only run this endpoint (register, login, token, task-list, task-detail). Repeatable.",
+        )
+        parser.add_argument(
+            '--hasher-iterations', type=int,
+            help="PBKDF2 iterations to hash and check passwords with (default: PASSWORD_PBKDF2_ITERATIONS).",
+        )
+        parser.add_argument(
+            '--baseline',
+            help=(
+                "JSON baseline to compare query counts and p95 latency against. Without it, only the "
+                "query counts are compared, with benchmarks/baselines/wsgi-sqlite.json."
+            ),
+        )
+        parser.add_argument(
+            '--no-baseline', action='store_true',
+            help="Only report the results, without comparing them to a baseline.",
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help="Allowed p95 slowdown over the baseline before it counts as a regression (0.25 = 25%%).",
+        )
+        parser.add_argument('--save-baseline', help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        hasher_iterations = options['hasher_iterations'] or settings.PASSWORD_PBKDF2_ITERATIONS
+        hasher_settings = override_settings(PASSWORD_PBKDF2_ITERATIONS=hasher_iterations)
+
+        with test_database(), hasher_settings:
+            users = seed(options['users'], options['tasks_per_user'])
+            results = run_benchmarks(users, options['iterations'], options['client'], options['endpoints'])
+
+        self.write_table(results)
+
+        # What a baseline must share with this run for the numbers to be comparable.
+        environment = {
+            'client': options['client'],
+            'users': options['users'],
+            'tasks_per_user': options['tasks_per_user'],
+            'iterations': options['iterations'],
+            'hasher_iterations': hasher_iterations,
+            'database': connection.vendor,
+        }
+
+        if options['save_baseline']:
+            Path(options['save_baseline']).write_text(json.dumps({
+                'environment': {
+                    **environment,
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                },
+                'results': results,
+            }, indent=2) + '\n')
+            self.stdout.write(f"Saved baseline to {options['save_baseline']}.")
+
+        if not options['no_baseline']:
+            self.compare(results, environment, options)
+
+    def compare(self, results, environment, options):
+        """
+        Compares the results with the baseline, raising CommandError on regressions.
+        Query counts are always compared. p95 latency depends on the machine and the
+        options, so it is only compared with an explicit --baseline recorded with
+        the same options.
+        """
+        baseline = json.loads(Path(options['baseline'] or DEFAULT_BASELINE).read_text())
+        timings = options['baseline'] is not None
+        if timings:
+            recorded = baseline['environment']
+            mismatches = [
+                f"{name} = {recorded.get(name)}" for name, value in environment.items() if recorded.get(name) != value
+            ]
+            if mismatches:
+                self.stderr.write(self.style.WARNING(
+                    "Not comparing p95 latency: the baseline was recorded with " + ", ".join(mismatches) + "."
+                ))
+                timings = False
+        regressions = find_regressions(results, baseline['results'], options['tolerance'], timings=timings)
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        compared = 'query counts and p95 latency' if timings else 'query counts'
+        self.stdout.write(self.style.SUCCESS(f"No regressions against the baseline ({compared})."))
+
+    def write_table(self, results):
+        self.stdout.write(f"{'endpoint':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'queries':>8}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['requests_per_second']:>9.1f} {result['queries']:>8}"
+            )
@@ -0,0 +1,70 @@
+# ~/Alx_CapstoneProject/benchmarks/management/commands/benchmark_concurrency.py
+
+import itertools
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.concurrency import run_asgi, run_wsgi
+from benchmarks.runner import test_database
+from benchmarks.seed import seed, task_ids_by_owner
+
+# Routes compared: (sync DRF view served through WSGI, async view served through ASGI).
+ENDPOINTS = {
+    'task-list': ('/api/tasks/', '/api/async/tasks/'),
+    'task-detail': ('/api/tasks/{pk}/', '/api/async/tasks/{pk}/'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the sync task views under WSGI (one thread per in-flight request) with the "
+        "async task views under ASGI (one event loop) at a given number of concurrent requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help="Number of users to seed.")
+        parser.add_argument('--tasks-per-user', type=int, default=50, help="Number of tasks seeded per user.")
+        parser.add_argument('--concurrency', type=int, default=200, help="Requests in flight at once.")
+        parser.add_argument('--requests', type=int, default=2000, help="Total requests per interface.")
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='task-list')
+
+    def handle(self, *args, **options):
+        sync_path, async_path = ENDPOINTS[options['endpoint']]
+        # Without the task-list response cache, so both sides do the same database work.
+        no_list_cache = override_settings(
+            CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'benchmark-dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            },
+            TASKS_LIST_CACHE_ALIAS='benchmark-dummy',
+        )
+        with test_database(), no_list_cache:
+            users = seed(options['users'], options['tasks_per_user'])
+            task_ids = task_ids_by_owner(users)
+            targets = [
+                ({'Authorization': f'Bearer {AccessToken.for_user(user)}'}, task_ids[user.pk])
+                for user in users
+            ]
+
+            def requests(template):
+                pairs = itertools.islice(itertools.cycle(targets), options['requests'])
+                return [(template.format(pk=pk), headers) for headers, pk in pairs]
+
+            results = {
+                'wsgi (sync views)': run_wsgi(requests(sync_path), options['concurrency']),
+                'asgi (async views)': run_asgi(requests(async_path), options['concurrency']),
+            }
+
+        self.stdout.write(
+            f"{options['endpoint']}, {options['requests']} requests, concurrency {options['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'interface':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7} {'threads':>8}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<20} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['requests_per_second']:>9.1f} {result['errors']:>7} {result['peak_threads']:>8}"
+            )
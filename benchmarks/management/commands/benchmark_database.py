@@ -0,0 +1,75 @@
+# ~/Alx_CapstoneProject/benchmarks/management/commands/benchmark_database.py
+
+import itertools
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.concurrency import run_wsgi
+from benchmarks.runner import test_database
+from benchmarks.seed import seed
+
+# SQLite connection settings compared against the configured SQLITE_PRAGMAS.
+SQLITE_ROLLBACK_JOURNAL = {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 5000}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures concurrent task-creation throughput (POST /api/tasks/ from many threads, "
+        "each with its own connection) on the configured database profile (DATABASE_ENGINE). "
+        "On SQLite the default rollback journal is compared with the SQLITE_PRAGMAS (WAL) profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help="Number of users creating tasks.")
+        parser.add_argument('--concurrency', type=int, default=16, help="Requests in flight at once.")
+        parser.add_argument('--requests', type=int, default=2000, help="Task creations per profile.")
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            profiles = {
+                'sqlite (rollback journal)': SQLITE_ROLLBACK_JOURNAL,
+                'sqlite (SQLITE_PRAGMAS)': settings.SQLITE_PRAGMAS,
+            }
+        else:
+            profiles = {connection.vendor: None}
+
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # WAL needs a database file; the test runner's default SQLite database is in memory.
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+            with test_database():
+                users = seed(options['users'], 0)
+                tokens = [{'Authorization': f'Bearer {AccessToken.for_user(user)}'} for user in users]
+                for name, pragmas in profiles.items():
+                    results[name] = self.run_profile(pragmas, tokens, options)
+
+        self.stdout.write(
+            f"POST /api/tasks/, {options['requests']} requests, concurrency {options['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'profile':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'writes/s':>9} {'errors':>7}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<28} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['requests_per_second']:>9.1f} {result['errors']:>7}"
+            )
+
+    @staticmethod
+    def run_profile(pragmas, tokens, options):
+        requests = [
+            ('/api/tasks/', headers, {'title': f'Benchmark task {i}'})
+            for i, headers in zip(range(options['requests']), itertools.cycle(tokens))
+        ]
+        profile = override_settings(SQLITE_PRAGMAS=pragmas) if pragmas is not None else override_settings()
+        with profile:
+            connections.close_all() # Reconnect (and re-run the connection hook) with this profile
+            connection.ensure_connection()
+            return run_wsgi(requests, options['concurrency'])
@@ -0,0 +1,92 @@
+# ~/Alx_CapstoneProject/benchmarks/management/commands/benchmark_json.py
+
+import datetime
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.runner import percentile
+from todo_list_api import renderers
+from todo_list_api.parsers import FastJSONParser
+from todo_list_api.renderers import FastJSONRenderer
+
+
+def task_payloads(count, objects):
+    """
+    Returns `count` task dicts shaped like the task list's. With `objects`, dates and
+    datetimes are left as Python objects for the renderer to format (as in responses
+    built from model values); otherwise they are already strings, as TaskSerializer
+    and TaskRowEncoder produce them.
+    """
+    created = datetime.datetime(2025, 1, 1, 9, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+    tasks = []
+    for i in range(count):
+        due_date = datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 90) if i % 3 else None
+        created_at = created + datetime.timedelta(minutes=i)
+        task = {
+            'id': i + 1,
+            'owner': 'bench0',
+            'title': f'Benchmark task {i}',
+            'description': 'Write the quarterly report and send it to the team.' if i % 2 else None,
+            'due_date': due_date,
+            'is_completed': i % 4 == 0,
+            'created_at': created_at,
+            'updated_at': created_at,
+        }
+        if not objects:
+            task['due_date'] = due_date and due_date.isoformat()
+            task['created_at'] = task['updated_at'] = created_at.isoformat()[:-6] + 'Z'
+        tasks.append(task)
+    return tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSONRenderer/JSONParser (standard library json) with the project's "
+        "FastJSONRenderer/FastJSONParser on task lists: median encode and decode times and output bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+            help="Task list lengths to encode.",
+        )
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per measurement.")
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stderr.write(self.style.WARNING("orjson is not installed: FastJSONRenderer uses the standard library."))
+
+        self.stdout.write(
+            f"{'tasks':>6} {'values':<8} {'renderer':<18} {'encode ms':>10} {'decode ms':>10} {'bytes':>10}"
+        )
+        cases = [
+            ('JSONRenderer', JSONRenderer(), JSONParser()),
+            ('FastJSONRenderer', FastJSONRenderer(), FastJSONParser()),
+        ]
+        for size in options['sizes']:
+            for values, objects in [('strings', False), ('objects', True)]:
+                data = task_payloads(size, objects)
+                outputs = set()
+                for name, renderer, parser in cases:
+                    content = renderer.render(data)
+                    outputs.add(content)
+                    encode = self.median_ms(lambda: renderer.render(data), options['repeat'])
+                    decode = self.median_ms(lambda: parser.parse(io.BytesIO(content)), options['repeat'])
+                    self.stdout.write(
+                        f"{size:>6} {values:<8} {name:<18} {encode:>10.3f} {decode:>10.3f} {len(content):>10}"
+                    )
+                if len(outputs) != 1:
+                    self.stderr.write(self.style.ERROR(f"The renderers' output differs for {size} tasks ({values})."))
+
+    @staticmethod
+    def median_ms(function, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return percentile(sorted(timings), 0.5)
@@ -0,0 +1,143 @@
+# ~/Alx_CapstoneProject/benchmarks/management/commands/benchmark_profiles.py
+
+import json
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks.runner import Driver, build_scenarios, percentile, run_scenario, test_database, unthrottled
+from benchmarks.seed import seed
+
+# Settings module and WSGI entry point of each profile.
+PROFILES = {
+    'full': ('todo_list_api.settings', 'todo_list_api.wsgi'),
+    'api': ('todo_list_api.settings_api', 'todo_list_api.wsgi_api'),
+}
+
+# Run in a fresh interpreter: loads the entry point, sends one request through it
+# (unauthenticated, so no database is needed) and prints when each step finished.
+COLD_START = '''
+import json, os, sys, time
+from importlib import import_module
+from wsgiref.util import setup_testing_defaults
+
+os.environ['DJANGO_SETTINGS_MODULE'] = sys.argv[1]
+application = import_module(sys.argv[2]).application
+loaded = time.time()
+environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/tasks/'}
+setup_testing_defaults(environ)
+statuses = []
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+print(json.dumps({'loaded': loaded, 'responded': time.time(), 'status': statuses[0]}))
+'''
+
+
+def parse_importtime(output):
+    """
+    Returns {module: (self_us, cumulative_us, depth)} from `python -X importtime` output.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(own), int(cumulative), depth)
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the full settings profile with the API-only one (settings_api.py): cold start "
+        "(import time and time to the first response of a fresh process) and the per-request "
+        "cost of each profile's middleware stack."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help="Fresh processes started per profile.")
+        parser.add_argument('--top', type=int, default=8, help="Slowest top-level imports listed per profile.")
+        parser.add_argument('--users', type=int, default=20, help="Number of users to seed.")
+        parser.add_argument('--tasks-per-user', type=int, default=100, help="Number of tasks seeded per user.")
+        parser.add_argument('--iterations', type=int, default=500, help="Measured requests per endpoint and profile.")
+
+    def handle(self, *args, **options):
+        self.cold_start(options['runs'], options['top'])
+        self.per_request(options['users'], options['tasks_per_user'], options['iterations'])
+
+    def cold_start(self, runs, top):
+        results = {}
+        for name, (settings_module, entry_point) in PROFILES.items():
+            imports, loads, responses = [], [], []
+            for _ in range(runs):
+                started = time.time()
+                process = subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', COLD_START, settings_module, entry_point],
+                    capture_output=True, text=True, cwd=settings.BASE_DIR,
+                )
+                if process.returncode:
+                    raise CommandError(f"The {name} profile failed to start:\n{process.stderr[-2000:]}")
+                timings = json.loads(process.stdout.splitlines()[-1])
+                modules = parse_importtime(process.stderr)
+                imports.append(sum(own for own, _, _ in modules.values()) / 1000)
+                loads.append((timings['loaded'] - started) * 1000)
+                responses.append((timings['responded'] - started) * 1000)
+            results[name] = modules, imports, loads, responses
+
+        self.stdout.write("Cold start (medians of fresh processes; times from process launch):")
+        self.stdout.write(
+            f"{'profile':<8} {'modules':>8} {'import ms':>10} {'app loaded ms':>14} {'first response ms':>18}"
+        )
+        for name, (modules, imports, loads, responses) in results.items():
+            self.stdout.write(
+                f"{name:<8} {len(modules):>8} {percentile(sorted(imports), 0.5):>10.1f} "
+                f"{percentile(sorted(loads), 0.5):>14.1f} {percentile(sorted(responses), 0.5):>18.1f}"
+            )
+        for name, (modules, *_) in results.items():
+            slowest = sorted(
+                ((cumulative, module) for module, (_, cumulative, depth) in modules.items() if depth == 0),
+                reverse=True,
+            )[:top]
+            self.stdout.write(f"\nSlowest top-level imports ({name}):")
+            for cumulative, module in slowest:
+                self.stdout.write(f"  {cumulative / 1000:>8.1f} ms  {module}")
+        skipped = results['full'][0].keys() - results['api'][0].keys()
+        packages = sorted({module.rsplit('.', 1)[0] if module.count('.') > 2 else module for module in skipped})
+        self.stdout.write(f"\nModules the api profile does not import: {len(skipped)}")
+        self.stdout.write("  " + ", ".join(packages[:40]) + (", ..." if len(packages) > 40 else ""))
+
+    def per_request(self, users, tasks_per_user, iterations):
+        api = import_module(PROFILES['api'][0])
+        profiles = {
+            'full': {},
+            'api': {
+                'MIDDLEWARE': api.MIDDLEWARE,
+                'ROOT_URLCONF': api.ROOT_URLCONF,
+                'REST_FRAMEWORK': api.REST_FRAMEWORK,
+            },
+        }
+        results = {}
+        with test_database():
+            seeded = seed(users, tasks_per_user)
+            for name, overrides in profiles.items():
+                with override_settings(**overrides):
+                    # A new client per profile: Django loads the middleware chain on its first request.
+                    driver = Driver('wsgi')
+                    scenarios = build_scenarios(seeded)
+                    with unthrottled():
+                        for scenario in ('task-list', 'task-detail'):
+                            results[scenario, name] = run_scenario(driver, scenarios[scenario], iterations, warmup=20)
+
+        self.stdout.write(f"\nPer request ({len(settings.MIDDLEWARE)} middleware full, {len(api.MIDDLEWARE)} api):")
+        self.stdout.write(f"{'endpoint':<12} {'full p50 ms':>12} {'api p50 ms':>11} {'saved ms':>9} {'full rps':>9} {'api rps':>8}")
+        for scenario in ('task-list', 'task-detail'):
+            full, api_result = results[scenario, 'full'], results[scenario, 'api']
+            self.stdout.write(
+                f"{scenario:<12} {full['p50_ms']:>12.3f} {api_result['p50_ms']:>11.3f} "
+                f"{full['p50_ms'] - api_result['p50_ms']:>9.3f} {full['requests_per_second']:>9.1f} "
+                f"{api_result['requests_per_second']:>8.1f}"
+            )
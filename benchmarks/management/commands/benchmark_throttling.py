@@ -0,0 +1,65 @@
+# ~/Alx_CapstoneProject/benchmarks/management/commands/benchmark_throttling.py
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from benchmarks.runner import Driver, build_scenarios, run_scenario, test_database, unthrottled
+from benchmarks.seed import seed
+
+# The throttle_scope of each benchmarked endpoint.
+SCOPES = {
+    'register': 'register',
+    'login': 'login',
+    'token': 'token',
+    'task-list': 'tasks',
+    'task-detail': 'tasks',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures what a rate-limited request costs: for each endpoint, the latency and query "
+        "count of requests that are served, against requests rejected with 429 by an exhausted "
+        "per-IP token bucket (todo_list_api/throttling.py)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help="Number of users to seed.")
+        parser.add_argument('--tasks-per-user', type=int, default=100, help="Number of tasks seeded per user.")
+        parser.add_argument('--iterations', type=int, default=200, help="Measured requests per endpoint and case.")
+        parser.add_argument(
+            '--client', choices=['wsgi', 'asgi'], default='wsgi',
+            help="Drive the app through the WSGI (test Client) or ASGI (AsyncClient) handler.",
+        )
+
+    def handle(self, *args, **options):
+        results = {}
+        with test_database():
+            users = seed(options['users'], options['tasks_per_user'])
+            driver = Driver(options['client'])
+            scenarios = build_scenarios(users)
+            for name, (method, expected_status, make_request) in scenarios.items():
+                with unthrottled():
+                    served = run_scenario(driver, (method, expected_status, make_request), options['iterations'])
+                rejected = self.run_rejected(driver, SCOPES[name], (method, 429, make_request), options['iterations'])
+                results[name] = served, rejected
+
+        self.stdout.write(
+            f"{'endpoint':<12} {'served p50 ms':>14} {'rejected p50 ms':>16} {'rejected p99 ms':>16} "
+            f"{'rejected queries':>17} {'speedup':>8}"
+        )
+        for name, (served, rejected) in results.items():
+            self.stdout.write(
+                f"{name:<12} {served['p50_ms']:>14.3f} {rejected['p50_ms']:>16.3f} {rejected['p99_ms']:>16.3f} "
+                f"{rejected['queries']:>17} {served['p50_ms'] / rejected['p50_ms']:>7.1f}x"
+            )
+
+    @staticmethod
+    def run_rejected(driver, scope, scenario, iterations):
+        # One request per day from this address: the warm-up request takes the only token.
+        rates = {f'{scope}.ip': '1/day'}
+        caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')].clear()
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            return run_scenario(driver, scenario, iterations)
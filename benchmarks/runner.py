@@ -0,0 +1,189 @@
+# ~/Alx_CapstoneProject/benchmarks/runner.py
+
+import itertools
+import json
+import math
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.sharding import get_shards
+
+from .seed import PASSWORD, task_ids_by_owner
+
+
+@contextmanager
+def test_database():
+    """
+    Runs the block against throwaway test databases ('default' and every task
+    shard), like the test runner does, so benchmarks never touch real data.
+    """
+    setup_test_environment()
+    old_names = []
+    try:
+        for alias in get_shards():
+            old_names.append((alias, connections[alias].creation.create_test_db(verbosity=0, autoclobber=True)))
+        yield
+    finally:
+        for alias, old_name in reversed(old_names):
+            connections[alias].creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def unthrottled():
+    """
+    Turns the API's rate limits off for the block: benchmarks send every request
+    from one address, and measure the endpoints rather than 429 responses.
+    """
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}})
+
+
+class Driver:
+    """
+    Sends requests to the application in-process and returns (status_code, query_count).
+    `wsgi` goes through Django's WSGI handler (django.test.Client), `asgi` through the
+    ASGI handler (django.test.AsyncClient); both exercise the full middleware stack.
+    """
+
+    def __init__(self, interface='wsgi'):
+        if interface not in ('wsgi', 'asgi'):
+            raise ValueError(f"Unknown client interface: {interface!r}")
+        self.interface = interface
+        self.client = Client() if interface == 'wsgi' else AsyncClient()
+
+    def request(self, method, path, data=None, token=None):
+        kwargs = {'content_type': 'application/json'} if data is not None else {}
+        if token is not None:
+            kwargs['headers'] = {'Authorization': f'Bearer {token}'}
+        send = getattr(self.client, method)
+        if self.interface == 'asgi':
+            # Sync database work runs back on this thread, so the queries are captured.
+            send = async_to_sync(send)
+        with ExitStack() as stack:
+            # Counted on every database that stores tasks ('default' and the shards).
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in get_shards()]
+            response = send(path, json.dumps(data) if data is not None else None, **kwargs)
+        return response.status_code, sum(len(queries.captured_queries) for queries in captured)
+
+
+def build_scenarios(users):
+    """
+    Returns {name: (method, expected_status, request_factory)} for the benchmarked
+    endpoints. Each factory is called once per request and returns (path, data, token),
+    cycling through the seeded users.
+    """
+    tokens = {user.pk: str(AccessToken.for_user(user)) for user in users}
+    task_ids = task_ids_by_owner(users)
+    next_user = itertools.cycle(users).__next__
+    # Past the number of existing users, so repeated runs never register a taken username.
+    new_user_ids = itertools.count(get_user_model().objects.count())
+
+    def register():
+        i = next(new_user_ids)
+        return '/api/users/register/', {
+            'username': f'bench-new{i}', 'email': f'bench-new{i}@example.com',
+            'password': PASSWORD, 'password2': PASSWORD,
+        }, None
+
+    def login():
+        return '/api/users/login/', {'username': next_user().username, 'password': PASSWORD}, None
+
+    def token():
+        return '/api/token/', {'username': next_user().username, 'password': PASSWORD}, None
+
+    def task_list():
+        return '/api/tasks/', None, tokens[next_user().pk]
+
+    def task_detail():
+        user = next_user()
+        return f'/api/tasks/{task_ids[user.pk]}/', None, tokens[user.pk]
+
+    scenarios = {
+        'register': ('post', 201, register),
+        'login': ('post', 200, login),
+        'token': ('post', 200, token),
+        'task-list': ('get', 200, task_list),
+    }
+    if len(task_ids) == len(users):
+        scenarios['task-detail'] = ('get', 200, task_detail)
+    return scenarios
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def run_scenario(driver, scenario, iterations, warmup=1):
+    """
+    Runs one scenario and returns its latency (ms), throughput and query-count summary.
+    """
+    method, expected_status, make_request = scenario
+    for _ in range(warmup):
+        driver.request(method, *make_request())
+
+    timings, query_counts = [], []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        path, data, token = make_request()
+        start = time.perf_counter()
+        status, queries = driver.request(method, path, data, token)
+        timings.append((time.perf_counter() - start) * 1000)
+        if status != expected_status:
+            raise AssertionError(f"{method.upper()} {path} returned {status}, expected {expected_status}.")
+        query_counts.append(queries)
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'requests_per_second': round(iterations / elapsed, 1),
+        'queries': max(query_counts),
+    }
+
+
+def run_benchmarks(users, iterations, interface='wsgi', only=None):
+    """
+    Runs every scenario (or those named in `only`) against the seeded users.
+    """
+    driver = Driver(interface)
+    scenarios = build_scenarios(users)
+    with unthrottled():
+        return {
+            name: run_scenario(driver, scenario, iterations)
+            for name, scenario in scenarios.items()
+            if not only or name in only
+        }
+
+
+def find_regressions(results, baseline, tolerance=0.25, timings=True):
+    """
+    Compares results with a stored baseline and returns a list of messages, one per
+    regression: any increase in query count, or (with `timings`) a p95 more than
+    `tolerance` slower. Endpoints missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['queries'] > reference['queries']:
+            regressions.append(f"{name}: {result['queries']} queries per request (baseline {reference['queries']})")
+        if timings and result['p95_ms'] > reference['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms (baseline {reference['p95_ms']} ms)")
+    return regressions
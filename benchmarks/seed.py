@@ -0,0 +1,84 @@
+# ~/Alx_CapstoneProject/benchmarks/seed.py
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS
+
+from tasks import sharding
+from tasks.models import Task, TaskPlacement
+
+User = get_user_model()
+
+PASSWORD = 'bench-pass-12345'
+
+
+def seed(users, tasks_per_user, batch_size=5000):
+    """
+    Creates `users` users with `tasks_per_user` tasks each through bulk inserts and
+    returns the users. All users share PASSWORD, hashed once rather than per user.
+    With task shards, users are placed by hash like registered ones, and each
+    shard gets its own task batches.
+    """
+    password = make_password(PASSWORD)
+    created = User.objects.bulk_create(
+        [User(username=f'bench{i}', email=f'bench{i}@example.com', password=password) for i in range(users)],
+        batch_size=batch_size,
+    )
+    # bulk_create only sets primary keys on some backends; read them back.
+    created = list(User.objects.filter(username__in=[user.username for user in created]).order_by('pk'))
+    shards = dict.fromkeys((user.pk for user in created), DEFAULT_DB_ALIAS)
+    if sharding.is_enabled():
+        # bulk_create sends no post_save, so tasks.signals.place_new_user does not run.
+        shards = {user.pk: sharding.hash_shard(user.pk) for user in created}
+        TaskPlacement.objects.bulk_create(
+            [TaskPlacement(owner_id=owner_id, shard=shard) for owner_id, shard in shards.items()],
+            batch_size=batch_size,
+        )
+
+    today = datetime.date.today()
+
+    def tasks():
+        for user in created:
+            for i in range(tasks_per_user):
+                yield Task(
+                    owner=user,
+                    title=f'Task {i} of {user.username}',
+                    description='Seeded for benchmarking' if i % 2 else None,
+                    due_date=today + datetime.timedelta(days=i % 30) if i % 3 else None,
+                    is_completed=i % 4 == 0,
+                )
+
+    batches = {}
+    for task in tasks():
+        shard = shards[task.owner_id]
+        batch = batches.setdefault(shard, [])
+        batch.append(task)
+        if len(batch) == batch_size:
+            Task.objects.using(shard).bulk_create(batch)
+            batch.clear()
+    for shard, batch in batches.items():
+        if batch:
+            Task.objects.using(shard).bulk_create(batch)
+    return created
+
+
+def shard_of(owner_id):
+    return sharding.shard_for(owner_id) or DEFAULT_DB_ALIAS
+
+
+def task_ids_by_owner(users):
+    """
+    Returns {user pk: the pk of one of their tasks} for the users that have tasks,
+    with one query per shard.
+    """
+    by_shard = {}
+    for user in users:
+        by_shard.setdefault(shard_of(user.pk), []).append(user.pk)
+    task_ids = {}
+    for shard, owner_ids in by_shard.items():
+        task_ids.update(
+            Task.objects.using(shard).filter(owner__in=owner_ids).order_by('owner', 'pk').values_list('owner', 'pk')
+        )
+    return task_ids
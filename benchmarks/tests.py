@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import tempfile
+from contextlib import closing
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks import sharding
+from tasks.models import Task
+
+from .concurrency import run_asgi, run_wsgi
+from .management.commands.benchmark_api import DEFAULT_BASELINE, Command as BenchmarkCommand
+from .runner import Driver, find_regressions, percentile, run_benchmarks
+from .seed import seed, task_ids_by_owner
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BenchmarkSuiteTests(TestCase):
+    """
+    Smoke tests for the benchmark suite, on a tiny data set.
+    """
+
+    def test_seed_bulk_inserts_users_and_tasks(self):
+        with self.assertNumQueries(4): # user insert + read back + 2 task batches
+            users = seed(3, 4, batch_size=10)
+        self.assertEqual(len(users), 3)
+        self.assertEqual(Task.objects.filter(owner=users[0]).count(), 4)
+        self.assertEqual(Task.objects.count(), 12)
+
+    def test_runs_every_endpoint_on_both_interfaces(self):
+        users = seed(2, 3)
+        for interface in ('wsgi', 'asgi'):
+            results = run_benchmarks(users, iterations=2, interface=interface)
+            self.assertEqual(set(results), {'register', 'login', 'token', 'task-list', 'task-detail'})
+            for result in results.values():
+                self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+                self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+                self.assertGreater(result['requests_per_second'], 0)
+            self.assertEqual(results['task-detail']['queries'], 1)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_find_regressions(self):
+        baseline = {'task-list': {'p95_ms': 10.0, 'queries': 2}}
+        self.assertEqual(find_regressions({'task-list': {'p95_ms': 12.0, 'queries': 2}}, baseline), [])
+        self.assertEqual(find_regressions({'other': {'p95_ms': 99.0, 'queries': 9}}, baseline), [])
+        regressions = find_regressions({'task-list': {'p95_ms': 13.0, 'queries': 3}}, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(find_regressions({'task-list': {'p95_ms': 99.0, 'queries': 2}}, baseline, timings=False), [])
+
+    def test_baseline_comparison(self):
+        baseline = json.loads(DEFAULT_BASELINE.read_text())
+        environment = {name: baseline['environment'][name] for name in ('client', 'users', 'iterations')}
+        slow = {name: {**result, 'p95_ms': result['p95_ms'] * 10} for name, result in baseline['results'].items()}
+        command = BenchmarkCommand(stdout=StringIO(), stderr=StringIO())
+
+        def compare(results, baseline=None, **overrides):
+            command.compare(results, {**environment, **overrides}, {'baseline': baseline, 'tolerance': 0.25})
+
+        # The committed baseline: query counts only, whatever the options or the timings.
+        compare(slow, client='asgi')
+        more_queries = {**slow, 'task-list': {**slow['task-list'], 'queries': slow['task-list']['queries'] + 1}}
+        with self.assertRaisesMessage(CommandError, 'task-list: '):
+            compare(more_queries)
+
+        # An explicit baseline also compares p95 latency, if recorded with the same options.
+        with self.assertRaisesMessage(CommandError, 'p95'):
+            compare(slow, baseline=str(DEFAULT_BASELINE))
+        compare(slow, baseline=str(DEFAULT_BASELINE), iterations=10)
+        self.assertIn('Not comparing p95 latency', command.stderr.getvalue())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ShardedBenchmarkTests(TransactionTestCase):
+    """
+    The benchmark suite with tasks sharded over 'default' and a second SQLite file.
+    """
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Uses an SQLite file as the second shard.')
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(TASK_SHARDS=['default', 'shard1']))
+        connections.settings['shard1'] = {**connections.settings['default'], 'NAME': str(Path(directory.name) / 'shard1')}
+        self.addCleanup(connections.settings.pop, 'shard1')
+        self.addCleanup(self.remove_shard_connection)
+        connection.ensure_connection()
+        target = sqlite3.connect(connections['shard1'].settings_dict['NAME'])
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+        # Connected here: the test case refuses to open connections to aliases it
+        # does not know about, and the shard is added after it starts.
+        connections['shard1'].connect()
+        sharding.reserve_id_range(None, using='shard1')
+
+    @staticmethod
+    def remove_shard_connection():
+        connections['shard1'].close()
+        del connections['shard1']
+
+    def test_seeds_and_runs_on_every_shard(self):
+        users = seed(16, 2, batch_size=3)
+        counts = {alias: Task.objects.using(alias).count() for alias in ('default', 'shard1')}
+        self.assertEqual(sum(counts.values()), 32)
+        self.assertTrue(all(counts.values()), counts) # 16 users: both shards get some
+        for user in users:
+            self.assertEqual(sharding.get_placement(user.pk)[0], sharding.hash_shard(user.pk))
+            self.assertEqual(user.tasks.count(), 2)
+        task_ids = task_ids_by_owner(users)
+        self.assertEqual(set(task_ids), {user.pk for user in users})
+
+        results = run_benchmarks(users, iterations=2)
+        self.assertEqual(set(results), {'register', 'login', 'token', 'task-list', 'task-detail'})
+        # A user on shard1: with the user cached, the task SELECT on the shard is the only query.
+        user = next(user for user in users if sharding.hash_shard(user.pk) == 'shard1')
+        driver, token = Driver(), str(AccessToken.for_user(user))
+        for _ in range(2):
+            status, queries = driver.request('get', f'/api/tasks/{task_ids[user.pk]}/', token=token)
+        self.assertEqual((status, queries), (200, 1))
+
+
+class ConcurrencyBenchmarkTests(TransactionTestCase):
+    """
+    Smoke test for the WSGI-vs-ASGI concurrency benchmark. A TransactionTestCase,
+    because the WSGI run serves requests from other threads (other connections).
+    """
+
+    def test_both_interfaces_serve_every_request(self):
+        users = seed(2, 3)
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(users[0])}'}
+        for run, path in [(run_wsgi, '/api/tasks/'), (run_asgi, '/api/async/tasks/')]:
+            result = run([(path, headers)] * 6, concurrency=3)
+            self.assertEqual(result['requests'], 6)
+            self.assertEqual(result['errors'], 0)
+
+    def test_concurrent_writes(self):
+        users = seed(2, 0)
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(users[0])}'}
+        path = self.use_database_file()
+        result = run_wsgi([('/api/tasks/', headers, {'title': f'Task {i}'}) for i in range(8)], concurrency=4)
+        self.assertEqual(result['requests'], 8)
+        self.assertEqual(result['errors'], 0)
+        with closing(sqlite3.connect(path)) as database:
+            (count,), = database.execute('SELECT COUNT(*) FROM tasks_task WHERE owner_id = ?', [users[0].pk])
+        self.assertEqual(count, 8)
+
+    def test_worker_exceptions_count_as_errors(self):
+        users = seed(1, 0)
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(users[0])}'}
+        with mock.patch('tasks.views.TaskListCreateAPIView.create', side_effect=OperationalError('database is locked')):
+            result = run_wsgi([('/api/tasks/', headers, {'title': 'Task'})] * 4, concurrency=2)
+        self.assertEqual(result['requests'], 4)
+        self.assertEqual(result['errors'], 4)
+
+    def use_database_file(self):
+        """
+        Points the worker threads' 'default' connections at a file copy of the test
+        database, as benchmark_database does: concurrent writers on the in-memory
+        (shared-cache) test database fail with "database table is locked" instead
+        of waiting on the busy timeout. This thread keeps its in-memory connection.
+        Returns the file's path.
+        """
+        if connection.vendor != 'sqlite':
+            self.skipTest('Copies the SQLite test database to a file.')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = str(Path(directory.name) / 'writes.sqlite3')
+        connection.ensure_connection()
+        with closing(sqlite3.connect(path)) as target:
+            connection.connection.backup(target)
+        # Shared by every thread's connection to 'default'.
+        self.addCleanup(connection.settings_dict.__setitem__, 'NAME', connection.settings_dict['NAME'])
+        connection.settings_dict['NAME'] = path
+        return path
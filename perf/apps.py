@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class PerfConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'perf'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        from .timing import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
+        # Connections opened before this app was ready.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(sender=None, connection=connection)
@@ -0,0 +1,74 @@
+# ~/Alx_CapstoneProject/perf/histogram.py
+
+import bisect
+import threading
+
+# Upper bounds (ms) of the latency buckets; the last bucket is unbounded.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistograms:
+    """
+    In-process latency histograms of sampled requests, one per (method, route).
+    Each histogram keeps bucket counts of the total time, plus the summed total,
+    SQL and span times so averages can be derived. Counts are per worker process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, key, timings, total):
+        bucket = bisect.bisect_left(BUCKETS_MS, total * 1000)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'count': 0,
+                    'buckets': [0] * (len(BUCKETS_MS) + 1),
+                    'total_ms': 0.0,
+                    'db_ms': 0.0,
+                    'db_queries': 0,
+                    'spans_ms': {},
+                }
+            histogram['count'] += 1
+            histogram['buckets'][bucket] += 1
+            histogram['total_ms'] += total * 1000
+            histogram['db_ms'] += timings.db_time * 1000
+            histogram['db_queries'] += timings.db_queries
+            for name, duration in timings.spans.items():
+                histogram['spans_ms'][name] = histogram['spans_ms'].get(name, 0.0) + duration * 1000
+
+    def snapshot(self):
+        """
+        Returns a JSON-serializable copy: one entry per route with cumulative
+        bucket counts (keyed by upper bound, '+Inf' last) and averages.
+        """
+        with self.lock:
+            items = [(key, dict(histogram, buckets=list(histogram['buckets']), spans_ms=dict(histogram['spans_ms'])))
+                     for key, histogram in self.histograms.items()]
+        result = []
+        for (method, route), histogram in sorted(items):
+            count = histogram['count']
+            buckets, cumulative = {}, 0
+            for bound, bucket_count in zip(list(BUCKETS_MS) + ['+Inf'], histogram['buckets']):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            result.append({
+                'method': method,
+                'route': route,
+                'count': count,
+                'buckets_ms': buckets,
+                'avg_total_ms': round(histogram['total_ms'] / count, 3),
+                'avg_db_ms': round(histogram['db_ms'] / count, 3),
+                'avg_db_queries': round(histogram['db_queries'] / count, 2),
+                'avg_spans_ms': {name: round(value / count, 3) for name, value in histogram['spans_ms'].items()},
+            })
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+
+request_histograms = LatencyHistograms()
@@ -0,0 +1,84 @@
+# ~/Alx_CapstoneProject/perf/middleware.py
+
+import json
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .histogram import request_histograms
+from .timing import RequestTimings, current_timings
+
+logger = logging.getLogger('perf.requests')
+
+
+class PerfMiddleware:
+    """
+    Records, for a sample of requests (PERF_SAMPLE_RATE, 0.0 to 1.0), the SQL query
+    count and time, the time of the instrumented spans (JWT 'auth', password 'hash',
+    'serialize'; see perf.timing.timed) and the total wall time.
+    The results are sent back in a Server-Timing header, logged as one JSON line on
+    the 'perf.requests' logger and added to the in-process histograms (/api/perf/).
+    A request that is not sampled costs one random() call.
+    Works under WSGI and ASGI; under ASGI it does not push async views to a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.report(request, response, timings)
+
+    @staticmethod
+    def sampled():
+        sample_rate = getattr(settings, 'PERF_SAMPLE_RATE', 0.0)
+        return sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate)
+
+    def report(self, request, response, timings):
+        total = timings.total
+
+        match = request.resolver_match
+        route = match.route if match is not None else '<unresolved>'
+        request_histograms.record((request.method, route), timings, total)
+
+        metrics = [f'db;dur={timings.db_time * 1000:.3f};desc="{timings.db_queries} queries"']
+        metrics += [f'{name};dur={duration * 1000:.3f}' for name, duration in timings.spans.items()]
+        metrics.append(f'total;dur={total * 1000:.3f}')
+        response['Server-Timing'] = ', '.join(metrics)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'route': route,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'db_ms': round(timings.db_time * 1000, 3),
+            'db_queries': timings.db_queries,
+            **{f'{name}_ms': round(duration * 1000, 3) for name, duration in timings.spans.items()},
+        }))
+        return response
@@ -0,0 +1,98 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.models import Task
+from users.cache import user_cache
+
+from .histogram import request_histograms
+from .timing import RequestTimings, current_timings, timed
+
+User = get_user_model()
+
+
+@override_settings(PERF_SAMPLE_RATE=1.0)
+class PerfMiddlewareTests(APITestCase):
+    """
+    Tests for the Server-Timing header, the structured log line and the histograms.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+        cls.staff = User.objects.create_user(
+            email='staff@example.com', username='staff', password='pass12345', is_staff=True,
+        )
+        Task.objects.create(owner=cls.user, title='Timed')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        request_histograms.clear()
+        self.url = reverse('tasks:task-list-create')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_server_timing_header(self):
+        with self.assertLogs('perf.requests', 'INFO') as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        metrics = dict(metric.split(';', 1) for metric in response['Server-Timing'].split(', '))
+        self.assertEqual(set(metrics), {'db', 'auth', 'serialize', 'total'})
+        self.assertIn('desc="3 queries"', metrics['db']) # user + ETag aggregate + task list
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['route'], 'api/tasks/')
+        self.assertEqual(line['status'], 200)
+        self.assertEqual(line['db_queries'], 3)
+        self.assertLessEqual(line['db_ms'] + line['auth_ms'] + line['serialize_ms'], line['total_ms'])
+
+    @override_settings(PERF_SAMPLE_RATE=0.0)
+    def test_sampled_out_requests_are_not_timed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(request_histograms.snapshot(), [])
+
+    def test_histogram_endpoint_is_staff_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        histograms_url = reverse('perf:request-histograms')
+        self.assertEqual(self.client.get(histograms_url).status_code, 403)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.staff)}')
+        response = self.client.get(histograms_url)
+        self.assertEqual(response.status_code, 200)
+        routes = {(entry['method'], entry['route']): entry for entry in response.data['routes']}
+        task_list = routes[('GET', 'api/tasks/')]
+        self.assertEqual(task_list['count'], 2)
+        self.assertEqual(task_list['buckets_ms']['+Inf'], 2)
+
+        self.assertEqual(self.client.delete(histograms_url).status_code, 204)
+        # Only the DELETE itself, recorded after the reset.
+        self.assertEqual([entry['route'] for entry in request_histograms.snapshot()], ['api/perf/'])
+
+
+class TimedTests(TestCase):
+    """
+    Tests for the timed() span helper.
+    """
+
+    def test_noop_without_current_request(self):
+        with timed('serialize'):
+            pass
+        self.assertIsNone(current_timings.get())
+
+    def test_span_excludes_sql(self):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            with timed('serialize'):
+                timings.db_time += 10.0 # As if the block had run 10 s of SQL
+        finally:
+            current_timings.reset(token)
+        self.assertLess(timings.spans['serialize'], 1.0)
@@ -0,0 +1,75 @@
+# ~/Alx_CapstoneProject/perf/timing.py
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# The RequestTimings of the request being handled, or None when it was not sampled.
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    """
+    Per-request accumulator of where the time went: SQL (count and time, fed by
+    record_query()) and named spans such as 'auth', 'hash' and 'serialize'. Span
+    times exclude the SQL run inside them, so the parts never overlap and add up to
+    at most the total.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.spans = {}
+
+    def add(self, name, duration):
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper, installed on every connection when it is opened
+    (see PerfConfig.ready()). The context variable follows a request into the
+    threads sync_to_async() runs its queries in, so async views are timed too.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_time += time.perf_counter() - start
+        timings.db_queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created handler: adds record_query() to the connection's execute
+    wrappers (once; the wrapper object outlives reconnects). It goes first in the
+    list, because connection.execute_wrapper() blocks pop their wrapper off the end.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@contextmanager
+def timed(name):
+    """
+    Adds the time spent in the block (minus its SQL) to the current request's span
+    `name`. Costs one context variable lookup when the request is not sampled.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    db_time = timings.db_time
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start - (timings.db_time - db_time))
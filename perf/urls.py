@@ -0,0 +1,12 @@
+# ~/Alx_CapstoneProject/perf/urls.py
+
+from django.urls import path
+from . import views
+
+app_name = 'perf' # Namespace for the perf app URLs
+
+urlpatterns = [
+    # Per-route latency histograms of sampled requests (staff only)
+    # This will match /api/perf/
+    path('', views.RequestHistogramAPIView.as_view(), name='request-histograms'),
+]
@@ -0,0 +1,27 @@
+# ~/Alx_CapstoneProject/perf/views.py
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .histogram import BUCKETS_MS, request_histograms
+
+
+class RequestHistogramAPIView(APIView):
+    """
+    API view exposing the request latency histograms collected by PerfMiddleware.
+    - Restricted to staff users.
+    - Counts cover the sampled requests handled by this worker process only.
+    - DELETE resets them.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "bucket_bounds_ms": list(BUCKETS_MS),
+            "routes": request_histograms.snapshot(),
+        })
+
+    def delete(self, request, *args, **kwargs):
+        request_histograms.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
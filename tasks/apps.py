@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (connects the task-list cache and shard placement handlers)
+        from .sharding import reserve_id_range
+
+        post_migrate.connect(reserve_id_range, sender=self)
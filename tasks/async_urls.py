@@ -0,0 +1,16 @@
+# ~/Alx_CapstoneProject/tasks/async_urls.py
+
+from django.urls import path
+from . import async_views
+
+app_name = 'tasks_async' # Namespace for the ASGI-native task URLs
+
+urlpatterns = [
+    # Async twin of the task list/create endpoint
+    # This will match /api/async/tasks/
+    path('', async_views.AsyncTaskListCreateView.as_view(), name='task-list-create'),
+
+    # Async twin of the task detail endpoint
+    # This will match /api/async/tasks/<int:pk>/
+    path('<int:pk>/', async_views.AsyncTaskDetailView.as_view(), name='task-detail'),
+]
@@ -0,0 +1,109 @@
+# ~/Alx_CapstoneProject/tasks/async_views.py
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from rest_framework import exceptions, filters, permissions, status
+
+from users.async_views import AsyncAPIView
+
+from .conditional import PreconditionFailed, check_preconditions, set_validators, task_detail_validators
+from .filters import TaskFilterBackend, TaskOrderingFilter
+from .models import LIST_ORDERING, Task, TaskTombstone
+from .pagination import TaskKeysetPagination
+from .serializers import TaskRowEncoder, TaskSerializer
+from .sharding import for_owner, shard_for
+
+
+class AsyncTaskListCreateView(AsyncAPIView):
+    """
+    Async version of TaskListCreateAPIView (same filters, search, ordering, keyset
+    pagination and JSON output). Rows are read with async iteration over
+    values_list() and rendered with the same TaskRowEncoder fast path.
+    Responses are not cached and carry no ETag; those stay on the sync view.
+    """
+    filter_backends = [TaskFilterBackend, filters.SearchFilter, TaskOrderingFilter]
+    search_fields = ['title', 'description']
+    ordering_fields = ['due_date', 'created_at', 'updated_at', 'title', 'is_completed']
+    ordering = LIST_ORDERING # Without ?ordering=
+    throttle_scope = 'tasks' # Shares its rate-limit buckets with the sync views
+
+    def get_queryset(self, request):
+        queryset = for_owner(Task, request.user.pk).filter(owner=request.user)
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        return queryset
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset(request)
+        encoder = TaskRowEncoder(TaskSerializer(context={'request': request}), owner_username=request.user.username)
+        queryset = queryset.values_list(*encoder.columns)
+
+        paginator = TaskKeysetPagination()
+        paginator.position_of = encoder.getter(*paginator.ordering)
+        page = await paginator.apaginate_queryset(queryset, request)
+        if page is not None:
+            return self.respond({'next': paginator.get_next_link(), 'results': encoder.encode_rows(page)})
+        return self.respond(encoder.encode_rows([row async for row in queryset]))
+
+    async def post(self, request, *args, **kwargs):
+        serializer = TaskSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True) # TaskSerializer has no validators that query
+        task = await for_owner(Task, request.user.pk).acreate(owner=request.user, **serializer.validated_data)
+        return self.respond(TaskSerializer(task, context={'request': request}).data, status.HTTP_201_CREATED)
+
+
+class AsyncTaskDetailView(AsyncAPIView):
+    """
+    Async version of TaskRetrieveUpdateDestroyAPIView.
+    - Conditional GETs get a 304; writes honour If-Match/If-Unmodified-Since (412).
+    - Deletes leave a sync tombstone, like the sync view.
+    Unlike the sync view the row is not locked between the precondition check and
+    the write (Django has no async transactions); updates are last-writer-wins.
+    """
+    throttle_scope = 'tasks'
+
+    async def get_task(self, request, pk):
+        try:
+            task = await for_owner(Task, request.user.pk).aget(pk=pk, owner=request.user)
+        except Task.DoesNotExist:
+            raise exceptions.NotFound("No Task matches the given query.")
+        if request.method not in permissions.SAFE_METHODS:
+            if check_preconditions(request, *task_detail_validators(request, task)) is not None:
+                raise PreconditionFailed()
+        return task
+
+    async def get(self, request, pk, *args, **kwargs):
+        task = await self.get_task(request, pk)
+        etag, last_modified = task_detail_validators(request, task)
+        not_modified = check_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = self.respond(TaskSerializer(task, context={'request': request}).data)
+        return set_validators(response, etag, last_modified)
+
+    async def put(self, request, pk, *args, **kwargs):
+        return await self.update(request, pk, partial=False)
+
+    async def patch(self, request, pk, *args, **kwargs):
+        return await self.update(request, pk, partial=True)
+
+    async def update(self, request, pk, partial):
+        task = await self.get_task(request, pk)
+        serializer = TaskSerializer(task, data=request.data, partial=partial, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        for field, value in serializer.validated_data.items():
+            setattr(task, field, value)
+        await task.asave()
+        response = self.respond(TaskSerializer(task, context={'request': request}).data)
+        return set_validators(response, *task_detail_validators(request, task))
+
+    async def delete(self, request, pk, *args, **kwargs):
+        task = await self.get_task(request, pk)
+        await sync_to_async(self.delete_task)(task)
+        return self.respond(None, status.HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def delete_task(task):
+        with transaction.atomic(using=shard_for(task.owner_id)):
+            for_owner(TaskTombstone, task.owner_id).create(owner_id=task.owner_id, task_id=task.pk)
+            task.delete()
@@ -0,0 +1,102 @@
+# ~/Alx_CapstoneProject/tasks/cache.py
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class TaskListCache:
+    """
+    Cache of rendered task-list responses, namespaced per owner.
+
+    Entries are keyed by owner, a per-owner version counter, and the request's query
+    string and negotiated media type. Any write to a user's tasks bumps their
+    version, which makes all of their older entries unreachable (they then expire).
+    Runs on the cache alias named by TASKS_LIST_CACHE_ALIAS; hit/miss counters are
+    kept in the same backend so they add up across worker processes.
+    """
+    stats_keys = {'hits': 'tasks:list-cache:hits', 'misses': 'tasks:list-cache:misses'}
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'TASKS_LIST_CACHE_ALIAS', 'default')]
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'TASKS_LIST_CACHE_TIMEOUT', 300)
+
+    @staticmethod
+    def version_key(owner_id):
+        return f'tasks:list-version:{owner_id}'
+
+    def get_version(self, owner_id):
+        key = self.version_key(owner_id)
+        version = self.cache.get(key)
+        if version is None:
+            # Start from the clock rather than 1 so a version key that was evicted
+            # never comes back with a number older entries were stored under.
+            self.cache.add(key, time.time_ns(), timeout=None)
+            version = self.cache.get(key)
+        return version
+
+    def bump(self, owner_id):
+        """
+        Invalidates every cached list response of the given owner.
+        """
+        key = self.version_key(owner_id)
+        try:
+            self.cache.incr(key)
+        except ValueError: # Key missing: any new version invalidates the old entries
+            self.cache.set(key, time.time_ns(), timeout=None)
+
+    def make_key(self, request):
+        user = request.user
+        digest = hashlib.sha1('|'.join([
+            user.username,
+            request.get_full_path(),
+            getattr(request, 'accepted_media_type', ''),
+        ]).encode('utf-8')).hexdigest()
+        return f'tasks:list:{user.pk}:{self.get_version(user.pk)}:{digest}'
+
+    def lookup(self, request):
+        """
+        Returns (key, entry) for the request, where entry is the cached dict with the
+        rendered content, content type and validators, or None on a miss.
+        On a miss, store the response under this same key: it was taken before the
+        data was read, so a write racing with the request can only orphan the entry.
+        """
+        key = self.make_key(request)
+        entry = self.cache.get(key)
+        self.count('hits' if entry is not None else 'misses')
+        return key, entry
+
+    def set(self, key, response, etag, last_modified):
+        self.cache.set(key, {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': etag,
+            'last_modified': last_modified,
+        }, self.timeout)
+
+    def count(self, name):
+        key = self.stats_keys[name]
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self):
+        values = self.cache.get_many(self.stats_keys.values())
+        hits = values.get(self.stats_keys['hits'], 0)
+        misses = values.get(self.stats_keys['misses'], 0)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else None,
+        }
+
+
+task_list_cache = TaskListCache()
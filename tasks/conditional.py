@@ -0,0 +1,75 @@
+# ~/Alx_CapstoneProject/tasks/conditional.py
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The task has been modified since you last fetched it.'
+    default_code = 'precondition_failed'
+
+
+def make_etag(*parts):
+    """
+    Builds a strong ETag from the given parts.
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def task_list_validators(request, queryset):
+    """
+    Returns the (etag, last_modified) validators of a task list response.
+
+    Derived from a single aggregate query: any create or update changes
+    max(updated_at), and any delete changes the row count. The owner, the query
+    string and the negotiated renderer are mixed in because they change the body too.
+    """
+    state = queryset.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+    etag = make_etag(
+        'task-list',
+        request.user.pk,
+        request.user.username,
+        state['count'],
+        state['last_modified'].isoformat() if state['last_modified'] else '',
+        request.get_full_path(),
+        getattr(request, 'accepted_media_type', ''),
+    )
+    return etag, state['last_modified']
+
+
+def task_detail_validators(request, task):
+    """
+    Returns the (etag, last_modified) validators of a single task.
+    """
+    etag = make_etag('task', task.pk, request.user.username, task.updated_at.isoformat())
+    return etag, task.updated_at
+
+
+def check_preconditions(request, etag, last_modified):
+    """
+    Evaluates If-Match / If-Unmodified-Since / If-None-Match / If-Modified-Since
+    against the given validators, using Django's own precondition logic.
+    Returns a 304/412 response to send instead of the real one, or None.
+    """
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Adds the ETag and Last-Modified headers to a response.
+    """
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
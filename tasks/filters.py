@@ -0,0 +1,93 @@
+# ~/Alx_CapstoneProject/tasks/filters.py
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Query-parameter filters for task lists, pushed down into SQL:
+    - `is_completed=true|false`
+    - `due_before=YYYY-MM-DD` / `due_after=YYYY-MM-DD` (exclusive; undated tasks never match)
+    - `updated_since=<ISO datetime>` (inclusive)
+    Every combination is served by one of the (owner, ...) indexes on Task.
+    """
+    boolean_values = {
+        'true': True, '1': True,
+        'false': False, '0': False,
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if 'is_completed' in params:
+            value = self.boolean_values.get(params['is_completed'].lower())
+            if value is None:
+                raise serializers.ValidationError({"is_completed": "Must be 'true' or 'false'."})
+            queryset = queryset.filter(is_completed=value)
+
+        if 'due_before' in params:
+            queryset = queryset.filter(due_date__lt=self.parse_date(params, 'due_before'))
+        if 'due_after' in params:
+            queryset = queryset.filter(due_date__gt=self.parse_date(params, 'due_after'))
+
+        if 'updated_since' in params:
+            queryset = queryset.filter(updated_at__gte=self.parse_datetime(params, 'updated_since'))
+
+        return queryset
+
+    @staticmethod
+    def parse_date(params, name):
+        try:
+            value = parse_date(params[name])
+        except ValueError:
+            value = None
+        if value is None:
+            raise serializers.ValidationError({name: "Enter a valid date (YYYY-MM-DD)."})
+        return value
+
+    @staticmethod
+    def parse_datetime(params, name):
+        try:
+            value = parse_datetime(params[name])
+        except ValueError:
+            value = None
+        if value is None:
+            raise serializers.ValidationError({name: "Enter a valid ISO 8601 datetime."})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': 'is_completed', 'required': False, 'in': 'query', 'schema': {'type': 'boolean'}},
+            {'name': 'due_before', 'required': False, 'in': 'query', 'schema': {'type': 'string', 'format': 'date'}},
+            {'name': 'due_after', 'required': False, 'in': 'query', 'schema': {'type': 'string', 'format': 'date'}},
+            {'name': 'updated_since', 'required': False, 'in': 'query', 'schema': {'type': 'string', 'format': 'date-time'}},
+        ]
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter for task lists:
+    - Without `ordering`, sorts by the view's `ordering` (LIST_ORDERING, served by an index).
+    - `ordering=due_date` and `ordering=-due_date` keep undated tasks last on every
+      backend (databases disagree on where NULLs sort by default).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*[self.nulls_last(field) for field in ordering])
+
+    @staticmethod
+    def nulls_last(field):
+        if field == 'due_date':
+            return F('due_date').asc(nulls_last=True)
+        if field == '-due_date':
+            return F('due_date').desc(nulls_last=True)
+        return field
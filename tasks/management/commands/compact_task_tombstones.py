@@ -0,0 +1,47 @@
+# ~/Alx_CapstoneProject/tasks/management/commands/compact_task_tombstones.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import TaskTombstone
+from tasks.sharding import get_shards
+
+
+class Command(BaseCommand):
+    help = "Deletes task tombstones older than the sync retention period (TASKS_TOMBSTONE_RETENTION)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help="Keep tombstones from the last N days (defaults to TASKS_TOMBSTONE_RETENTION).",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help="Number of tombstones deleted per statement, to keep locks short.",
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is not None:
+            retention = timedelta(days=options['days'])
+        else:
+            retention = getattr(settings, 'TASKS_TOMBSTONE_RETENTION', timedelta(days=30))
+        cutoff = timezone.now() - retention
+
+        deleted = 0
+        for shard in get_shards():
+            tombstones = TaskTombstone.objects.using(shard)
+            while True:
+                batch = list(
+                    tombstones.filter(deleted_at__lt=cutoff).values_list('pk', flat=True)[:options['batch_size']]
+                )
+                if not batch:
+                    break
+                deleted += tombstones.filter(pk__in=batch).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} task tombstone(s) older than {cutoff:%Y-%m-%d %H:%M}."))
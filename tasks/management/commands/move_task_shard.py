@@ -0,0 +1,46 @@
+# ~/Alx_CapstoneProject/tasks/management/commands/move_task_shard.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import sharding
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves a user's tasks, tombstones and task counters to another shard (TASK_SHARDS) while "
+        "the user keeps using the API; their task writes are refused (503) for a few seconds at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help="The user whose tasks are moved.")
+        parser.add_argument('shard', help="The database alias to move them to.")
+        parser.add_argument(
+            '--grace',
+            type=float,
+            help="Seconds writes stay frozen before the final copy (at least TASK_SHARD_CACHE_TIMEOUT).",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of rows copied or deleted per statement.",
+        )
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError("Tasks are not sharded: TASK_SHARDS lists a single database.")
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named {options['username']!r}.")
+        try:
+            sharding.move_owner(
+                user.pk, options['shard'], grace=options['grace'], batch_size=options['batch_size'],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"The tasks of {user.username} are on {sharding.get_placement(user.pk, cached=False)[0]}."
+        ))
@@ -0,0 +1,21 @@
+# ~/Alx_CapstoneProject/tasks/management/commands/rebuild_task_search_index.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tasks import search
+from tasks.models import Task
+from tasks.sharding import get_shards
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index over task titles and descriptions from the task table."
+
+    def handle(self, *args, **options):
+        for shard in get_shards():
+            if not search.is_available(connections[shard]):
+                raise CommandError(f"The task search index requires SQLite FTS5, not {connections[shard].vendor}.")
+            search.rebuild_index(shard)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt the task search index of {shard} over {Task.objects.using(shard).count()} task(s)."
+            ))
@@ -0,0 +1,36 @@
+# ~/Alx_CapstoneProject/tasks/management/commands/rebuild_task_stats.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import stats
+from tasks.sharding import get_shards
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifies the per-user task counters (TaskStats) against a full aggregate of the task "
+        "table and rewrites the ones that disagree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only verify: report wrong counters and exit with an error status if there are any.",
+        )
+
+    def handle(self, *args, **options):
+        drift = {}
+        for shard in get_shards(): # Each user's tasks and counters are on one shard
+            drift.update(stats.find_drift(shard) if options['check'] else stats.rebuild_stats(shard))
+        for owner_id, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(
+                f"User #{owner_id}: stored {stored[0]} total / {stored[1]} completed, "
+                f"actual {actual[0]} total / {actual[1]} completed."
+            )
+        if options['check']:
+            if drift:
+                raise CommandError(f"Task statistics are wrong for {len(drift)} user(s).")
+            self.stdout.write(self.style.SUCCESS("Task statistics match the task table."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt the task statistics of {len(drift)} user(s)."))
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The index Django created for Task.owner in 0001 (the name is derived from the
+# table and column, so it is the same on every backend).
+OWNER_FK_INDEX = 'tasks_task_owner_id_db3dcc3e'
+
+
+class AddIndexOnline(migrations.AddIndex):
+    """
+    AddIndex that builds the index with CREATE INDEX CONCURRENTLY on PostgreSQL,
+    so writes to the table are not blocked while it builds.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
+
+
+class RemoveIndexOnline(migrations.RemoveIndex):
+    """
+    RemoveIndex that drops the index with DROP INDEX CONCURRENTLY on PostgreSQL.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = from_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.remove_index(model, index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = to_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.add_index(model, index, concurrently=True)
+            else:
+                schema_editor.add_index(model, index)
+
+
+def drop_owner_fk_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS {schema_editor.quote_name(OWNER_FK_INDEX)}')
+
+
+def create_owner_fk_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS {schema_editor.quote_name(OWNER_FK_INDEX)} '
+        f'ON {schema_editor.quote_name("tasks_task")} ({schema_editor.quote_name("owner_id")})'
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Safe to apply while the API is serving traffic: no table is rebuilt (which would
+    also drop the search index triggers from 0005), the new index is in place before
+    the old ones go, and on PostgreSQL no step locks out writes.
+    On SQLite, CREATE INDEX holds the write lock for the length of the build.
+    """
+    atomic = False # CREATE/DROP INDEX CONCURRENTLY cannot run in a transaction
+
+    dependencies = [
+        ('tasks', '0005_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # State only; ordering is not part of the schema.
+        migrations.AlterModelOptions(
+            name='task',
+            options={'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+        AddIndexOnline(
+            model_name='task',
+            index=models.Index(models.F('owner'), models.Func(models.F('due_date'), output_field=models.BooleanField(), template='(%(expressions)s IS NULL)'), models.F('due_date'), models.F('created_at'), models.F('id'), name='task_owner_list_idx'),
+        ),
+        RemoveIndexOnline(
+            model_name='task',
+            name='task_owner_due_created_idx',
+        ),
+        # Task.owner's own index duplicates the leading column of every index above.
+        # Dropped by name: AlterField would rebuild the table on SQLite.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='task',
+                    name='owner',
+                    field=models.ForeignKey(db_index=False, help_text='The user who owns this task.', on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_owner_fk_index, create_owner_fk_index),
+            ],
+        ),
+    ]
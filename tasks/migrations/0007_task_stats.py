@@ -0,0 +1,138 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import migrations, models
+
+# Triggers that keep tasks_taskstats in step with tasks_task inside the writing
+# transaction, on every write path (ORM, bulk operations, raw SQL).
+# Note: SQLite's schema editor rebuilds a table to alter most of its columns, which
+# drops these triggers; a migration that does so on tasks_task must recreate them.
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER tasks_taskstats_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_taskstats(owner_id, total, completed) VALUES (new.owner_id, 1, new.is_completed)
+        ON CONFLICT(owner_id) DO UPDATE SET total = total + 1, completed = completed + excluded.completed;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_delete AFTER DELETE ON tasks_task BEGIN
+        UPDATE tasks_taskstats SET total = total - 1, completed = completed - old.is_completed
+        WHERE owner_id = old.owner_id;
+    END
+    """,
+    # Saves rewrite every column; only a change of state or owner touches the counters.
+    """
+    CREATE TRIGGER tasks_taskstats_complete AFTER UPDATE OF is_completed ON tasks_task
+    WHEN new.owner_id = old.owner_id AND new.is_completed != old.is_completed BEGIN
+        UPDATE tasks_taskstats SET completed = completed + new.is_completed - old.is_completed
+        WHERE owner_id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_move AFTER UPDATE OF owner_id ON tasks_task
+    WHEN new.owner_id != old.owner_id BEGIN
+        UPDATE tasks_taskstats SET total = total - 1, completed = completed - old.is_completed
+        WHERE owner_id = old.owner_id;
+        INSERT INTO tasks_taskstats(owner_id, total, completed) VALUES (new.owner_id, 1, new.is_completed)
+        ON CONFLICT(owner_id) DO UPDATE SET total = total + 1, completed = completed + excluded.completed;
+    END
+    """,
+]
+
+POSTGRESQL_TRIGGERS = [
+    """
+    CREATE FUNCTION tasks_taskstats_count() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND NEW.owner_id = OLD.owner_id THEN
+            UPDATE tasks_taskstats SET completed = completed + NEW.is_completed::int - OLD.is_completed::int
+            WHERE owner_id = NEW.owner_id;
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE tasks_taskstats SET total = total - 1, completed = completed - OLD.is_completed::int
+            WHERE owner_id = OLD.owner_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            INSERT INTO tasks_taskstats (owner_id, total, completed) VALUES (NEW.owner_id, 1, NEW.is_completed::int)
+            ON CONFLICT (owner_id) DO UPDATE
+            SET total = tasks_taskstats.total + 1, completed = tasks_taskstats.completed + EXCLUDED.completed;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_insert_delete AFTER INSERT OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_taskstats_count()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_update AFTER UPDATE OF owner_id, is_completed ON tasks_task
+    FOR EACH ROW WHEN (NEW.owner_id IS DISTINCT FROM OLD.owner_id OR NEW.is_completed IS DISTINCT FROM OLD.is_completed)
+    EXECUTE FUNCTION tasks_taskstats_count()
+    """,
+    # Blocks task writes (not reads) until the migration commits, so none is missed
+    # between the backfill below and the triggers taking effect.
+    "LOCK TABLE tasks_task IN SHARE ROW EXCLUSIVE MODE",
+]
+
+BACKFILL_SQL = """
+    INSERT INTO tasks_taskstats (owner_id, total, completed)
+    SELECT owner_id, COUNT(*), SUM(CASE WHEN is_completed THEN 1 ELSE 0 END) FROM tasks_task GROUP BY owner_id
+"""
+
+DROP_SQL = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS tasks_taskstats_move",
+        "DROP TRIGGER IF EXISTS tasks_taskstats_complete",
+        "DROP TRIGGER IF EXISTS tasks_taskstats_delete",
+        "DROP TRIGGER IF EXISTS tasks_taskstats_insert",
+    ],
+    'postgresql': [
+        "DROP TRIGGER IF EXISTS tasks_taskstats_update ON tasks_task",
+        "DROP TRIGGER IF EXISTS tasks_taskstats_insert_delete ON tasks_task",
+        "DROP FUNCTION IF EXISTS tasks_taskstats_count()",
+    ],
+}
+
+
+def create_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    triggers = {'sqlite': SQLITE_TRIGGERS, 'postgresql': POSTGRESQL_TRIGGERS}.get(vendor)
+    if triggers is None:
+        raise ImproperlyConfigured(
+            f"The task statistics triggers support SQLite and PostgreSQL only, not {vendor}."
+        )
+    for statement in triggers:
+        schema_editor.execute(statement)
+    schema_editor.execute(BACKFILL_SQL)
+
+
+def drop_triggers(apps, schema_editor):
+    for statement in DROP_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_owner_list_idx'),
+        ('users', '0003_customuser_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('owner', models.OneToOneField(help_text='The user whose tasks are counted.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0, help_text='Number of tasks the user has.')),
+                ('completed', models.IntegerField(default=0, help_text="Number of the user's tasks that are completed.")),
+            ],
+            options={
+                'verbose_name': 'Task statistics',
+                'verbose_name_plural': 'Task statistics',
+            },
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:44
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+search_index = import_module('tasks.migrations.0005_task_search_index')
+task_stats = import_module('tasks.migrations.0007_task_stats')
+
+# Tasks, tombstones and counters are stored on their owner's shard, and users on
+# 'default' only, so the owner columns can't be foreign key constraints.
+# Dropping the constraint makes SQLite rebuild tasks_task, which drops the search
+# index and counter triggers (0005, 0007): they are dropped first and recreated after.
+SQLITE_TRIGGERS = [*search_index.CREATE_SQL[1:4], *task_stats.SQLITE_TRIGGERS]
+SQLITE_DROP_TRIGGERS = [*search_index.DROP_SQL[:3], *task_stats.DROP_SQL['sqlite']]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_stats'),
+        ('users', '0004_revokedtoken'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(SQLITE_DROP_TRIGGERS), run_on_sqlite(SQLITE_TRIGGERS)),
+        migrations.CreateModel(
+            name='TaskPlacement',
+            fields=[
+                ('owner', models.OneToOneField(help_text='The user whose tasks are placed.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_placement', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('shard', models.CharField(help_text="The database alias (one of TASK_SHARDS) holding the user's tasks.", max_length=100)),
+                ('moving', models.BooleanField(default=False, help_text="Set while the user's tasks are moved to another shard; task writes are refused meanwhile.")),
+            ],
+            options={
+                'verbose_name': 'Task placement',
+                'verbose_name_plural': 'Task placements',
+            },
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='owner',
+            field=models.ForeignKey(db_constraint=False, db_index=False, help_text='The user who owns this task.', on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='taskstats',
+            name='owner',
+            field=models.OneToOneField(db_constraint=False, help_text='The user whose tasks are counted.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='tasktombstone',
+            name='owner',
+            field=models.ForeignKey(db_constraint=False, help_text='The user who owned the deleted task.', on_delete=django.db.models.deletion.CASCADE, related_name='task_tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(run_on_sqlite(SQLITE_TRIGGERS), run_on_sqlite(SQLITE_DROP_TRIGGERS)),
+    ]
@@ -1,8 +1,22 @@
 # ~/Alx_CapstoneProject/tasks/models.py
 
 from django.db import models
+from django.db.models import F, Func
 from django.conf import settings # Import settings to reference AUTH_USER_MODEL
 
+# (due_date IS NULL): true for tasks without a due date, false for the others. Sorting
+# on it first puts undated tasks last on every backend (false before true; 0 before 1
+# on SQLite), and task_owner_list_idx is built on it, so that sort and keyset seeks
+# within each group are index range scans. Written as a plain SQL template with no
+# parameters: the database only uses an expression index for a query expression
+# identical to the indexed one, and Django would rewrite an "isnull" lookup compared
+# with True/False into something else. Compare it with Value(True/False), not 0/1:
+# PostgreSQL has no boolean = integer operator.
+UNDATED = Func(F('due_date'), template='(%(expressions)s IS NULL)', output_field=models.BooleanField())
+
+# The task list order: by due date with undated tasks last, then by creation.
+LIST_ORDERING = (UNDATED.asc(), 'due_date', 'created_at', 'id')
+
 class Task(models.Model):
     """
     Represents a single To-Do task.
@@ -12,6 +26,8 @@ class Task(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='tasks', # Allows easy access to user's tasks: user.tasks.all()
+        db_index=False, # Every index in Meta.indexes starts with owner
+        db_constraint=False, # Users are on 'default', tasks on their owner's shard (tasks/sharding.py)
         help_text="The user who owns this task."
     )
     title = models.CharField(
@@ -42,12 +58,119 @@ class Task(models.Model):
     )
 
     class Meta:
-        ordering = ['due_date', 'created_at'] # Default ordering for tasks
+        # No default ordering: single-row lookups, counts and aggregates don't need
+        # one, and the list views order explicitly (LIST_ORDERING).
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
+        indexes = [
+            # Serves the task list and its keyset pages in LIST_ORDERING, with no sort step:
+            # WHERE owner = ? [AND due_date IS NULL = ?] ORDER BY due_date IS NULL, due_date, created_at, id
+            models.Index(F('owner'), UNDATED, F('due_date'), F('created_at'), F('id'), name='task_owner_list_idx'),
+            # Serves delta sync and exports: WHERE owner = ? AND (updated_at, id) > (?, ?) ORDER BY updated_at, id
+            models.Index(fields=['owner', 'updated_at', 'id'], name='task_owner_updated_idx'),
+            # Serves the is_completed filter, alone or with a due date range
+            models.Index(fields=['owner', 'is_completed', 'due_date'], name='task_owner_done_due_idx'),
+        ]
 
     def __str__(self):
         """
         String representation of the Task object.
+        Only uses the owner's username if it is already loaded, to avoid a query per task.
         """
-        return f"{self.title} (Owner: {self.owner.username})"
+        owner = self.owner.username if Task.owner.is_cached(self) else f"#{self.owner_id}"
+        return f"{self.title} (Owner: {owner})"
+
+class TaskTombstone(models.Model):
+    """
+    Records that a task was deleted, so sync clients can drop it too.
+    Old tombstones are removed by the `compact_task_tombstones` management command.
+    """
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='task_tombstones',
+        db_constraint=False, # On the owner's shard, like the tasks
+        help_text="The user who owned the deleted task."
+    )
+    task_id = models.BigIntegerField(
+        help_text="The id of the deleted task."
+    )
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Timestamp when the task was deleted."
+    )
+
+    class Meta:
+        verbose_name = "Task tombstone"
+        verbose_name_plural = "Task tombstones"
+        indexes = [
+            # Serves delta sync: WHERE owner = ? AND (deleted_at, id) > (?, ?) ORDER BY deleted_at, id
+            models.Index(fields=['owner', 'deleted_at', 'id'], name='tombstone_owner_deleted_idx'),
+            # Serves compaction: WHERE deleted_at < ?
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task #{self.task_id} deleted at {self.deleted_at}"
+
+class TaskStats(models.Model):
+    """
+    Task counters of one user, for the stats endpoint.
+    Kept up to date by triggers on tasks_task (see migrations/0007_task_stats.py), in
+    the same transaction as every task write, including bulk_create, bulk_update,
+    queryset updates and deletes. A user without tasks may have no row.
+    Overdue tasks depend on today's date, so they are not counted here (see tasks/stats.py).
+    The `rebuild_task_stats` management command verifies and repairs the counters.
+    """
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_stats',
+        db_constraint=False, # On the owner's shard, like the tasks
+        help_text="The user whose tasks are counted."
+    )
+    total = models.IntegerField(
+        default=0,
+        help_text="Number of tasks the user has."
+    )
+    completed = models.IntegerField(
+        default=0,
+        help_text="Number of the user's tasks that are completed."
+    )
+
+    class Meta:
+        verbose_name = "Task statistics"
+        verbose_name_plural = "Task statistics"
+
+    def __str__(self):
+        return f"{self.completed}/{self.total} tasks completed (Owner: #{self.owner_id})"
+
+class TaskPlacement(models.Model):
+    """
+    The shard (database alias) holding a user's tasks, tombstones and counters.
+    Stored on 'default'; only used when TASK_SHARDS lists several databases (see
+    tasks/sharding.py). A user without a row is on the first shard.
+    """
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_placement',
+        help_text="The user whose tasks are placed."
+    )
+    shard = models.CharField(
+        max_length=100,
+        help_text="The database alias (one of TASK_SHARDS) holding the user's tasks."
+    )
+    moving = models.BooleanField(
+        default=False,
+        help_text="Set while the user's tasks are moved to another shard; task writes are refused meanwhile."
+    )
+
+    class Meta:
+        verbose_name = "Task placement"
+        verbose_name_plural = "Task placements"
+
+    def __str__(self):
+        return f"#{self.owner_id} on {self.shard}" + (" (moving)" if self.moving else "")
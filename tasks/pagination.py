@@ -0,0 +1,202 @@
+# ~/Alx_CapstoneProject/tasks/pagination.py
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from operator import attrgetter
+
+from django.db.models import Q, Value
+from django.db.models.lookups import Exact
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .models import UNDATED
+
+
+def encode_cursor(values):
+    """
+    Encodes a tuple of JSON-friendly values into an opaque, URL-safe cursor string.
+    """
+    payload = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor() back into a list of values.
+    Raises ValueError if the cursor has been tampered with or is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('Malformed cursor.')
+    if not isinstance(values, list):
+        raise ValueError('Malformed cursor.')
+    return values
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination for the task list.
+
+    Pages are walked in the task list order (LIST_ORDERING): by due_date with
+    undated tasks last, then created_at, id. Instead of an OFFSET, each page
+    continues strictly after the last row of the previous one, so every page is a
+    bounded range scan on task_owner_list_idx no matter how deep the client pages.
+
+    Dated and undated tasks are read as two separate regions (UNDATED false, then
+    UNDATED true). Within each region the plain (due_date, created_at, id) index
+    order is the page order, so no NULLS LAST sort is needed on any database backend.
+
+    Pagination is opt-in: it only kicks in when the client sends `cursor` or
+    `page_size`, so existing clients keep receiving the plain list.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 100
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor.'
+
+    # The keyset columns, in sort order. 'id' breaks ties so the order is total.
+    ordering = ('due_date', 'created_at', 'id')
+    position_of = attrgetter('due_date', 'created_at', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.start(request):
+            return None  # Pagination not requested, return the full list.
+        rows = []
+        for region in self.get_regions(self.position):
+            rows.extend(queryset.filter(region).order_by(*self.ordering)[:self.limit - len(rows)])
+            if len(rows) >= self.limit:
+                break
+        return self.finish(rows)
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        paginate_queryset() for async views, reading the regions with async iteration.
+        """
+        if not self.start(request):
+            return None
+        rows = []
+        for region in self.get_regions(self.position):
+            async for row in queryset.filter(region).order_by(*self.ordering)[:self.limit - len(rows)]:
+                rows.append(row)
+            if len(rows) >= self.limit:
+                break
+        return self.finish(rows)
+
+    def start(self, request):
+        """
+        Reads the page size and position from the request. Returns False when the
+        client did not ask for pagination.
+        """
+        if (self.cursor_query_param not in request.query_params
+                and self.page_size_query_param not in request.query_params):
+            return False
+
+        if api_settings.ORDERING_PARAM in request.query_params:
+            raise ValidationError({
+                api_settings.ORDERING_PARAM: "Custom ordering cannot be combined with cursor pagination."
+            })
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.position = self.decode_position(request)
+        # Fetch one extra row to know whether there is a next page.
+        self.limit = self.page_size + 1
+        return True
+
+    def finish(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_position(self, request):
+        """
+        Returns the (due_date, created_at, id) tuple encoded in the request cursor,
+        or None when starting from the first page.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            due_date, created_at, pk = decode_cursor(cursor)
+            if due_date is not None:
+                due_date = parse_date(due_date)
+                if due_date is None:
+                    raise ValueError
+            created_at = parse_datetime(created_at)
+            if created_at is None or not isinstance(pk, int):
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return due_date, created_at, pk
+
+    def encode_position(self, item):
+        due_date, created_at, pk = self.position_of(item)
+        return encode_cursor([
+            due_date.isoformat() if due_date is not None else None,
+            created_at.isoformat(),
+            pk,
+        ])
+
+    @staticmethod
+    def get_regions(position):
+        """
+        Returns the filters for the index regions still left to read, in page order,
+        given the (due_date, created_at, id) position of the last row already served.
+        Each region pins the UNDATED index column, and the redundant >= bounds let the
+        database start the range scan right at the position instead of filtering up to it.
+        """
+        # Value(): a bare True/False would be rewritten to "WHERE (due_date IS NULL)",
+        # which no longer matches the index column.
+        dated = Q(Exact(UNDATED, Value(False)))
+        undated = Q(Exact(UNDATED, Value(True)), due_date__isnull=True)
+        if position is None:
+            return [dated, undated]
+        due_date, created_at, pk = position
+        after_in_group = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        if due_date is None:
+            return [undated & Q(created_at__gte=created_at) & after_in_group]
+        return [
+            dated & Q(due_date__gte=due_date) & (Q(due_date__gt=due_date) | Q(due_date=due_date) & after_in_group),
+            undated,
+        ]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_position(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,95 @@
+# ~/Alx_CapstoneProject/tasks/search.py
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+
+from .models import Task
+from .sharding import for_owner
+
+# External-content FTS5 table over tasks_task, kept in sync by triggers
+# (see migrations/0005_task_search_index.py). owner_id is indexed as a token so a
+# search is the intersection of the owner's posting list with the query's.
+FTS_TABLE = 'tasks_task_fts'
+
+# Relevance tiers, searched in order: tasks with every word in the title, then tasks
+# with every word anywhere. Within a tier the newest task comes first.
+# bm25() is not used: it counts every matching row of the whole table to weigh each
+# term, which takes 20-150 ms for common words at 1M tasks. A tier is read in rowid
+# order and stops after `limit` rows.
+RANK_TIERS = ('title', '{title description}')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available(using=None):
+    """
+    Whether the full-text index exists on the given connection, by default the
+    current database (SQLite only).
+    """
+    return (using or connection).vendor == 'sqlite'
+
+
+def build_match_query(owner_id, text, columns='{title description}'):
+    """
+    Turns free text typed by a user into an FTS5 MATCH expression over the given
+    columns, scoped to the owner. Every word is quoted, so FTS5 operators and syntax
+    characters in the input are searched for literally instead of raising a syntax
+    error. All words must match.
+    Returns None if the text contains no searchable words.
+    """
+    terms = ['"%s"' % token for token in TOKEN_RE.findall(text)]
+    if not terms:
+        return None
+    return 'owner_id:%d AND %s:(%s)' % (owner_id, columns, ' '.join(terms))
+
+
+def search_task_ids(owner_id, text, limit):
+    """
+    Returns the ids of the owner's tasks matching the text, best match first.
+    Matches in the title rank above matches in the description (see RANK_TIERS).
+    """
+    if not TOKEN_RE.search(text):
+        return []
+    tasks = for_owner(Task, owner_id)
+    shard = connections[tasks.db] # Each shard indexes its own tasks
+    if not is_available(shard):
+        # No FTS5 on this database: fall back to a substring scan of the owner's tasks.
+        queryset = tasks.filter(owner_id=owner_id)
+        for word in TOKEN_RE.findall(text):
+            queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+        return list(queryset.order_by('-updated_at', '-id').values_list('id', flat=True)[:limit])
+
+    ids = []
+    with shard.cursor() as cursor:
+        for columns in RANK_TIERS:
+            # Over-fetch by len(ids): a later tier also matches the tasks of earlier ones.
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s',
+                [build_match_query(owner_id, text, columns), limit + len(ids)],
+            )
+            seen = set(ids)
+            ids.extend(row[0] for row in cursor.fetchall() if row[0] not in seen)
+            if len(ids) >= limit:
+                break
+    return ids[:limit]
+
+
+def search_tasks(owner_id, text, limit):
+    """
+    Returns the owner's matching Task instances in rank order.
+    """
+    ids = search_task_ids(owner_id, text, limit)
+    tasks = for_owner(Task, owner_id).filter(owner_id=owner_id).in_bulk(ids)
+    return [tasks[pk] for pk in ids if pk in tasks]
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """
+    Rebuilds the whole index of a database (a shard) from its tasks_task in bulk,
+    then merges its segments.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
@@ -1,7 +1,79 @@
 # ~/Alx_CapstoneProject/tasks/serializers.py
 
-from rest_framework import serializers
+from datetime import date, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from operator import itemgetter
+
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from perf.timing import timed
+
 from .models import Task
+from .sharding import for_owner
+
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    List serializer used by TaskSerializer(many=True).
+    Writes a whole batch of tasks with one bulk_create/bulk_update statement
+    instead of one INSERT/UPDATE per task.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            # Line each item up with the task it updates (the pattern suggested by DRF's docs).
+            if not hasattr(self, '_instances_by_pk'):
+                self._instances_by_pk = {task.pk: task for task in self.instance}
+            self.child.instance = self._instances_by_pk[data['id']]
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def to_representation(self, data):
+        with timed('serialize'):
+            return super().to_representation(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        tasks = [model(**attrs) for attrs in validated_data]
+        if not tasks:
+            return tasks
+        return for_owner(model, tasks[0].owner_id).bulk_create(tasks)
+
+    def update(self, instances, validated_data):
+        """
+        Applies validated_data[i] to instances[i] and saves them all at once.
+        bulk_update() bypasses auto_now, so updated_at is stamped here.
+        """
+        if not instances:
+            return instances
+        now = timezone.now()
+        fields = {'updated_at'}
+        for task, attrs in zip(instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(task, attr, value)
+            task.updated_at = now
+            fields.update(attrs)
+        for_owner(self.child.Meta.model, instances[0].owner_id).bulk_update(instances, sorted(fields))
+        return instances
+
+class OwnerUsernameField(serializers.ReadOnlyField):
+    """
+    Read-only username of the task's owner.
+    The API only ever serves the requesting user's own tasks, so the username is
+    taken from request.user instead of lazily loading task.owner (one query per task).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, task):
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and user.pk == task.owner_id:
+            return user.username
+        return task.owner.username
 
 class TaskSerializer(serializers.ModelSerializer):
     """
@@ -9,7 +81,7 @@ class TaskSerializer(serializers.ModelSerializer):
     Converts Task model instances to JSON and validates input for Task creation/updates.
     """
     # Make owner read-only as it will be set automatically by the view based on the authenticated user.
-    owner = serializers.ReadOnlyField(source='owner.username')
+    owner = OwnerUsernameField()
 
     class Meta:
         model = Task
@@ -26,3 +98,111 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         # Make some fields read-only for output, not for input
         read_only_fields = ['created_at', 'updated_at']
+        # Used for many=True, e.g. by the bulk endpoint
+        list_serializer_class = TaskListSerializer
+
+    def create(self, validated_data):
+        # On the owner's shard (tasks/sharding.py): Task.objects.create() gives the
+        # database router no owner to pick it by.
+        return for_owner(Task, validated_data['owner'].pk).create(**validated_data)
+
+class TaskBulkOperationSerializer(serializers.Serializer):
+    """
+    Validates the envelope of a single operation sent to the bulk endpoint:
+      {"op": "create", "data": {...}}
+      {"op": "update", "id": 1, "data": {...}}   (partial update)
+      {"op": "delete", "id": 1}
+    The task payload itself is validated later by TaskSerializer(many=True).
+    """
+    OPERATIONS = ('create', 'update', 'delete')
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.IntegerField(required=False, min_value=1)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] in ('update', 'delete') and 'id' not in attrs:
+            raise serializers.ValidationError({"id": "This field is required for update and delete."})
+        if attrs['op'] in ('create', 'update') and 'data' not in attrs:
+            raise serializers.ValidationError({"data": "This field is required for create and update."})
+        return attrs
+
+class TaskRowEncoder:
+    """
+    Precompiled row-to-dict encoder for read-only task lists.
+
+    Built once per request from a TaskSerializer instance: it works out which column
+    feeds each output field and how that value has to be converted, and builds a
+    single function that turns a `.values_list(*encoder.columns)` row straight into
+    the dict TaskSerializer would produce, skipping DRF's per-field, per-row machinery.
+    Dates and datetimes are rendered exactly like DRF's DateField/DateTimeField.
+    """
+    # Fields whose database values are already in their JSON representation.
+    PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.BooleanField)
+
+    def __init__(self, serializer, owner_username):
+        self.columns = []
+        # (output key, column index or None for the owner, converter or None), in output order.
+        fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, OwnerUsernameField):
+                # Only valid because the list is always filtered on owner=request.user.
+                fields.append((name, None, None))
+                continue
+            fields.append((name, len(self.columns), self.get_converter(field)))
+            self.columns.append(field.source)
+
+        def encode(row):
+            item = {}
+            for key, index, convert in fields:
+                if index is None:
+                    item[key] = owner_username
+                    continue
+                value = row[index]
+                item[key] = value if convert is None or value is None else convert(value)
+            return item
+
+        self.encode = encode
+
+    def getter(self, *columns):
+        """
+        Returns a function picking the given columns out of a row, e.g. for pagination cursors.
+        """
+        return itemgetter(*(self.columns.index(column) for column in columns))
+
+    @classmethod
+    def get_converter(cls, field):
+        """
+        Returns a function converting a non-null column value to its representation,
+        or None when the value can be used as is.
+        """
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            if output_format is not None and output_format.lower() == ISO_8601:
+                field_timezone = getattr(field, 'timezone', None) or field.default_timezone()
+                if field_timezone is not None and field_timezone.utcoffset(None) == timedelta(0):
+                    # Rendering in UTC: database values are already UTC, skip the conversion.
+                    def convert_utc_datetime(value):
+                        if value.tzinfo is not dt_timezone.utc:
+                            value = value.astimezone(dt_timezone.utc)
+                        return value.isoformat()[:-6] + 'Z'
+                    return convert_utc_datetime
+                if field_timezone is not None:
+                    def convert_datetime(value):
+                        value = value.astimezone(field_timezone).isoformat()
+                        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+                    return convert_datetime
+        elif isinstance(field, serializers.DateField):
+            output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+            if output_format is not None and output_format.lower() == ISO_8601:
+                # Many tasks share a due date, so remember the formatted values.
+                return lru_cache(maxsize=1024)(date.isoformat)
+        elif isinstance(field, cls.PASSTHROUGH_FIELDS):
+            return None
+        return field.to_representation
+
+    def encode_rows(self, rows):
+        with timed('serialize'):
+            return list(map(self.encode, rows))
@@ -0,0 +1,320 @@
+# ~/Alx_CapstoneProject/tasks/sharding.py
+
+"""
+Horizontal sharding of the task tables by owner.
+
+TASK_SHARDS lists the database aliases that store tasks, tombstones and task
+counters; users, tokens and everything else stay on 'default'. Each user's rows all
+live on one shard, named by their TaskPlacement row (on 'default'): new users are
+placed by a stable hash of their id, users from before sharding was enabled (no
+row) are on the first shard, and `manage.py move_task_shard` moves a user to
+another shard online. Add new shards at the end of TASK_SHARDS; existing users stay
+where their placement says.
+
+With a single shard (the default) TaskShardRouter stands aside and nothing changes.
+With several, task queries must say whose tasks they touch, so the router can pick
+the shard: query through for_owner(), through a user's related managers
+(user.tasks), or save/delete an instance; bulk scans pick a shard with .using().
+
+Each shard allocates task and tombstone ids from its own range (SHARD_ID_BITS),
+so ids stay unique across shards and a moved task keeps its id.
+
+- TASK_SHARD_CACHE_TIMEOUT: seconds a worker keeps a placement in its cache
+  (TASK_SHARD_CACHE_ALIAS) before reading it again. A move waits at least this
+  long after freezing a user's writes, so every worker has seen the freeze, and
+  again after switching them to the new shard, so no worker still reads the old
+  one when their rows are deleted from it.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import task_list_cache
+from .models import Task, TaskPlacement, TaskStats, TaskTombstone
+
+# Models stored on their owner's shard; each has an owner_id column.
+SHARDED_MODELS = {'tasks.task', 'tasks.tasktombstone', 'tasks.taskstats'}
+
+# Shard i allocates ids from i << SHARD_ID_BITS up (about 10^12 ids per shard).
+SHARD_ID_BITS = 40
+
+PLACEMENT_KEY = 'task-shard:{}'
+
+
+class TaskShardMoving(APIException):
+    """
+    A write to the tasks of a user who is being moved to another shard.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Your tasks are being moved, please retry shortly.'
+    default_code = 'task_shard_moving'
+    wait = 1 # Sent as Retry-After
+
+
+def get_shards():
+    return list(getattr(settings, 'TASK_SHARDS', [DEFAULT_DB_ALIAS]))
+
+
+def is_enabled():
+    return len(get_shards()) > 1
+
+
+def get_cache():
+    return caches[getattr(settings, 'TASK_SHARD_CACHE_ALIAS', 'default')]
+
+
+def hash_shard(owner_id):
+    """
+    The shard a new user is placed on: stable across processes and restarts.
+    """
+    shards = get_shards()
+    digest = hashlib.blake2b(str(owner_id).encode(), digest_size=8).digest()
+    return shards[int.from_bytes(digest, 'little') % len(shards)]
+
+
+def id_range(alias):
+    """
+    Returns (first, last + 1) of the task and tombstone ids the shard allocates.
+    """
+    index = get_shards().index(alias)
+    return index << SHARD_ID_BITS, (index + 1) << SHARD_ID_BITS
+
+
+def get_placement(owner_id, cached=True):
+    """
+    Returns (shard, moving) for the owner.
+    """
+    key = PLACEMENT_KEY.format(owner_id)
+    placement = get_cache().get(key) if cached else None
+    if placement is None:
+        placement = tuple(
+            TaskPlacement.objects.using(DEFAULT_DB_ALIAS).filter(owner_id=owner_id).values_list('shard', 'moving').first()
+            or (get_shards()[0], False)
+        )
+        get_cache().set(key, placement, getattr(settings, 'TASK_SHARD_CACHE_TIMEOUT', 5))
+    return placement
+
+
+def set_placement(owner_id, shard, moving=False):
+    TaskPlacement.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+        owner_id=owner_id, defaults={'shard': shard, 'moving': moving},
+    )
+    get_cache().set(PLACEMENT_KEY.format(owner_id), (shard, moving), getattr(settings, 'TASK_SHARD_CACHE_TIMEOUT', 5))
+
+
+def forget_placement(owner_id):
+    get_cache().delete(PLACEMENT_KEY.format(owner_id))
+
+
+def shard_for(owner_id):
+    """
+    The alias holding the owner's tasks, or None (the default database) when
+    sharding is off. For transaction.atomic(using=...) and on_commit(using=...).
+    """
+    return get_placement(owner_id)[0] if is_enabled() else None
+
+
+def for_owner(model, owner_id):
+    """
+    model.objects, routed to the owner's shard.
+    """
+    return model.objects.db_manager(hints={'owner_id': owner_id})
+
+
+class TaskShardRouter:
+    """
+    Routes the sharded models to their owner's shard, found from the `owner_id`
+    hint (for_owner()) or the `instance` hint (a sharded row, or a user for their
+    related managers). Refuses writes while the owner is being moved, and queries
+    that don't say whose tasks they touch. TaskPlacement always uses 'default'.
+    Does nothing with a single shard. Goes before PrimaryReplicaRouter: replicas
+    are not used for sharded reads. Every shard gets every table when migrated.
+    """
+
+    def route(self, model, hints):
+        """
+        Returns (shard, moving), or None to leave the model to the next router.
+        """
+        if not is_enabled():
+            return None
+        if model is TaskPlacement:
+            return DEFAULT_DB_ALIAS, False
+        if model._meta.label_lower not in SHARDED_MODELS:
+            return None
+        return get_placement(self.owner_of(model, hints))
+
+    @staticmethod
+    def owner_of(model, hints):
+        if 'owner_id' in hints:
+            return hints['owner_id']
+        instance = hints.get('instance')
+        if instance is not None and instance._meta.label_lower in SHARDED_MODELS:
+            return instance.owner_id
+        if isinstance(instance, get_user_model()):
+            return instance.pk
+        raise ValueError(
+            f"{model.__name__} queries must name the owner when tasks are sharded: "
+            "use tasks.sharding.for_owner(), or .using() a shard."
+        )
+
+    def db_for_read(self, model, **hints):
+        placement = self.route(model, hints)
+        return placement and placement[0]
+
+    def db_for_write(self, model, **hints):
+        placement = self.route(model, hints)
+        if placement is None:
+            return None
+        shard, moving = placement
+        if moving:
+            raise TaskShardMoving()
+        return shard
+
+
+def reserve_id_range(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate handler: moves the task and tombstone id sequences of a shard to
+    the start of its range (id_range()), unless they are past it already.
+    """
+    if using not in get_shards():
+        return
+    first = id_range(using)[0]
+    if not first:
+        return
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for model in (Task, TaskTombstone):
+            table = model._meta.db_table
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    'INSERT INTO sqlite_sequence (name, seq) SELECT %s, 0 '
+                    'WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)',
+                    [table, table],
+                )
+                cursor.execute(
+                    'UPDATE sqlite_sequence SET seq = %s WHERE name = %s AND seq < %s', [first - 1, table, first - 1],
+                )
+            elif connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT setval(s::regclass, GREATEST(%s, nextval(s::regclass)), false) "
+                    "FROM pg_get_serial_sequence(%s, 'id') AS s",
+                    [first, table],
+                )
+            else:
+                raise ImproperlyConfigured(
+                    f"Task shards support SQLite and PostgreSQL only; {using!r} is {connection.vendor}."
+                )
+
+
+def copy_owner_rows(model, owner_id, source, target, batch_size=1000):
+    """
+    Makes the owner's rows of `model` on `target` the same as on `source`, copying
+    rows that are missing or changed (by updated_at, when the model has it) and
+    deleting the ones `source` no longer has. Ids and timestamps are kept. Counters
+    and search index entries follow through the triggers. Returns how many rows
+    were copied or deleted.
+    """
+    version = 'updated_at' if any(field.name == 'updated_at' for field in model._meta.fields) else 'id'
+    stamps = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    wanted = dict(model.objects.using(source).filter(owner_id=owner_id).values_list('id', version))
+    present = dict(model.objects.using(target).filter(owner_id=owner_id).values_list('id', version))
+    stale = [pk for pk, value in present.items() if pk not in wanted or wanted[pk] != value]
+    missing = [pk for pk, value in wanted.items() if pk not in present or present[pk] != value]
+
+    with transaction.atomic(using=target):
+        for start in range(0, len(stale), batch_size):
+            model.objects.using(target).filter(pk__in=stale[start:start + batch_size]).delete()
+        for start in range(0, len(missing), batch_size):
+            rows = list(model.objects.using(source).filter(pk__in=missing[start:start + batch_size]))
+            # The insert sets auto_now/auto_now_add fields to now: written back after it.
+            originals = [[getattr(row, name) for name in stamps] for row in rows]
+            model.objects.using(target).bulk_create(rows)
+            for row, values in zip(rows, originals):
+                for name, value in zip(stamps, values):
+                    setattr(row, name, value)
+            if stamps:
+                model.objects.using(target).bulk_update(rows, stamps)
+    return len(stale) + len(missing)
+
+
+def move_owner(owner_id, target, grace=None, batch_size=1000, max_passes=5, log=None):
+    """
+    Moves the owner's tasks and tombstones to the `target` shard, online:
+
+    1. Copies them while the owner keeps reading and writing on the source, again
+       until a pass has little left to copy.
+    2. Freezes the owner's task writes (TaskShardMoving, a 503 with Retry-After),
+       waits `grace` seconds (at least TASK_SHARD_CACHE_TIMEOUT, so every worker
+       sees the freeze, plus time for writes in flight), and copies what is left.
+    3. Places the owner on the target, which unfreezes them, waits
+       TASK_SHARD_CACHE_TIMEOUT again, and deletes their rows from the source.
+
+    Reads are served by the source until the switch, and by workers that still
+    have the frozen placement cached until the second wait is over; those workers
+    keep refusing writes, so none land on the source. If anything fails before the
+    switch, the owner is unfrozen on the source and the copies on the target are
+    left for a later attempt to reuse.
+    """
+    log = log or (lambda message: None)
+    timeout = getattr(settings, 'TASK_SHARD_CACHE_TIMEOUT', 5)
+    grace = max(timeout + 2 if grace is None else grace, timeout)
+    source, moving = get_placement(owner_id, cached=False)
+    if target not in get_shards():
+        raise ValueError(f"Unknown shard {target!r}: TASK_SHARDS is {get_shards()}.")
+    if moving:
+        raise ValueError(f"User #{owner_id} is already being moved.")
+    if source == target:
+        return
+    if connections[target].vendor == 'sqlite':
+        # SQLite continues AUTOINCREMENT after the largest id in the table, so ids
+        # above the target's range would move it into the next shard's.
+        end = id_range(target)[1]
+        for model in (Task, TaskTombstone):
+            if model.objects.using(source).filter(owner_id=owner_id, id__gte=end).exists():
+                raise ValueError(f"User #{owner_id} has {model.__name__} ids above the range of {target!r}.")
+
+    def copy():
+        return sum(copy_owner_rows(model, owner_id, source, target, batch_size) for model in (Task, TaskTombstone))
+
+    for number in range(1, max_passes + 1):
+        copied = copy()
+        log(f"Pass {number}: {copied} row(s) copied or deleted.")
+        if copied < batch_size: # The rest is copied in the final pass, with writes frozen
+            break
+    set_placement(owner_id, source, moving=True)
+    try:
+        log(f"Writes frozen, waiting {grace}s.")
+        time.sleep(grace)
+        log(f"Final pass: {copy()} row(s) copied or deleted.")
+        set_placement(owner_id, target)
+    except BaseException:
+        set_placement(owner_id, source)
+        raise
+    log(f"Switched to {target}, waiting {timeout}s before deleting from {source}.")
+    time.sleep(timeout)
+    with transaction.atomic(using=source):
+        Task.objects.using(source).filter(owner_id=owner_id).delete()
+        TaskTombstone.objects.using(source).filter(owner_id=owner_id).delete()
+        TaskStats.objects.using(source).filter(owner_id=owner_id).delete()
+    task_list_cache.bump(owner_id)
+    log(f"User #{owner_id} moved from {source} to {target}.")
+
+
+def delete_owner_rows(owner_id, shard):
+    """
+    Deletes everything the owner has on the shard.
+    """
+    with transaction.atomic(using=shard):
+        for model in (Task, TaskTombstone, TaskStats):
+            model.objects.using(shard).filter(owner_id=owner_id).delete()
@@ -0,0 +1,48 @@
+# ~/Alx_CapstoneProject/tasks/signals.py
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import sharding
+from .cache import task_list_cache
+from .models import Task, TaskPlacement
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_list_cache(sender, instance, using, **kwargs):
+    """
+    Drops the owner's cached task lists once the write is committed, so a concurrent
+    request cannot re-cache the old data under the new version.
+    """
+    owner_id = instance.owner_id
+    transaction.on_commit(lambda: task_list_cache.bump(owner_id), using=using)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def place_new_user(sender, instance, created, using, **kwargs):
+    """
+    Places a new user's tasks on a shard, by hash, when tasks are sharded.
+    """
+    if created and sharding.is_enabled():
+        TaskPlacement.objects.using(using).create(owner_id=instance.pk, shard=sharding.hash_shard(instance.pk))
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def delete_sharded_rows(sender, instance, using, **kwargs):
+    """
+    The deletion only cascades to the tasks on the user's database: those on
+    another shard are deleted once it is committed.
+    """
+    if not sharding.is_enabled():
+        return
+    owner_id = instance.pk
+    shard = sharding.get_placement(owner_id, cached=False)[0]
+
+    def cleanup():
+        sharding.forget_placement(owner_id)
+        if shard != using:
+            sharding.delete_owner_rows(owner_id, shard)
+    transaction.on_commit(cleanup, using=using)
@@ -0,0 +1,76 @@
+# ~/Alx_CapstoneProject/tasks/stats.py
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Task, TaskStats
+from .sharding import for_owner
+
+
+def count_overdue(owner_id, today=None):
+    """
+    Number of the owner's open tasks due before today. An index-only count: a range
+    of task_owner_done_due_idx (owner, is_completed, due_date), no table rows read.
+    """
+    today = today or timezone.localdate()
+    # is_completed__in: an equality the index can seek on. is_completed=False is written
+    # "NOT is_completed", which the database checks entry by entry over the owner's range.
+    return for_owner(Task, owner_id).filter(owner_id=owner_id, is_completed__in=[False], due_date__lt=today).count()
+
+
+def get_stats(owner_id, today=None):
+    """
+    Returns the owner's {'total', 'completed', 'open', 'overdue'} task counts: one
+    primary key lookup of the counters, plus the overdue count if any task is open.
+    """
+    total, completed = for_owner(TaskStats, owner_id).filter(owner_id=owner_id).values_list('total', 'completed').first() or (0, 0)
+    open_tasks = total - completed
+    return {
+        'total': total,
+        'completed': completed,
+        'open': open_tasks,
+        'overdue': count_overdue(owner_id, today) if open_tasks else 0,
+    }
+
+
+def find_drift(using=DEFAULT_DB_ALIAS):
+    """
+    Compares every user's counters with a full aggregate of the task table, on one
+    database (a shard, see tasks/sharding.py).
+    Returns {owner_id: (stored, actual)} for the users whose counters are wrong,
+    each side a (total, completed) pair; (0, 0) stands for a missing row.
+    """
+    actual = {
+        owner_id: (total, completed)
+        for owner_id, total, completed in Task.objects.using(using).order_by().values('owner').annotate(
+            total=Count('id'), completed=Count('id', filter=Q(is_completed=True)),
+        ).values_list('owner', 'total', 'completed')
+    }
+    stored = {
+        owner_id: (total, completed)
+        for owner_id, total, completed in TaskStats.objects.using(using).values_list('owner', 'total', 'completed')
+    }
+    return {
+        owner_id: (stored.get(owner_id, (0, 0)), actual.get(owner_id, (0, 0)))
+        for owner_id in stored.keys() | actual.keys()
+        if stored.get(owner_id, (0, 0)) != actual.get(owner_id, (0, 0))
+    }
+
+
+def rebuild_stats(using=DEFAULT_DB_ALIAS):
+    """
+    Rewrites the counters that disagree with the task table and returns find_drift()'s
+    result from before the repair. Task writes wait until it is done, so none can slip
+    between the aggregate and the rewrite.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('LOCK TABLE tasks_task IN SHARE ROW EXCLUSIVE MODE')
+        # On SQLite, transactions start with BEGIN IMMEDIATE and hold the write lock already.
+        drift = find_drift(using)
+        for owner_id, (stored, (total, completed)) in drift.items():
+            TaskStats.objects.using(using).update_or_create(owner_id=owner_id, defaults={'total': total, 'completed': completed})
+    return drift
@@ -1,3 +1,1049 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import search, sharding, stats
+from .async_views import AsyncTaskDetailView, AsyncTaskListCreateView
+from .models import LIST_ORDERING, Task, TaskPlacement, TaskStats, TaskTombstone
+from .pagination import TaskKeysetPagination
+from .serializers import TaskSerializer
+from .views import TaskExportAPIView
+
+User = get_user_model()
+
+
+class TaskAPITestCase(APITestCase):
+    """
+    Base class for the task API tests: authenticates as `cls.user`, and starts every
+    test with an empty cache so cached task lists never leak from one test to another.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+
+class TaskKeysetPaginationTests(TaskAPITestCase):
+    """
+    Tests for the opt-in keyset (cursor) pagination of the task list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-list-create')
+
+        today = datetime.date(2025, 1, 1)
+        due_dates = [None, None, today, today, today + datetime.timedelta(days=1), None, today]
+        for i, due_date in enumerate(due_dates):
+            Task.objects.create(owner=self.user, title=f'Task {i}', due_date=due_date)
+
+    def expected_ids(self):
+        # Dated tasks by due date, then undated tasks; ties broken by created_at, id.
+        tasks = sorted(
+            Task.objects.filter(owner=self.user),
+            key=lambda t: (t.due_date is None, t.due_date or datetime.date.min, t.created_at, t.id),
+        )
+        return [task.id for task in tasks]
+
+    def test_unpaginated_list_is_unchanged(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual([task['id'] for task in response.data], self.expected_ids())
+
+    def test_walks_every_task_once_in_order(self):
+        seen = []
+        url = self.url + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, self.expected_ids())
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_regions_compare_undated_with_booleans(self):
+        # (due_date IS NULL) is a boolean: PostgreSQL rejects comparing it with 0 or 1.
+        position = (datetime.date(2025, 1, 1), timezone.now(), 1)
+        for regions, expected in [(TaskKeysetPagination.get_regions(None), [False, True]),
+                                  (TaskKeysetPagination.get_regions(position), [False, True])]:
+            flags = []
+            for region in regions:
+                sql, params = Task.objects.filter(region).query.sql_with_params()
+                self.assertIn('"due_date" IS NULL) = %s', sql)
+                flags.append(params[0])
+            self.assertEqual(flags, expected)
+            self.assertTrue(all(type(flag) is bool for flag in flags))
+
+    def test_page_queries_are_index_range_scans(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN output is checked for SQLite only.')
+        tasks = Task.objects.filter(owner=self.user)
+        dated, undated = Task.objects.get(title='Task 3'), Task.objects.get(title='Task 5')
+        expected = {
+            None: ['(owner_id=? AND <expr>=?)', '(owner_id=? AND <expr>=? AND due_date=?)'],
+            (dated.due_date, dated.created_at, dated.pk): [
+                '(owner_id=? AND <expr>=? AND due_date>?)', '(owner_id=? AND <expr>=? AND due_date=?)',
+            ],
+            (None, undated.created_at, undated.pk): ['(owner_id=? AND <expr>=? AND due_date=? AND created_at>?)'],
+        }
+        for position, seeks in expected.items():
+            regions = TaskKeysetPagination.get_regions(position)
+            self.assertEqual(len(regions), len(seeks))
+            for region, seek in zip(regions, seeks):
+                plan = tasks.filter(region).order_by(*TaskKeysetPagination.ordering)[:10].explain()
+                self.assertIn(f'SEARCH tasks_task USING INDEX task_owner_list_idx {seek}', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+
+class TaskBulkAPITests(TaskAPITestCase):
+    """
+    Tests for the batched create/update/delete endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass12345')
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-bulk')
+
+    def test_applies_mixed_operations(self):
+        to_update = Task.objects.create(owner=self.user, title='Old title')
+        to_delete = Task.objects.create(owner=self.user, title='Remove me')
+
+        response = self.client.post(self.url, [
+            {'op': 'create', 'data': {'title': 'New task', 'due_date': '2025-03-01'}},
+            {'op': 'update', 'id': to_update.pk, 'data': {'is_completed': True}},
+            {'op': 'delete', 'id': to_delete.pk},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'updated', 'deleted'])
+        self.assertEqual(results[0]['task']['owner'], 'owner')
+        to_update.refresh_from_db()
+        self.assertTrue(to_update.is_completed)
+        self.assertEqual(to_update.title, 'Old title')
+        self.assertFalse(Task.objects.filter(pk=to_delete.pk).exists())
+        self.assertTrue(Task.objects.filter(owner=self.user, title='New task').exists())
+
+    def test_invalid_batch_writes_nothing(self):
+        foreign = Task.objects.create(owner=self.other, title='Not yours')
+
+        response = self.client.post(self.url, [
+            {'op': 'create', 'data': {'title': 'Valid'}},
+            {'op': 'create', 'data': {'title': ''}},
+            {'op': 'delete', 'id': foreign.pk},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('title', response.data[1])
+        self.assertIn('id', response.data[2])
+        self.assertFalse(Task.objects.filter(owner=self.user).exists())
+        self.assertTrue(Task.objects.filter(pk=foreign.pk).exists())
+
+    def test_statement_count_does_not_grow_with_batch_size(self):
+        def count_queries(size):
+            tasks = Task.objects.bulk_create([Task(owner=self.user, title=f'T{i}') for i in range(2 * size)])
+            operations = (
+                [{'op': 'create', 'data': {'title': f'N{i}'}} for i in range(size)]
+                + [{'op': 'update', 'id': t.pk, 'data': {'title': 'Edited'}} for t in tasks[:size]]
+                + [{'op': 'delete', 'id': t.pk} for t in tasks[size:]]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, operations, format='json')
+            self.assertEqual(response.status_code, 200)
+            return len(queries.captured_queries)
+
+        self.assertEqual(count_queries(2), count_queries(50))
+
+
+class TaskListQueryCountTests(TaskAPITestCase):
+    """
+    The task list must not issue a query per task (e.g. to look up the owner).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-list-create')
+
+    def assert_list_queries(self, count):
+        Task.objects.bulk_create([Task(owner=self.user, title=f'Task {i}') for i in range(count)])
+        with self.assertNumQueries(2): # ETag aggregate + task list
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), count)
+        self.assertEqual(response.data[0]['owner'], 'owner')
+
+    def test_list_1_task(self):
+        self.assert_list_queries(1)
+
+    def test_list_100_tasks(self):
+        self.assert_list_queries(100)
+
+    def test_list_10000_tasks(self):
+        self.assert_list_queries(10000)
+
+    def test_cached_list_needs_no_query(self):
+        Task.objects.create(owner=self.user, title='Cached')
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_str_does_not_load_owner(self):
+        task = Task.objects.create(owner=self.user, title='Write report')
+        task = Task.objects.get(pk=task.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(task), f'Write report (Owner: #{self.user.pk})')
+        self.assertEqual(str(Task.objects.select_related('owner').get(pk=task.pk)), 'Write report (Owner: owner)')
+
+
+class TaskQueryPlanTests(TaskAPITestCase):
+    """
+    Locks in the SQLite query plans of the hot task queries: each one is an index
+    search, and ORDER BY is only emitted (and never sorted in a temp b-tree) for lists.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.task = Task.objects.create(owner=cls.user, title='Dated', due_date=datetime.date(2025, 2, 3))
+        Task.objects.create(owner=cls.user, title='Undated')
+
+    def setUp(self):
+        super().setUp()
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN output is checked for SQLite only.')
+
+    def test_list_is_read_in_index_order(self):
+        plan = Task.objects.filter(owner=self.user).order_by(*LIST_ORDERING).explain()
+        self.assertIn('SEARCH tasks_task USING INDEX task_owner_list_idx (owner_id=?)', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_detail_lookup_uses_primary_key_without_order_by(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('tasks:task-detail', args=[self.task.pk]))
+        self.assertEqual(response.status_code, 200)
+        for query in queries.captured_queries:
+            self.assertNotIn('ORDER BY', query['sql'])
+        plan = Task.objects.filter(owner=self.user, pk=self.task.pk).explain()
+        self.assertIn('SEARCH tasks_task USING INTEGER PRIMARY KEY (rowid=?)', plan)
+
+    def test_etag_aggregate_reads_covering_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('tasks:task-list-create'))
+        aggregate = queries.captured_queries[0]['sql'] # Interpolated SQL; EXPLAIN it as is
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {aggregate}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('USING COVERING INDEX task_owner_updated_idx', plan)
+
+    def test_due_date_ordering_puts_undated_last(self):
+        for ordering in ('due_date', '-due_date'):
+            response = self.client.get(reverse('tasks:task-list-create'), {'ordering': ordering})
+            self.assertEqual([task['title'] for task in response.data], ['Dated', 'Undated'])
+
+
+class TaskListFastPathTests(TaskAPITestCase):
+    """
+    The values_list()/TaskRowEncoder list path must render exactly what TaskSerializer renders.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Task.objects.create(owner=cls.user, title='Dated', description='Details', due_date=datetime.date(2025, 2, 3))
+        Task.objects.create(owner=cls.user, title='Undated', is_completed=True)
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-list-create')
+
+    def serializer_output(self, response):
+        tasks = Task.objects.filter(owner=self.user).order_by(*LIST_ORDERING)
+        data = TaskSerializer(tasks, many=True, context={'request': response.wsgi_request}).data
+        return JSONRenderer().render(data)
+
+    def test_output_is_byte_identical(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, self.serializer_output(response))
+
+    def test_output_is_byte_identical_in_other_timezone(self):
+        with timezone.override('Africa/Lagos'):
+            response = self.client.get(self.url)
+            self.assertEqual(response.content, self.serializer_output(response))
+        self.assertIn('+01:00', response.data[0]['created_at'])
+
+
+class TaskListCacheTests(TaskAPITestCase):
+    """
+    Tests for the per-user task-list response cache and its invalidation.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-list-create')
+
+    def titles(self, **params):
+        return sorted(task['title'] for task in json.loads(self.client.get(self.url, params).content))
+
+    def test_writes_invalidate_cached_list(self):
+        self.assertEqual(self.titles(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'title': 'Created'}, format='json')
+        self.assertEqual(self.titles(), ['Created'])
+
+        detail_url = reverse('tasks:task-detail', args=[response.data['id']])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(detail_url, {'title': 'Renamed'}, format='json')
+        self.assertEqual(self.titles(), ['Renamed'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks:task-bulk'), [{'op': 'create', 'data': {'title': 'Bulk'}}], format='json')
+        self.assertEqual(self.titles(), ['Bulk', 'Renamed'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(detail_url)
+        self.assertEqual(self.titles(), ['Bulk'])
+
+    def test_query_parameters_are_cached_separately(self):
+        Task.objects.bulk_create([Task(owner=self.user, title=f'Task {i}') for i in range(3)])
+        self.assertEqual(len(self.client.get(self.url).json()), 3)
+        self.assertEqual(len(self.client.get(self.url, {'page_size': 1}).json()['results']), 1)
+
+    def test_stats_are_staff_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(reverse('tasks:task-cache-stats')).status_code, 403)
+
+        self.client.force_authenticate(User(pk=self.user.pk, username='owner', is_staff=True))
+        response = self.client.get(reverse('tasks:task-cache-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['hits'], response.data['misses']), (1, 1))
+
+
+class TaskExportTests(TaskAPITestCase):
+    """
+    Tests for the streaming JSON/NDJSON export.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass12345')
+        Task.objects.bulk_create([Task(owner=cls.user, title=f'Task {i}') for i in range(5)])
+        Task.objects.create(owner=cls.other, title='Not mine')
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-export')
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_json_export_matches_task_list(self):
+        with mock.patch.object(TaskExportAPIView, 'chunk_size', 2): # Force several chunks
+            response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'application/json')
+        exported = sorted(json.loads(content), key=lambda task: task['id'])
+        listed = sorted(self.client.get(reverse('tasks:task-list-create')).json(), key=lambda task: task['id'])
+        self.assertEqual(exported, listed)
+
+    def test_ndjson_export(self):
+        response, content = self.export(output='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual({json.loads(line)['owner'] for line in lines}, {'owner'})
+
+    def test_updated_since_filter(self):
+        cutoff = timezone.now()
+        Task.objects.filter(owner=self.user, title='Task 0').update(updated_at=cutoff + datetime.timedelta(seconds=1))
+        _, content = self.export(updated_since=cutoff.isoformat())
+        self.assertEqual([task['title'] for task in json.loads(content)], ['Task 0'])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'updated_since': 'yesterday'}).status_code, 400)
+
+
+class TaskConditionalRequestTests(TaskAPITestCase):
+    """
+    Tests for ETag/Last-Modified validators and conditional requests.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(owner=self.user, title='Conditional')
+        self.list_url = reverse('tasks:task-list-create')
+        self.detail_url = reverse('tasks:task-detail', args=[self.task.pk])
+
+    def test_list_not_modified_after_single_query(self):
+        etag = self.client.get(self.list_url)['ETag']
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_list_not_modified_without_query(self):
+        etag = self.client.get(self.list_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_on_write(self):
+        etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(owner=self.user, title='Another')
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.filter(title='Another').delete()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_if_modified_since(self):
+        last_modified = self.client.get(self.list_url)['Last-Modified']
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_not_modified(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_with_stale_if_match_fails(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.patch(self.detail_url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # A second writer still holding the old ETag must not overwrite the change.
+        response = self.client.patch(self.detail_url, {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        response = self.client.delete(self.detail_url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'First')
+
+
+class TaskSyncTests(TaskAPITestCase):
+    """
+    Tests for the delta sync endpoint and task tombstones.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-sync')
+        self.tasks = [Task.objects.create(owner=self.user, title=f'Task {i}') for i in range(3)]
+
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params['cursor'] = cursor
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_initial_sync_in_pages(self):
+        first = self.sync(limit=2)
+        self.assertTrue(first['has_more'])
+        second = self.sync(first['cursor'], limit=2)
+        self.assertFalse(second['has_more'])
+        ids = [task['id'] for task in first['changed'] + second['changed']]
+        self.assertEqual(ids, [task.pk for task in self.tasks])
+        self.assertEqual(first['deleted'] + second['deleted'], [])
+
+    @override_settings(TASKS_SYNC_WINDOW=datetime.timedelta(0))
+    def test_only_changes_since_cursor(self):
+        cursor = self.sync()['cursor']
+        self.assertEqual(self.sync(cursor)['changed'], [])
+
+        updated, deleted = self.tasks[0], self.tasks[1]
+        self.client.patch(reverse('tasks:task-detail', args=[updated.pk]), {'is_completed': True}, format='json')
+        self.client.delete(reverse('tasks:task-detail', args=[deleted.pk]))
+        self.client.post(reverse('tasks:task-bulk'), [{'op': 'delete', 'id': self.tasks[2].pk}], format='json')
+
+        data = self.sync(cursor)
+        self.assertEqual([task['id'] for task in data['changed']], [updated.pk])
+        self.assertTrue(data['changed'][0]['is_completed'])
+        self.assertEqual(data['deleted'], [deleted.pk, self.tasks[2].pk])
+        data = self.sync(data['cursor'])
+        self.assertEqual((data['changed'], data['deleted']), ([], []))
+
+    def test_late_commit_behind_the_cursor_is_sent(self):
+        cursor = self.sync()['cursor']
+        # Stamped before the last task sent, but committed after the sync.
+        late = Task.objects.create(owner=self.user, title='Late')
+        Task.objects.filter(pk=late.pk).update(updated_at=self.tasks[-1].updated_at - datetime.timedelta(seconds=1))
+        TaskTombstone.objects.create(owner=self.user, task_id=self.tasks[0].pk)
+        TaskTombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(seconds=1))
+        Task.objects.filter(pk=self.tasks[0].pk).delete()
+
+        data = self.sync(cursor)
+        self.assertEqual([task['id'] for task in data['changed']], [late.pk, self.tasks[1].pk, self.tasks[2].pk])
+        self.assertEqual(data['deleted'], [self.tasks[0].pk])
+
+        # Outside the window the cursor moves on.
+        Task.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=1))
+        TaskTombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(minutes=1))
+        data = self.sync(self.sync(cursor)['cursor'])
+        self.assertEqual((data['changed'], data['deleted']), ([], []))
+
+    def test_expired_cursor_requires_full_resync(self):
+        cursor = self.sync()['cursor']
+        with self.settings(TASKS_TOMBSTONE_RETENTION=datetime.timedelta(0)):
+            self.assertEqual(self.client.get(self.url, {'cursor': cursor}).status_code, 410)
+
+    def test_compact_tombstones(self):
+        self.client.delete(reverse('tasks:task-detail', args=[self.tasks[0].pk]))
+        TaskTombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(days=40))
+        self.client.delete(reverse('tasks:task-detail', args=[self.tasks[1].pk]))
+        call_command('compact_task_tombstones', days=30, stdout=StringIO())
+        self.assertEqual(list(TaskTombstone.objects.values_list('task_id', flat=True)), [self.tasks[1].pk])
+
+    def test_change_query_uses_owner_updated_index(self):
+        plan = Task.objects.filter(owner=self.user, updated_at__gt=timezone.now()).order_by('updated_at', 'id').explain()
+        if connection.vendor == 'sqlite':
+            self.assertIn('task_owner_updated_idx', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+
+class TaskFilterTests(TaskAPITestCase):
+    """
+    Tests for server-side filtering, search and ordering of the task list.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.today = datetime.date(2025, 6, 15)
+        Task.objects.create(owner=cls.user, title='Pay rent', due_date=cls.today - datetime.timedelta(days=3))
+        Task.objects.create(owner=cls.user, title='Buy milk', description='Semi-skimmed', is_completed=True,
+                            due_date=cls.today - datetime.timedelta(days=1))
+        Task.objects.create(owner=cls.user, title='Plan trip', due_date=cls.today + datetime.timedelta(days=10))
+        Task.objects.create(owner=cls.user, title='Read book')
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-list-create')
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [task['title'] for task in response.json()]
+
+    def test_is_completed(self):
+        self.assertEqual(self.titles(is_completed='true'), ['Buy milk'])
+        self.assertEqual(sorted(self.titles(is_completed='false')), ['Pay rent', 'Plan trip', 'Read book'])
+
+    def test_overdue_open_tasks(self):
+        self.assertEqual(self.titles(is_completed='false', due_before=self.today.isoformat()), ['Pay rent'])
+        self.assertEqual(self.titles(due_after=self.today.isoformat()), ['Plan trip'])
+
+    def test_updated_since(self):
+        self.assertEqual(len(self.titles(updated_since='2000-01-01T00:00:00Z')), 4)
+        self.assertEqual(self.titles(updated_since=(timezone.now() + datetime.timedelta(hours=1)).isoformat()), [])
+
+    def test_search_title_and_description(self):
+        self.assertEqual(self.titles(search='rent'), ['Pay rent'])
+        self.assertEqual(self.titles(search='skimmed'), ['Buy milk'])
+
+    def test_ordering_is_whitelisted(self):
+        self.assertEqual(self.titles(ordering='title'), ['Buy milk', 'Pay rent', 'Plan trip', 'Read book'])
+        self.assertEqual(self.titles(ordering='-title')[0], 'Read book')
+        # Unknown fields are ignored rather than ordering by arbitrary columns.
+        self.assertEqual(len(self.titles(ordering='owner__password')), 4)
+
+    def test_invalid_values(self):
+        for params in ({'is_completed': 'maybe'}, {'due_before': '2025-13-01'}, {'updated_since': 'soon'},
+                       {'ordering': 'title', 'page_size': 2}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+    def test_every_filter_combination_is_an_index_search(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN output is checked for SQLite only.')
+        base = Task.objects.filter(owner=self.user)
+        filters = {
+            'is_completed': {'is_completed': False},
+            'due_before': {'due_date__lt': self.today},
+            'due_after': {'due_date__gt': self.today},
+            'updated_since': {'updated_at__gte': timezone.now()},
+        }
+        names = list(filters)
+        for mask in range(1, 2 ** len(names)):
+            lookups = {}
+            for i, name in enumerate(names):
+                if mask & (1 << i):
+                    lookups.update(filters[name])
+            plan = base.filter(**lookups).explain()
+            self.assertRegex(plan, r'SEARCH tasks_task USING (COVERING )?INDEX task_owner_', lookups)
+            self.assertNotIn('SCAN tasks_task', plan, lookups)
+
+
+class TaskStatsTests(TaskAPITestCase):
+    """
+    Tests for the trigger-maintained task counters and the stats endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-stats')
+        self.today = timezone.localdate()
+
+    def stored(self, user=None):
+        return TaskStats.objects.filter(owner=user or self.user).values_list('total', 'completed').first()
+
+    def test_counters_follow_every_write_path(self):
+        detail = lambda task: reverse('tasks:task-detail', args=[task.pk])
+        response = self.client.post(reverse('tasks:task-list-create'), {'title': 'API'}, format='json')
+        task = Task.objects.get(pk=response.data['id'])
+        self.assertEqual(self.stored(), (1, 0))
+        self.client.patch(detail(task), {'is_completed': True}, format='json')
+        self.assertEqual(self.stored(), (1, 1))
+        self.client.patch(detail(task), {'title': 'Renamed'}, format='json')
+        self.assertEqual(self.stored(), (1, 1))
+
+        Task.objects.bulk_create([Task(owner=self.user, title=f'Bulk {i}', is_completed=i == 0) for i in range(3)])
+        self.assertEqual(self.stored(), (4, 2))
+        Task.objects.filter(owner=self.user).update(is_completed=False)
+        self.assertEqual(self.stored(), (4, 0))
+        self.client.post(reverse('tasks:task-bulk'), [
+            {'op': 'update', 'id': task.pk, 'data': {'is_completed': True}},
+            {'op': 'delete', 'id': Task.objects.get(title='Bulk 1').pk},
+        ], format='json')
+        self.assertEqual(self.stored(), (3, 1))
+        self.client.delete(detail(task))
+        self.assertEqual(self.stored(), (2, 0))
+
+        other = User.objects.create_user(email='other@example.com', username='other', password='pass12345')
+        Task.objects.filter(title='Bulk 2').update(owner=other, is_completed=True)
+        self.assertEqual(self.stored(), (1, 0))
+        self.assertEqual(self.stored(other), (1, 1))
+
+    def test_endpoint_counts(self):
+        yesterday, tomorrow = self.today - datetime.timedelta(days=1), self.today + datetime.timedelta(days=1)
+        Task.objects.create(owner=self.user, title='Overdue', due_date=yesterday)
+        Task.objects.create(owner=self.user, title='Done late', due_date=yesterday, is_completed=True)
+        Task.objects.create(owner=self.user, title='Due soon', due_date=tomorrow)
+        Task.objects.create(owner=self.user, title='Undated')
+        with self.assertNumQueries(2): # Counters + overdue count
+            response = self.client.get(self.url)
+        self.assertEqual(response.data, {'total': 4, 'completed': 1, 'open': 3, 'overdue': 1})
+
+        Task.objects.filter(title='Due soon').update(due_date=yesterday)
+        self.assertEqual(self.client.get(self.url).data['overdue'], 2)
+
+    def test_user_without_open_tasks(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data, {'total': 0, 'completed': 0, 'open': 0, 'overdue': 0})
+
+    def test_overdue_count_is_an_index_only_range(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN output is checked for SQLite only.')
+        with CaptureQueriesContext(connection) as queries:
+            stats.count_overdue(self.user.pk)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {queries.captured_queries[0]['sql']}")
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn(
+            'SEARCH tasks_task USING COVERING INDEX task_owner_done_due_idx '
+            '(owner_id=? AND is_completed=? AND due_date<?)', plan,
+        )
+
+    def test_rebuild_command_verifies_and_repairs(self):
+        Task.objects.bulk_create([Task(owner=self.user, title=f'Task {i}', is_completed=i < 2) for i in range(5)])
+        call_command('rebuild_task_stats', '--check', stdout=StringIO())
+
+        TaskStats.objects.filter(owner=self.user).update(total=9)
+        stray = User.objects.create_user(email='stray@example.com', username='stray', password='pass12345')
+        TaskStats.objects.create(owner=stray, total=1)
+        with self.assertRaisesMessage(CommandError, 'wrong for 2 user(s)'):
+            call_command('rebuild_task_stats', '--check', stdout=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_task_stats', stdout=out)
+        self.assertIn(f'User #{self.user.pk}: stored 9 total / 2 completed, actual 5 total / 2 completed.', out.getvalue())
+        self.assertEqual(self.stored(), (5, 2))
+        self.assertEqual(self.stored(stray), (0, 0))
+        call_command('rebuild_task_stats', '--check', stdout=StringIO())
+
+
+@unittest.skipUnless(search.is_available(), 'The task search index requires SQLite FTS5.')
+class TaskSearchTests(TaskAPITestCase):
+    """
+    Tests for the FTS5 task search index and the ranked search endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass12345')
+        cls.in_description = Task.objects.create(owner=cls.user, title='Weekly shop', description='Buy milk and eggs')
+        cls.in_title = Task.objects.create(owner=cls.user, title='Milk run')
+        cls.unrelated = Task.objects.create(owner=cls.user, title='Call the bank')
+        Task.objects.create(owner=cls.other, title='Milk the cows')
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('tasks:task-search')
+
+    def ids(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [task['id'] for task in response.json()]
+
+    def test_ranked_and_scoped_to_owner(self):
+        with self.assertNumQueries(3): # title tier + title/description tier + in_bulk
+            ids = self.ids('milk')
+        self.assertEqual(ids, [self.in_title.pk, self.in_description.pk])
+        self.assertEqual(self.ids('milk', limit=1), [self.in_title.pk])
+        self.assertEqual(self.ids('milk eggs'), [self.in_description.pk])
+        self.assertEqual(self.ids('cows'), [])
+
+    def test_index_follows_writes(self):
+        self.unrelated.title = 'Call the milkman'
+        self.unrelated.save()
+        self.assertEqual(self.ids('milkman'), [self.unrelated.pk])
+        self.assertEqual(self.ids('bank'), [])
+
+        self.in_title.delete()
+        self.assertEqual(self.ids('milk'), [self.in_description.pk])
+
+        Task.objects.bulk_create([Task(owner=self.user, title='Oat milk')])
+        Task.objects.filter(pk=self.in_description.pk).update(description='Bread')
+        self.assertEqual(len(self.ids('milk')), 1)
+        self.assertEqual(self.ids('oat'), self.ids('milk'))
+
+    def test_query_syntax_is_not_interpreted(self):
+        for q in ['milk"', 'milk AND', 'NEAR(milk', '*', 'owner_id:2', 'title:milk OR bank']:
+            self.assertEqual(self.client.get(self.url, {'q': q}).status_code, 200, q)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'milk', 'limit': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'milk', 'limit': 0}).status_code, 400)
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('delete-all')")
+        self.assertEqual(self.ids('milk'), [])
+        out = StringIO()
+        call_command('rebuild_task_search_index', stdout=out)
+        self.assertIn('4 task(s)', out.getvalue())
+        self.assertEqual(self.ids('milk'), [self.in_title.pk, self.in_description.pk])
+
+
+@unittest.skipUnless(os.environ.get('TASKS_SEARCH_BENCHMARK'), 'Set TASKS_SEARCH_BENCHMARK=1 to run (seeds 1M tasks).')
+@unittest.skipUnless(search.is_available(), 'The task search index requires SQLite FTS5.')
+class TaskSearchBenchmark(TaskAPITestCase):
+    """
+    Search latency over 1M tasks spread across 100 owners, the largest owning 100k.
+    Words follow a Zipf distribution over a 5,000-word vocabulary, in the data and in
+    the 1-2 word queries. Asserts a median under 10 ms per search_task_ids() call.
+    """
+
+    def test_search_latency_on_1m_tasks(self):
+        owners = [self.user.pk] + [
+            User.objects.create_user(email=f'bench{i}@example.com', username=f'bench{i}', password='x').pk
+            for i in range(99)
+        ]
+        rng = random.Random(1)
+        words = [f'word{i}' for i in range(5000)]
+        weights = [1 / (i + 1) for i in range(5000)]
+        now = timezone.now().isoformat()
+
+        def rows():
+            for i in range(1_000_000):
+                yield (owners[0] if i % 10 == 0 else owners[1 + i % 99],
+                       ' '.join(rng.choices(words, weights, k=4)),
+                       ' '.join(rng.choices(words, weights, k=12)), False, now, now)
+
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                'INSERT INTO tasks_task (owner_id, title, description, is_completed, created_at, updated_at) '
+                'VALUES (%s, %s, %s, %s, %s, %s)', rows(),
+            )
+        search.rebuild_index()
+
+        timings = []
+        for i in range(400):
+            query = ' '.join(rng.choices(words, weights, k=1 + i % 2))
+            start = time.perf_counter()
+            search.search_task_ids(self.user.pk, query, 50)
+            timings.append((time.perf_counter() - start) * 1000)
+        p50 = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.assertLess(p50, 10, f'task search over 1M tasks: p50 {p50:.2f} ms, p95 {p95:.2f} ms')
+
+
+class AsyncTaskAPITests(TaskAPITestCase):
+    """
+    Tests for the ASGI-native task views: same contract as the sync views.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        today = datetime.date(2025, 1, 1)
+        for i, due_date in enumerate([None, today, today + datetime.timedelta(days=1), None]):
+            Task.objects.create(owner=self.user, title=f'Task {i}', description='Async', due_date=due_date)
+
+    def test_views_are_async(self):
+        self.assertTrue(AsyncTaskListCreateView.view_is_async)
+        self.assertTrue(AsyncTaskDetailView.view_is_async)
+
+    async def test_list_matches_sync_view(self):
+        for query in ['', '?is_completed=false&search=task', '?ordering=-title', '?page_size=3']:
+            sync = await sync_to_async(self.client.get)(reverse('tasks:task-list-create') + query)
+            response = await self.async_client.get(reverse('tasks_async:task-list-create') + query, headers=self.headers)
+            self.assertEqual(response.status_code, 200, query)
+            if 'page_size' in query:
+                self.assertEqual(response.json()['results'], sync.json()['results'])
+                self.assertIn('/api/async/tasks/', response.json()['next'])
+            else:
+                self.assertEqual(response.content, sync.content, query)
+
+    async def test_create_update_delete(self):
+        url = reverse('tasks_async:task-list-create')
+        response = await self.async_client.post(url, {'title': 'Async task'}, content_type='application/json',
+                                                headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['owner'], 'owner')
+        detail = reverse('tasks_async:task-detail', args=[response.json()['id']])
+
+        response = await self.async_client.get(detail, headers=self.headers)
+        etag = response['ETag']
+        response = await self.async_client.get(detail, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.patch(detail, {'is_completed': True}, content_type='application/json',
+                                                 headers={**self.headers, 'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['is_completed'])
+        response = await self.async_client.patch(detail, {'title': 'Stale'}, content_type='application/json',
+                                                 headers={**self.headers, 'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+        response = await self.async_client.put(detail, {'title': ''}, content_type='application/json',
+                                               headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.json())
+
+        response = await self.async_client.delete(detail, headers=self.headers)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual((await self.async_client.get(detail, headers=self.headers)).status_code, 404)
+        self.assertTrue(await TaskTombstone.objects.filter(owner=self.user).aexists())
+
+    async def test_authentication_required(self):
+        url = reverse('tasks_async:task-list-create')
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+        response = await self.async_client.get(url, headers={'Authorization': 'Bearer not-a-token'})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'token_not_valid')
+
+    async def test_other_users_tasks_are_not_found(self):
+        other = await User.objects.acreate(email='other@example.com', username='other')
+        task = await Task.objects.acreate(owner=other, title='Not yours')
+        response = await self.async_client.get(reverse('tasks_async:task-detail', args=[task.pk]), headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskShardingTests(TransactionTestCase):
+    """
+    Tasks sharded over three SQLite files: 'default' and two shards, each a copy of
+    the default test database's schema with its id ranges reserved.
+    """
+    shards = ['default', 'shard1', 'shard2']
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Uses SQLite files as shards.')
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(TASK_SHARDS=self.shards, TASK_SHARD_CACHE_TIMEOUT=0))
+        connection.ensure_connection()
+        for alias in self.shards[1:]:
+            connections.settings[alias] = {**connections.settings['default'], 'NAME': str(Path(directory.name) / alias)}
+            self.addCleanup(connections.settings.pop, alias)
+            self.addCleanup(self.remove_connection, alias)
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                connection.connection.backup(target)
+            finally:
+                target.close()
+            # Connected here: the test case refuses to open connections to aliases it
+            # does not know about, and the shards are added after it starts.
+            connections[alias].connect()
+            sharding.reserve_id_range(None, using=alias)
+
+        self.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('tasks:task-list-create')
+
+    @staticmethod
+    def remove_connection(alias):
+        connections[alias].close()
+        del connections[alias]
+
+    def place(self, shard):
+        sharding.set_placement(self.user.pk, shard)
+
+    def create(self, **data):
+        response = self.client.post(self.url, {'title': 'Task', **data}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def rows(self, alias):
+        return list(
+            Task.objects.using(alias).filter(owner=self.user).order_by('id')
+            .values_list('id', 'title', 'is_completed', 'created_at', 'updated_at')
+        )
+
+    def test_new_users_are_placed_by_hash(self):
+        users = [self.user] + [
+            User.objects.create(email=f'user{i}@example.com', username=f'user{i}')
+            for i in range(20)
+        ]
+        placements = dict(TaskPlacement.objects.values_list('owner', 'shard'))
+        self.assertEqual(placements, {user.pk: sharding.hash_shard(user.pk) for user in users})
+        self.assertEqual(set(placements.values()), set(self.shards))
+
+    def test_api_uses_the_owners_shard(self):
+        self.place('shard1')
+        first, last = sharding.id_range('shard1')
+        task_id = self.create(title='Buy milk', is_completed=True)
+        self.assertTrue(first <= task_id < last)
+        self.create(title='Call mum', due_date='2000-01-01')
+        self.assertEqual(len(self.rows('shard1')), 2)
+        self.assertEqual(self.rows('default') + self.rows('shard2'), [])
+
+        self.assertEqual([task['title'] for task in self.client.get(self.url).json()], ['Call mum', 'Buy milk'])
+        self.assertEqual(
+            self.client.get(reverse('tasks:task-stats')).json(),
+            {'total': 2, 'completed': 1, 'open': 1, 'overdue': 1},
+        )
+        response = self.client.get(reverse('tasks:task-search'), {'q': 'milk'})
+        self.assertEqual([task['id'] for task in response.json()], [task_id])
+        detail = reverse('tasks:task-detail', args=[task_id])
+        self.assertEqual(self.client.patch(detail, {'title': 'Buy oat milk'}, format='json').status_code, 200)
+        self.assertEqual(self.client.delete(detail).status_code, 204)
+        self.assertEqual(TaskTombstone.objects.using('shard1').get().task_id, task_id)
+        self.assertEqual(self.user.tasks.count(), 1) # Related managers follow the owner
+
+        with self.assertRaises(ValueError): # Whose tasks?
+            Task.objects.count()
+
+    def test_move_command(self):
+        self.place('default')
+        ids = [self.create(title=f'Task {i}', is_completed=i % 2 == 0) for i in range(5)]
+        self.client.delete(reverse('tasks:task-detail', args=[ids.pop()]))
+        before, tombstones = self.rows('default'), list(TaskTombstone.objects.using('default').values_list())
+
+        out = StringIO()
+        call_command('move_task_shard', 'owner', 'shard2', grace=0, stdout=out)
+        self.assertIn('are on shard2', out.getvalue())
+        self.assertEqual(sharding.get_placement(self.user.pk), ('shard2', False))
+        self.assertEqual(self.rows('shard2'), before) # Same ids and timestamps
+        self.assertEqual(list(TaskTombstone.objects.using('shard2').values_list()), tombstones)
+        self.assertEqual(self.rows('default'), [])
+        self.assertFalse(TaskStats.objects.using('default').exists())
+        self.assertEqual(stats.find_drift('shard2'), {})
+
+        self.assertEqual([task['id'] for task in self.client.get(self.url).json()], ids)
+        self.assertEqual(self.client.get(reverse('tasks:task-stats')).json()['completed'], 2)
+        response = self.client.get(reverse('tasks:task-search'), {'q': 'task'})
+        self.assertEqual(sorted(task['id'] for task in response.json()), ids)
+        self.assertGreaterEqual(self.create(), sharding.id_range('shard2')[0])
+
+        with self.assertRaises(CommandError): # Its new ids are above the range of 'default'
+            call_command('move_task_shard', 'owner', 'default', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('move_task_shard', 'owner', 'shard9', stdout=StringIO())
+
+    def test_writes_during_a_move(self):
+        self.place('default')
+        task_id = self.create(title='Before')
+        statuses = []
+
+        def log(message):
+            # Runs between the steps of the move, like requests arriving meanwhile.
+            if message.startswith('Pass 1'):
+                statuses.append(self.client.post(self.url, {'title': 'During'}, format='json').status_code)
+            elif message.startswith('Writes frozen'):
+                response = self.client.patch(reverse('tasks:task-detail', args=[task_id]), {'title': 'Frozen'}, format='json')
+                statuses.append((response.status_code, response['Retry-After']))
+                statuses.append(self.client.get(self.url).status_code)
+
+        sharding.move_owner(self.user.pk, 'shard1', grace=0, log=log)
+        self.assertEqual(statuses, [201, (503, '1'), 200])
+        self.assertEqual(sorted(title for _, title, *_ in self.rows('shard1')), ['Before', 'During'])
+        self.assertEqual(self.rows('default'), [])
+
+    def test_stale_placement_after_a_move(self):
+        self.place('default')
+        task_id = self.create(title='Before')
+        detail = reverse('tasks:task-detail', args=[task_id])
+        results = []
+
+        def log(message):
+            if message.startswith('Switched'):
+                # A worker that cached the frozen placement before the switch: it keeps
+                # reading the source, which still has the rows, and refusing writes.
+                cache.set(sharding.PLACEMENT_KEY.format(self.user.pk), ('default', True))
+                results.append([task['title'] for task in self.client.get(self.url).json()])
+                results.append(self.client.get(detail).status_code)
+                results.append(self.client.post(self.url, {'title': 'Stale'}, format='json').status_code)
+                results.append(self.client.patch(detail, {'title': 'Stale'}, format='json').status_code)
+                sharding.forget_placement(self.user.pk)
+
+        sharding.move_owner(self.user.pk, 'shard1', grace=0, log=log)
+        self.assertEqual(results, [['Before'], 200, 503, 503])
+        self.assertEqual([title for _, title, *_ in self.rows('shard1')], ['Before'])
+        self.assertEqual(self.rows('default'), [])
+
+    def test_deleting_a_user_deletes_their_tasks_on_every_shard(self):
+        self.place('shard1')
+        self.create()
+        self.user.delete()
+        self.assertFalse(Task.objects.using('shard1').exists())
+        self.assertFalse(TaskStats.objects.using('shard1').exists())
+        self.assertFalse(TaskPlacement.objects.exists())
@@ -10,6 +10,30 @@ urlpatterns = [
     # This will now match /api/tasks/
     path('', views.TaskListCreateAPIView.as_view(), name='task-list-create'),
 
+    # URL for applying a batch of create/update/delete operations in one request
+    # This will match /api/tasks/bulk/
+    path('bulk/', views.TaskBulkAPIView.as_view(), name='task-bulk'),
+
+    # URL for streaming an export of all of the user's tasks (JSON or NDJSON)
+    # This will match /api/tasks/export/
+    path('export/', views.TaskExportAPIView.as_view(), name='task-export'),
+
+    # URL for delta sync: tasks changed and deleted since the client's cursor
+    # This will match /api/tasks/sync/
+    path('sync/', views.TaskSyncAPIView.as_view(), name='task-sync'),
+
+    # URL for ranked full-text search over the user's tasks
+    # This will match /api/tasks/search/?q=...
+    path('search/', views.TaskSearchAPIView.as_view(), name='task-search'),
+
+    # URL for the user's task counts (total, completed, open, overdue)
+    # This will match /api/tasks/stats/
+    path('stats/', views.TaskStatsAPIView.as_view(), name='task-stats'),
+
+    # URL for the task-list cache hit/miss counters (staff only)
+    # This will match /api/tasks/cache-stats/
+    path('cache-stats/', views.TaskListCacheStatsAPIView.as_view(), name='task-cache-stats'),
+
     # URL for retrieving, updating, or deleting a specific task by its ID
     # This will now match /api/tasks/<int:pk>/
     path('<int:pk>/', views.TaskRetrieveUpdateDestroyAPIView.as_view(), name='task-detail'),
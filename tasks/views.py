@@ -1,8 +1,34 @@
 # ~/Alx_CapstoneProject/tasks/views.py
 
-from rest_framework import generics, permissions
-from .models import Task
-from .serializers import TaskSerializer
+from itertools import islice
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import filters, generics, permissions, serializers, status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from todo_list_api.renderers import dumps
+from todo_list_api.routers import reads_from_replica
+
+from .cache import task_list_cache
+from .conditional import (
+    PreconditionFailed, check_preconditions, set_validators, task_detail_validators, task_list_validators,
+)
+from .filters import TaskFilterBackend, TaskOrderingFilter
+from .models import LIST_ORDERING, Task, TaskTombstone
+from .pagination import TaskKeysetPagination, decode_cursor, encode_cursor
+from .search import search_tasks
+from .serializers import TaskBulkOperationSerializer, TaskRowEncoder, TaskSerializer
+from .sharding import for_owner, shard_for
+from .stats import get_stats
 
 # --- Custom Permission ---
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -18,7 +44,8 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions (PUT, PATCH, DELETE) are only allowed to the owner of the object.
-        return obj.owner == request.user
+        # Compare ids so the owner row does not have to be loaded.
+        return obj.owner_id == request.user.pk
 
 # --- Task API Views ---
 
@@ -28,15 +55,73 @@ class TaskListCreateAPIView(generics.ListCreateAPIView):
     - Requires authentication.
     - Users can only see their own tasks.
     - When creating a task, the owner is automatically set to the authenticated user.
+    - Send `page_size` and/or `cursor` to page through the list with keyset pagination.
+    - Filter with `is_completed`, `due_before`, `due_after` and `updated_since`, search titles and
+      descriptions with `search`, and sort with `ordering` (not combinable with pagination).
+    - Responses carry ETag/Last-Modified; conditional GETs get a 304 after one aggregate query.
+    - Rendered list responses are cached per user (see tasks/cache.py) until their tasks change.
+    - With read replicas configured, reads may be served by a replica (todo_list_api/routers.py).
     """
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated] # Only authenticated users can access
+    throttle_scope = 'tasks' # Per-IP and per-user rate limits (todo_list_api/throttling.py)
+    pagination_class = TaskKeysetPagination # Opt-in: only used when ?page_size= or ?cursor= is sent
+    filter_backends = [TaskFilterBackend, filters.SearchFilter, TaskOrderingFilter]
+    search_fields = ['title', 'description']
+    ordering_fields = ['due_date', 'created_at', 'updated_at', 'title', 'is_completed']
+    ordering = LIST_ORDERING # Without ?ordering=
 
     def get_queryset(self):
         """
         Filters the queryset to return only tasks belonging to the authenticated user.
         """
-        return Task.objects.filter(owner=self.request.user).order_by('due_date', 'created_at')
+        return for_owner(Task, self.request.user.pk).filter(owner=self.request.user) # Ordered by TaskOrderingFilter
+
+    def list(self, request, *args, **kwargs):
+        """
+        Read-only fast path: fetches exactly the serialized columns with values_list()
+        and renders the rows with a precompiled TaskRowEncoder instead of building a
+        model instance and running TaskSerializer for every task.
+        The JSON output is identical to TaskSerializer(tasks, many=True).data.
+        If-None-Match/If-Modified-Since are answered before anything is serialized.
+        Cached responses are served as is, without touching the database.
+        """
+        cache_key, cached = task_list_cache.lookup(request)
+        if cached is not None:
+            not_modified = check_preconditions(request, cached['etag'], cached['last_modified'])
+            if not_modified is not None:
+                return not_modified
+            response = HttpResponse(cached['content'], content_type=cached['content_type'])
+            return set_validators(response, cached['etag'], cached['last_modified'])
+
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = task_list_validators(request, queryset)
+        not_modified = check_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        encoder = TaskRowEncoder(self.get_serializer(), owner_username=request.user.username)
+        queryset = queryset.values_list(*encoder.columns)
+
+        if self.paginator is not None:
+            self.paginator.position_of = encoder.getter(*self.paginator.ordering)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(encoder.encode_rows(page))
+        else:
+            response = Response(encoder.encode_rows(queryset))
+        # Cached by finalize_response() once rendered.
+        self.list_cache_entry = (cache_key, etag, last_modified)
+        return set_validators(response, etag, last_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        entry = getattr(self, 'list_cache_entry', None)
+        # Not from a replica: a lagging one would cache pre-write data under the new version.
+        if entry is not None and response.status_code == 200 and not reads_from_replica():
+            response.render()
+            task_list_cache.set(entry[0], response, *entry[1:])
+        return response
 
     def perform_create(self, serializer):
         """
@@ -45,20 +130,401 @@ class TaskListCreateAPIView(generics.ListCreateAPIView):
         """
         serializer.save(owner=self.request.user)
 
+class TaskExportAPIView(generics.GenericAPIView):
+    """
+    API view to export all of the authenticated user's tasks.
+    - Requires authentication.
+    - `?output=json` (default) streams a JSON array, `?output=ndjson` one JSON object per line.
+    - `?updated_since=<ISO datetime>` only exports tasks updated at or after that time,
+      for incremental exports (the other TaskFilterBackend filters work too).
+    - Rows are read with a chunked server-side iterator and written out as they are
+      read, so memory stays flat however many tasks the user has.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'tasks'
+    filter_backends = [TaskFilterBackend]
+    chunk_size = 2000 # Rows fetched from the database (and written out) at a time
+    content_types = {
+        'json': 'application/json',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def get_queryset(self):
+        """
+        Filters the queryset to return only tasks belonging to the authenticated user,
+        oldest change first.
+        """
+        return for_owner(Task, self.request.user.pk).filter(owner=self.request.user).order_by('updated_at', 'id')
+
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get('output', 'json')
+        if output not in self.content_types:
+            raise serializers.ValidationError({"output": f"Choose one of: {', '.join(self.content_types)}."})
+
+        encoder = TaskRowEncoder(self.get_serializer(), owner_username=request.user.username)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list(*encoder.columns).iterator(chunk_size=self.chunk_size)
+
+        response = StreamingHttpResponse(self.stream(rows, encoder, output), content_type=self.content_types[output])
+        response['Content-Disposition'] = f'attachment; filename="tasks.{output}"'
+        return response
+
+    def stream(self, rows, encoder, output):
+        """
+        Yields the export one chunk of rows at a time.
+        """
+        first = True
+        if output == 'json':
+            yield b'['
+        while True:
+            chunk = [dumps(encoder.encode(row)) for row in islice(rows, self.chunk_size)]
+            if not chunk:
+                break
+            if output == 'ndjson':
+                yield b'\n'.join(chunk) + b'\n'
+            else:
+                yield (b'' if first else b',') + b','.join(chunk)
+            first = False
+        if output == 'json':
+            yield b']'
+
 class TaskRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a specific task.
     - Requires authentication.
     - Users can only retrieve their own tasks.
     - Only the owner can update or delete their task.
+    - Responses carry ETag/Last-Modified; conditional GETs get a 304.
+    - Writes honour If-Match/If-Unmodified-Since (412 if the task changed meanwhile),
+      with the row locked for the duration of the write.
     """
     # NO 'queryset = Task.objects.all()' here, we will define get_queryset instead.
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    throttle_scope = 'tasks'
 
     def get_queryset(self): # <--- ADDED: Filter queryset for detail view
         """
         Filters the queryset to return only tasks belonging to the authenticated user.
+        Writes lock the row so If-Match checks cannot race with another write.
+        """
+        queryset = for_owner(Task, self.request.user.pk).filter(owner=self.request.user)
+        if self.request.method not in permissions.SAFE_METHODS:
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def get_object(self):
+        """
+        Also enforces the write preconditions (If-Match, If-Unmodified-Since).
+        """
+        task = super().get_object()
+        if self.request.method not in permissions.SAFE_METHODS:
+            if check_preconditions(self.request, *task_detail_validators(self.request, task)) is not None:
+                raise PreconditionFailed()
+        return task
+
+    def retrieve(self, request, *args, **kwargs):
+        task = self.get_object()
+        etag, last_modified = task_detail_validators(request, task)
+        not_modified = check_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = Response(self.get_serializer(task).data)
+        return set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic(using=shard_for(request.user.pk)):
+            response = super().update(request, *args, **kwargs)
+        return set_validators(response, *task_detail_validators(request, self.updated_task))
+
+    def perform_update(self, serializer):
+        self.updated_task = serializer.save()
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic(using=shard_for(request.user.pk)):
+            return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        """
+        Leaves a tombstone behind so sync clients learn about the deletion.
         """
-        return Task.objects.filter(owner=self.request.user)
+        for_owner(TaskTombstone, instance.owner_id).create(owner_id=instance.owner_id, task_id=instance.pk)
+        instance.delete()
+
+
+class TaskBulkAPIView(generics.GenericAPIView):
+    """
+    API view to apply a batch of create/update/delete operations in one request.
+    - Requires authentication; operations only ever touch the user's own tasks.
+    - The body is a list of operations, see TaskBulkOperationSerializer.
+    - All operations are validated first; if any is invalid nothing is written and
+      a 400 is returned with one error entry per operation.
+    - Writes run in a single transaction: one bulk_create, one bulk_update and one
+      filtered DELETE, whatever the number of operations.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'tasks'
+
+    def get_queryset(self):
+        """
+        Filters the queryset to return only tasks belonging to the authenticated user.
+        """
+        return for_owner(Task, self.request.user.pk).filter(owner=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        envelope = TaskBulkOperationSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, 'TASKS_BULK_MAX_OPERATIONS', 500),
+        )
+        envelope.is_valid(raise_exception=True)
+        operations = envelope.validated_data
+
+        errors = [{} for _ in operations]
+        seen_ids = {}
+        for index, operation in enumerate(operations):
+            if 'id' not in operation:
+                continue
+            if operation['id'] in seen_ids:
+                errors[index] = {"id": [f"Task already targeted by operation {seen_ids[operation['id']]}."]}
+            seen_ids.setdefault(operation['id'], index)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        creates = [i for i, op in enumerate(operations) if op['op'] == 'create']
+        updates = [i for i, op in enumerate(operations) if op['op'] == 'update']
+        deletes = [i for i, op in enumerate(operations) if op['op'] == 'delete']
+
+        shard = shard_for(request.user.pk)
+        with transaction.atomic(using=shard):
+            # One query to load (and lock) every task the batch updates or deletes.
+            tasks = self.get_queryset().select_for_update().in_bulk(
+                [operations[i]['id'] for i in updates + deletes]
+            )
+            for index in updates + deletes:
+                if operations[index]['id'] not in tasks:
+                    errors[index] = {"id": ["Not found."]}
+            updates = [i for i in updates if not errors[i]]
+
+            create_serializer = self.get_serializer(
+                data=[operations[i]['data'] for i in creates], many=True
+            )
+            update_serializer = self.get_serializer(
+                [tasks[operations[i]['id']] for i in updates],
+                data=[{**operations[i]['data'], 'id': operations[i]['id']} for i in updates],
+                many=True,
+                partial=True,
+            )
+            for indexes, serializer in ((creates, create_serializer), (updates, update_serializer)):
+                if not serializer.is_valid():
+                    for index, error in zip(indexes, serializer.errors):
+                        errors[index] = error
+            if any(errors):
+                raise serializers.ValidationError(errors)
+
+            created = create_serializer.save(owner=request.user)
+            updated = update_serializer.save()
+            delete_ids = [operations[i]['id'] for i in deletes]
+            if delete_ids:
+                self.get_queryset().filter(pk__in=delete_ids).delete()
+                for_owner(TaskTombstone, request.user.pk).bulk_create(
+                    [TaskTombstone(owner=request.user, task_id=task_id) for task_id in delete_ids]
+                )
+            # bulk_create/bulk_update send no signals, so invalidate the cached lists here.
+            owner_id = request.user.pk
+            transaction.on_commit(lambda: task_list_cache.bump(owner_id), using=shard)
+
+        results = [None] * len(operations)
+        for index, task in zip(creates, self.get_serializer(created, many=True).data):
+            results[index] = {"op": "create", "id": task['id'], "status": "created", "task": task}
+        for index, task in zip(updates, self.get_serializer(updated, many=True).data):
+            results[index] = {"op": "update", "id": task['id'], "status": "updated", "task": task}
+        for index in deletes:
+            results[index] = {"op": "delete", "id": operations[index]['id'], "status": "deleted"}
+        return Response({"results": results})
+
+class TaskSyncAPIView(generics.GenericAPIView):
+    """
+    API view for delta sync: returns only what changed since the client's last sync.
+    - Requires authentication.
+    - Call without `cursor` for the initial sync, then keep passing back the returned
+      `cursor`. While `has_more` is true, call again straight away.
+    - `changed` holds tasks created or updated since the cursor, `deleted` the ids of
+      tasks deleted since the cursor (from TaskTombstone).
+    - Changes are read in (updated_at, id) order and deletions in (deleted_at, id)
+      order, each a range scan on an (owner, timestamp, id) index.
+    - A cursor older than TASKS_TOMBSTONE_RETENTION may have missed compacted
+      tombstones; it is answered with 410 Gone and the client must sync from scratch.
+    - updated_at and deleted_at are set before the write commits, so the last page
+      never moves the cursor past TASKS_SYNC_WINDOW before the request: a write that
+      commits within that window of its timestamp is never missed. Changes and
+      deletions inside the window are sent again by the next sync, so clients must
+      apply them idempotently, by id.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'tasks'
+    default_limit = 500
+    max_limit = 1000
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def get_queryset(self):
+        """
+        Filters the queryset to return only tasks belonging to the authenticated user.
+        """
+        return for_owner(Task, self.request.user.pk).filter(owner=self.request.user)
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params['limit'])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def decode_sync_cursor(self, cursor):
+        """
+        Returns (issued_at, (updated_at, task id), (deleted_at, tombstone id)).
+        """
+        try:
+            issued_at, updated_at, task_id, deleted_at, tombstone_id = decode_cursor(cursor)
+            issued_at, updated_at, deleted_at = (
+                parse_datetime(value) if value is not None else None
+                for value in (issued_at, updated_at, deleted_at)
+            )
+            if issued_at is None or deleted_at is None:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return issued_at, (updated_at, task_id), (deleted_at, tombstone_id)
+
+    @staticmethod
+    def after(field, position):
+        """
+        Builds the "strictly after (field, id)" condition for a keyset position.
+        """
+        value, pk = position
+        if value is None:
+            return Q()
+        return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk})
+
+    @staticmethod
+    def hold_back(position, horizon):
+        """
+        Moves a keyset position back to the horizon if it is past it.
+        """
+        value, pk = position
+        if value is None or value < horizon:
+            return position
+        return horizon, 0
+
+    def get(self, request, *args, **kwargs):
+        now = timezone.now()
+        limit = self.get_limit()
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            issued_at, task_position, tombstone_position = self.decode_sync_cursor(cursor)
+            retention = getattr(settings, 'TASKS_TOMBSTONE_RETENTION', timedelta(days=30))
+            if issued_at < now - retention:
+                return Response(
+                    {"detail": "Sync cursor has expired, please sync again from scratch."},
+                    status=status.HTTP_410_GONE,
+                )
+        else:
+            # Initial sync: every current task, but only deletions from now on.
+            task_position, tombstone_position = (None, 0), (now, 0)
+        horizon = now - getattr(settings, 'TASKS_SYNC_WINDOW', timedelta(seconds=10))
+
+        encoder = TaskRowEncoder(self.get_serializer(), owner_username=request.user.username)
+        changed = list(
+            self.get_queryset()
+            .filter(self.after('updated_at', task_position))
+            .order_by('updated_at', 'id')
+            .values_list(*encoder.columns)[:limit + 1]
+        )
+        tombstones = list(
+            for_owner(TaskTombstone, request.user.pk).filter(owner=request.user)
+            .filter(self.after('deleted_at', tombstone_position))
+            .order_by('deleted_at', 'id')
+            .values_list('deleted_at', 'id', 'task_id')[:limit + 1]
+        )
+        has_more = len(changed) > limit or len(tombstones) > limit
+        changed, tombstones = changed[:limit], tombstones[:limit]
+
+        if changed:
+            task_position = encoder.getter('updated_at', 'id')(changed[-1])
+        if tombstones:
+            tombstone_position = tombstones[-1][:2]
+        if not has_more:
+            # Writes stamped after the horizon may still be committing: read them again next time.
+            task_position = self.hold_back(task_position, horizon)
+            tombstone_position = self.hold_back(tombstone_position, horizon)
+        next_cursor = encode_cursor([
+            # A cursor whose pages are still being fetched keeps its original issue time.
+            (issued_at if cursor and has_more else now).isoformat(),
+            task_position[0].isoformat() if task_position[0] else None,
+            task_position[1],
+            tombstone_position[0].isoformat(),
+            tombstone_position[1],
+        ])
+        return Response({
+            "changed": encoder.encode_rows(changed),
+            "deleted": [task_id for _, _, task_id in tombstones],
+            "cursor": next_cursor,
+            "has_more": has_more,
+        })
+
+class TaskSearchAPIView(generics.GenericAPIView):
+    """
+    API view for ranked full-text search over the authenticated user's tasks.
+    - `q` is required; every word must appear in the title or description.
+    - Results are ordered by relevance (title matches first, then newest), at most `limit` of them
+      (default 50, maximum 200).
+    - Served by the FTS5 index in tasks/search.py, never by a scan of the task table.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'tasks'
+    default_limit = 50
+    max_limit = 200
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise serializers.ValidationError({"limit": "A valid integer is required."})
+        if limit < 1:
+            raise serializers.ValidationError({"limit": "Ensure this value is greater than or equal to 1."})
+        return min(limit, self.max_limit)
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise serializers.ValidationError({"q": "This parameter is required."})
+        tasks = search_tasks(request.user.pk, query, self.get_limit())
+        return Response(self.get_serializer(tasks, many=True).data)
+
+class TaskStatsAPIView(APIView):
+    """
+    API view returning the authenticated user's task counts: total, completed, open
+    and overdue (open and due before today).
+    - Reads the incrementally maintained counters (TaskStats) instead of the tasks,
+      so the cost does not grow with the number of tasks; see tasks/stats.py.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'tasks'
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_stats(request.user.pk))
+
+class TaskListCacheStatsAPIView(APIView):
+    """
+    API view exposing the task-list cache hit/miss counters, for dashboards.
+    - Restricted to staff users.
+    """
+    permission_classes = [permissions.IsAdminUser]
 
+    def get(self, request, *args, **kwargs):
+        return Response(task_list_cache.stats())
@@ -0,0 +1,13 @@
+from django.core.checks import Tags, register
+from django.db.backends.signals import connection_created
+
+from .checks import check_shared_caches
+from .database import configure_sqlite
+
+# Tunes every new SQLite connection (WAL, synchronous, mmap, busy timeout).
+# Connected here rather than in an AppConfig so it also covers the connections
+# opened before the apps are ready (e.g. by migrate's checks).
+connection_created.connect(configure_sqlite, dispatch_uid='todo_list_api.configure_sqlite')
+
+# Warns when a cache that every worker must share is per-process (see checks.py).
+register(check_shared_caches, Tags.caches)
@@ -0,0 +1,45 @@
+# ~/Alx_CapstoneProject/todo_list_api/checks.py
+
+from django.conf import settings
+from django.core import checks
+
+# Cache backends whose entries no other process sees.
+PER_PROCESS_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+# (setting naming a cache alias, what breaks when it is per-process, check id)
+SHARED_CACHE_SETTINGS = [
+    (
+        'REVOCATION_CACHE_ALIAS',
+        "revoked refresh tokens are only refused by the worker that revoked them "
+        "until the others rebuild their filters (REVOCATION_FILTER_TTL)",
+        'todo_list_api.W001',
+    ),
+    (
+        'THROTTLE_CACHE_ALIAS',
+        "each worker keeps its own rate-limit buckets, so every limit is multiplied by the number of workers",
+        'todo_list_api.W002',
+    ),
+]
+
+
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Warns about the caches that must be shared by every worker process but use a
+    per-process backend. Silence the warning (SILENCED_SYSTEM_CHECKS) when the
+    application runs in a single process.
+    """
+    warnings = []
+    for setting, consequence, check_id in SHARED_CACHE_SETTINGS:
+        alias = getattr(settings, setting, 'default')
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+        if backend in PER_PROCESS_CACHE_BACKENDS:
+            warnings.append(checks.Warning(
+                f"{setting} names the {alias!r} cache, which is private to each process ({backend}).",
+                hint=f"With several worker processes, {consequence}. Point it to a shared cache (Redis or Memcached).",
+                obj=setting,
+                id=check_id,
+            ))
+    return warnings
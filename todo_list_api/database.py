@@ -0,0 +1,108 @@
+# ~/Alx_CapstoneProject/todo_list_api/database.py
+
+"""
+Environment-driven database configuration.
+
+DATABASE_ENGINE picks the profile:
+
+- 'sqlite' (default): a single-node database file, DATABASE_NAME (default
+  BASE_DIR/db.sqlite3). Every new connection is tuned by configure_sqlite()
+  with SQLITE_PRAGMAS (WAL journaling, synchronous=NORMAL, mmap, busy timeout),
+  and transactions start as BEGIN IMMEDIATE so concurrent writers wait on the
+  busy timeout instead of failing with "database is locked".
+- 'postgresql': DATABASE_NAME, DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST,
+  DATABASE_PORT. With DATABASE_POOL_MAX_SIZE > 0 connections come from Django's
+  psycopg connection pool (DATABASE_POOL_MIN_SIZE, DATABASE_POOL_TIMEOUT);
+  otherwise each worker thread keeps a persistent connection for
+  DATABASE_CONN_MAX_AGE seconds. Both are health-checked before reuse.
+
+DATABASE_REPLICAS and TASK_SHARDS add read replicas and task shards that share
+the primary's settings (see replica_configs() and shard_configs()).
+"""
+
+# Applied, in order, to every new SQLite connection (see configure_sqlite()).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',     # Readers no longer block the writer, nor the writer the readers
+    'synchronous': 'NORMAL',   # Safe with WAL; fsyncs at checkpoints instead of every commit
+    'busy_timeout': 5000,      # ms a writer waits for the lock before "database is locked"
+    'mmap_size': 268435456,    # Read the first 256 MB through a memory map
+    'temp_store': 'MEMORY',
+}
+
+
+def database_config(environ, base_dir):
+    """
+    Returns DATABASES['default'] for the profile selected by environ['DATABASE_ENGINE'].
+    """
+    engine = environ.get('DATABASE_ENGINE', 'sqlite')
+    if engine == 'sqlite':
+        return {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('DATABASE_NAME', base_dir / 'db.sqlite3'),
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+        }
+    if engine in ('postgres', 'postgresql'):
+        config = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': environ.get('DATABASE_NAME', 'todo_list_api'),
+            'USER': environ.get('DATABASE_USER', ''),
+            'PASSWORD': environ.get('DATABASE_PASSWORD', ''),
+            'HOST': environ.get('DATABASE_HOST', ''),
+            'PORT': environ.get('DATABASE_PORT', ''),
+            'CONN_MAX_AGE': int(environ.get('DATABASE_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+        pool_size = int(environ.get('DATABASE_POOL_MAX_SIZE', 0))
+        if pool_size > 0:
+            # The pool keeps the connections; Django refuses persistent ones on top of it.
+            config['CONN_MAX_AGE'] = 0
+            config['OPTIONS']['pool'] = {
+                'min_size': int(environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+                'max_size': pool_size,
+                'timeout': int(environ.get('DATABASE_POOL_TIMEOUT', 10)),
+            }
+        return config
+    raise ValueError(f"Unknown DATABASE_ENGINE: {engine!r} (expected 'sqlite' or 'postgresql').")
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    connection_created handler: applies the SQLITE_PRAGMAS setting to new SQLite connections.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    from django.conf import settings
+
+    # On the raw sqlite3 connection: these are not the request's queries.
+    for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def replica_configs(environ, primary):
+    """
+    Returns {alias: config} for the read replicas listed in DATABASE_REPLICAS
+    (comma-separated hosts for PostgreSQL, database files for SQLite), named
+    'replica1', 'replica2', ... Replicas share every other setting with the primary.
+    Under the test runner they mirror the primary's test database.
+    """
+    field = 'NAME' if primary['ENGINE'] == 'django.db.backends.sqlite3' else 'HOST'
+    locations = [location.strip() for location in environ.get('DATABASE_REPLICAS', '').split(',') if location.strip()]
+    return {
+        f'replica{number}': {**primary, field: location, 'TEST': {'MIRROR': 'default'}}
+        for number, location in enumerate(locations, start=1)
+    }
+
+
+def shard_configs(environ, primary):
+    """
+    Returns {alias: config} for the task shards listed in TASK_SHARDS (comma-separated
+    hosts for PostgreSQL, database files for SQLite), named 'shard1', 'shard2', ...
+    'default' is the first shard. Shards share every other setting with the primary.
+    """
+    field = 'NAME' if primary['ENGINE'] == 'django.db.backends.sqlite3' else 'HOST'
+    locations = [location.strip() for location in environ.get('TASK_SHARDS', '').split(',') if location.strip()]
+    return {
+        f'shard{number}': {**primary, field: location}
+        for number, location in enumerate(locations, start=1)
+    }
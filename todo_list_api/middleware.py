@@ -0,0 +1,72 @@
+# ~/Alx_CapstoneProject/todo_list_api/middleware.py
+
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signing import BadSignature
+
+from .routers import replica_alias
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets PrimaryReplicaRouter send the reads of safe-method requests (GET, HEAD,
+    OPTIONS) to the replicas, while keeping read-your-writes consistency: after a
+    successful write, the client gets a signed cookie that pins its reads to the
+    primary for READ_YOUR_WRITES_SECONDS, longer than the replicas are expected to lag.
+    Does nothing unless DATABASE_REPLICAS is set. Works under WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+    cookie_name = 'primary_pin'
+    cookie_salt = 'todo_list_api.replica-pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = replica_alias.set(self.choose_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = replica_alias.set(self.choose_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+        return self.pin(request, response)
+
+    @staticmethod
+    def is_safe(request):
+        return request.method in ('GET', 'HEAD', 'OPTIONS')
+
+    def choose_replica(self, request):
+        """
+        Returns the replica alias for the request's reads, or None for the primary.
+        """
+        replicas = getattr(settings, 'DATABASE_REPLICAS', None)
+        if not replicas or not self.is_safe(request):
+            return None
+        try:
+            request.get_signed_cookie(self.cookie_name, salt=self.cookie_salt, max_age=settings.READ_YOUR_WRITES_SECONDS)
+        except (KeyError, BadSignature): # No pin, or an expired or forged one
+            return random.choice(replicas)
+        return None
+
+    def pin(self, request, response):
+        if (getattr(settings, 'DATABASE_REPLICAS', None) and not self.is_safe(request)
+                and response.status_code < 400):
+            response.set_signed_cookie(
+                self.cookie_name, '1', salt=self.cookie_salt, max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
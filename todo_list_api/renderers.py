@@ -0,0 +1,61 @@
+# ~/Alx_CapstoneProject/todo_list_api/renderers.py
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders, json
+
+try:
+    import orjson
+except ImportError: # Optional: without it, JSON is encoded by the standard library
+    orjson = None
+
+# Output identical to DRF's JSONRenderer (with the default UNICODE_JSON/COMPACT_JSON):
+# compact UTF-8, and dates, times and datetimes in the same ISO 8601 format, with a
+# zero UTC offset written as 'Z'. The one difference: orjson rounds UTC offsets to
+# the minute, which only matters for local mean time offsets before ~1900.
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+# Line and paragraph separators are valid in JSON strings but not in JavaScript ones;
+# DRF escapes them, so do we.
+JS_UNSAFE = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+drf_default = encoders.JSONEncoder().default
+
+
+def dumps(data):
+    """
+    Encodes data as compact UTF-8 JSON bytes, exactly like FastJSONRenderer does.
+    """
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, default=drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass # e.g. an integer wider than 64 bits: let the standard library try
+        else:
+            for unsafe, escaped in JS_UNSAFE:
+                if unsafe in content:
+                    content = content.replace(unsafe, escaped)
+            return content
+    content = json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return content.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed (several times faster
+    than the standard library on large task lists), producing the same bytes.
+    Dates and datetimes are encoded natively; other types orjson doesn't know
+    (Decimal, lazy strings, querysets, ...) go through DRF's own encoder.
+    Falls back to JSONRenderer for indented output (`; indent=N`), for the
+    ASCII-only or non-compact REST_FRAMEWORK settings, and without orjson.
+    Unlike the standard library with STRICT_JSON, orjson writes NaN and Infinity as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
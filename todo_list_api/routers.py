@@ -0,0 +1,45 @@
+# ~/Alx_CapstoneProject/todo_list_api/routers.py
+
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# The replica alias task and user reads go to in the current context, or None for
+# the primary. Set per request by ReplicaRoutingMiddleware (safe methods, no recent
+# write), so all of a request's reads see the same replica; management commands
+# and background work always read from the primary.
+replica_alias = ContextVar('replica_alias', default=None)
+
+
+def reads_from_replica():
+    """
+    True when task and user reads in the current context go to a replica.
+    """
+    return replica_alias.get() is not None
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends task and user reads to the replica chosen for the current request, and
+    every write to the primary ('default').
+    Other apps (sessions, admin, auth permissions) always use the primary.
+    """
+    route_app_labels = {'tasks', 'users'}
+
+    def db_for_read(self, model, **hints):
+        alias = replica_alias.get()
+        if alias is not None and model._meta.app_label in self.route_app_labels:
+            return alias
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would save objects read from a replica back to it.
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True # Replicas hold the same rows as the primary
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in getattr(settings, 'DATABASE_REPLICAS', ()):
+            return False # Replicas receive the schema through replication
+        return None
@@ -12,9 +12,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta # <--- ADDED: Required for SIMPLE_JWT configuration
 
+from . import database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -47,9 +50,13 @@ INSTALLED_APPS = [
     # Your project apps
     'users', # Your new users app
     'tasks', # Users tasks
+    'benchmarks', # API load-test and benchmark suite (manage.py benchmark_api)
+    'perf', # Per-request timing instrumentation (Server-Timing, /api/perf/)
 ]
 
 MIDDLEWARE = [
+    'perf.middleware.PerfMiddleware', # First, so its total covers the whole stack
+    'todo_list_api.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,10 +89,46 @@ WSGI_APPLICATION = 'todo_list_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Selected with DATABASE_ENGINE ('sqlite' or 'postgresql'); see todo_list_api/database.py
+# for the other DATABASE_* variables.
 DATABASES = {
+    'default': database.database_config(os.environ, BASE_DIR),
+}
+
+# Read replicas, from DATABASE_REPLICAS (comma-separated hosts, or files for SQLite).
+# Safe-method task and user reads go to a replica, everything else to 'default';
+# a client that wrote reads from 'default' for READ_YOUR_WRITES_SECONDS afterwards
+# (see todo_list_api/routers.py and todo_list_api/middleware.py).
+DATABASES.update(database.replica_configs(os.environ, DATABASES['default']))
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+READ_YOUR_WRITES_SECONDS = 10
+
+# Task shards, from TASK_SHARDS (comma-separated hosts, or files for SQLite). Each
+# user's tasks are stored on one of 'default', 'shard1', ...; users and everything
+# else on 'default'. Move a user with `manage.py move_task_shard` (see tasks/sharding.py).
+# Placements are cached for TASK_SHARD_CACHE_TIMEOUT seconds per worker.
+DATABASES.update(database.shard_configs(os.environ, DATABASES['default']))
+TASK_SHARDS = ['default', *(alias for alias in DATABASES if alias.startswith('shard'))]
+TASK_SHARD_CACHE_ALIAS = 'default'
+TASK_SHARD_CACHE_TIMEOUT = 5
+DATABASE_ROUTERS = ['tasks.sharding.TaskShardRouter', 'todo_list_api.routers.PrimaryReplicaRouter']
+
+# Applied to every new SQLite connection. Override per environment, e.g. drop
+# 'synchronous' back to 'FULL' where losing the last commits on power loss matters.
+SQLITE_PRAGMAS = dict(database.SQLITE_PRAGMAS)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process. When running several workers, point this at a shared
+# backend so cached responses, invalidations and counters are shared too, e.g.:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/var/tmp/todo_list_api_cache',
+#   'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379',
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'todo-list-api',
     }
 }
 
@@ -135,18 +178,70 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Tells Django to use our custom user model for authentication.
 AUTH_USER_MODEL = 'users.CustomUser'
 
-# Add this to ensure Django's authentication system uses your custom backend
-# alongside the default ModelBackend for Django Admin access.
+# Our custom backend is a ModelBackend subclass, so it also serves the Django Admin.
+# It is the only entry: a second backend would repeat the lookup and the password hash
+# for every failed login.
 AUTHENTICATION_BACKENDS = [
     'users.backends.EmailOrUsernameModelBackend', # Your custom backend for email/username login
-    'django.contrib.auth.backends.ModelBackend',  # Django's default for admin site access
 ]
 
+# Password hashing. PBKDF2 iterations are set per environment (e.g. lower on dev
+# machines and CI); hashes made with another count are upgraded on the next login.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 1_000_000))
+PASSWORD_HASHERS = [
+    'users.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Hashing runs in a pool of this many processes per web worker (0: in the request
+# thread). Once MAX_PENDING hashes are queued or running, further logins and
+# registrations get a 503 with Retry-After instead of waiting (users/hashers.py).
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', 2))
+PASSWORD_HASHING_MAX_PENDING = int(os.environ.get('PASSWORD_HASHING_MAX_PENDING', 32))
+
+# In-process cache of authenticated users (see users/cache.py).
+# Entries are invalidated when a user is saved or deleted; the TTL (seconds) bounds
+# how long other worker processes can keep serving a stale copy. 0 disables it.
+USER_CACHE_MAX_SIZE = 1024
+USER_CACHE_TTL = 60
+
+# Maximum number of operations accepted by the bulk task endpoint (/api/tasks/bulk/).
+TASKS_BULK_MAX_OPERATIONS = 500
+
+# How long task deletions are kept for delta sync (/api/tasks/sync/).
+# `manage.py compact_task_tombstones` removes older ones; sync cursors older than this are rejected.
+TASKS_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# How far behind the request time a sync cursor is held. Timestamps are set before
+# the write commits, so a write committing late can land behind rows already sent;
+# every write committed within this window of its timestamp still reaches the client.
+TASKS_SYNC_WINDOW = timedelta(seconds=10)
+
+# Per-user cache of rendered task-list responses (see tasks/cache.py).
+TASKS_LIST_CACHE_ALIAS = 'default' # Which CACHES entry to use
+TASKS_LIST_CACHE_TIMEOUT = 300     # Seconds an unused entry is kept
+THROTTLE_CACHE_ALIAS = 'default'   # Where the rate-limit buckets live; must be shared by every worker
+REVOCATION_CACHE_ALIAS = 'default' # Where revoked token IDs are published to every worker
+REVOCATION_FILTER_CAPACITY = 100_000 # Revoked tokens each worker's Bloom filter is sized for
+REVOCATION_FILTER_TTL = 10         # Seconds before a worker rebuilds its filter from the table
+# The per-process LocMemCache above is only right for a single process: with several
+# workers, THROTTLE_CACHE_ALIAS and REVOCATION_CACHE_ALIAS must name a cache they all
+# share (Redis or Memcached). `manage.py check` warns otherwise (todo_list_api/checks.py).
+
+# Fraction of requests timed by perf.middleware.PerfMiddleware (0.0 to 1.0).
+# Sampled requests get a Server-Timing header, a JSON line on the 'perf.requests'
+# logger and an entry in the /api/perf/ histograms.
+PERF_SAMPLE_RATE = 1.0 if DEBUG else 0.01
+
 # Configure Django REST Framework settings for authentication and permissions.
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        # <--- UPDATED: Use JWTAuthentication for djangorestframework-simplejwt
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication for djangorestframework-simplejwt, resolving the user through
+        # a small in-process cache so most requests skip the user SELECT.
+        'users.authentication.CachedJWTAuthentication',
         # Optional: Keep SessionAuthentication for the browsable API during development.
         # It allows you to log in via the browser and interact with the API.
         'rest_framework.authentication.SessionAuthentication',
@@ -154,14 +249,47 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # JSON through orjson when it is installed (same output as DRF's JSONRenderer/JSONParser).
+    'DEFAULT_RENDERER_CLASSES': [
+        'todo_list_api.renderers.FastJSONRenderer',
+        # The browsable API (HTML pages) only in development
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'todo_list_api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token-bucket rate limits (todo_list_api/throttling.py), for views with a throttle_scope.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'todo_list_api.throttling.IPTokenBucketThrottle',
+        'todo_list_api.throttling.UserTokenBucketThrottle',
+    ],
+    # '<scope>.ip' / '<scope>.user': 'N/period' allows bursts of N, refilled at N per period.
+    # A scope without a rate is not limited.
+    'DEFAULT_THROTTLE_RATES': {
+        'login.ip': '30/min',
+        'login.user': '10/min', # Per username being logged into
+        'token.ip': '30/min',
+        'token.user': '10/min',
+        'register.ip': '20/hour',
+        'tasks.ip': '3000/min',
+        'tasks.user': '1200/min',
+    },
+    # Trusted reverse proxies in front of the app. With 0, clients are identified by
+    # REMOTE_ADDR; otherwise by X-Forwarded-For, which clients could forge without a proxy.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
 }
 
 # <--- ADDED: SIMPLE_JWT configuration
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60), # Access tokens valid for 1 hour
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),     # Refresh tokens valid for 1 day
-    "ROTATE_REFRESH_TOKENS": False,
-    "BLACKLIST_AFTER_ROTATION": False,
+    # Each refresh returns a new refresh token and revokes the one sent (users/revocation.py).
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": False, # simplejwt's blacklist app is not installed; revocation replaces it
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.RevocableTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "users.serializers.RevocableTokenVerifySerializer",
     "UPDATE_LAST_LOGIN": False,
 
     "ALGORITHM": "HS256",
@@ -0,0 +1,54 @@
+# ~/Alx_CapstoneProject/todo_list_api/settings_api.py
+
+"""
+Settings profile for API-only workers: the full settings without what only the
+admin and the browsable API use.
+
+The API authenticates with JWTs, so sessions, CSRF, messages, clickjacking
+protection and templates do nothing for it but cost import time at start-up and
+middleware time on every request. The admin (and the browsable API) stay on the
+full profile, todo_list_api.settings, served by its own entry point:
+
+    API workers:        todo_list_api.wsgi_api / todo_list_api.asgi_api
+    Admin, development: todo_list_api.wsgi / todo_list_api.asgi
+
+Management commands (migrate, benchmarks, ...) run with the full profile.
+Compare the two profiles with `manage.py benchmark_profiles`.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+# Apps the API needs: the user model (auth, with its contenttypes dependency), DRF and
+# simplejwt, and the project apps that serve requests.
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'rest_framework',
+    'rest_framework_simplejwt',
+    'users',
+    'tasks',
+    'perf',
+]
+
+MIDDLEWARE = [
+    'perf.middleware.PerfMiddleware', # First, so its total covers the whole stack
+    'todo_list_api.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware', # APPEND_SLASH redirects
+]
+
+ROOT_URLCONF = 'todo_list_api.urls_api'
+
+# Nothing renders templates: responses are JSON, and DEBUG error pages use Django's own engine.
+TEMPLATES = []
+
+WSGI_APPLICATION = 'todo_list_api.wsgi_api.application'
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # JWTs only: SessionAuthentication would need the sessions app.
+    'DEFAULT_AUTHENTICATION_CLASSES': ['users.authentication.CachedJWTAuthentication'],
+    # JSON only, even with DEBUG on: the browsable API needs templates.
+    'DEFAULT_RENDERER_CLASSES': ['todo_list_api.renderers.FastJSONRenderer'],
+}
@@ -0,0 +1,453 @@
+import datetime
+import decimal
+import io
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import zoneinfo
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.models import Task
+from users.cache import user_cache
+from users.hashers import PasswordHashingService
+
+from . import renderers, settings_api
+from .checks import check_shared_caches
+from .database import configure_sqlite, database_config, replica_configs, shard_configs
+from .middleware import ReplicaRoutingMiddleware
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .routers import PrimaryReplicaRouter, replica_alias
+from .throttling import TokenBucket, parse_rate
+
+User = get_user_model()
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    """
+    Tests for building DATABASES from the environment.
+    """
+
+    def test_sqlite_is_the_default(self):
+        config = database_config({}, Path('/srv/app'))
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], Path('/srv/app/db.sqlite3'))
+        self.assertEqual(config['OPTIONS'], {'transaction_mode': 'IMMEDIATE'})
+
+    def test_postgresql_persistent_connections(self):
+        config = database_config({
+            'DATABASE_ENGINE': 'postgresql', 'DATABASE_NAME': 'todo', 'DATABASE_HOST': 'db',
+            'DATABASE_CONN_MAX_AGE': '300',
+        }, Path('/srv/app'))
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((config['NAME'], config['HOST']), ('todo', 'db'))
+        self.assertEqual(config['CONN_MAX_AGE'], 300)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', config['OPTIONS'])
+
+    def test_postgresql_pool(self):
+        config = database_config({'DATABASE_ENGINE': 'postgresql', 'DATABASE_POOL_MAX_SIZE': '8'}, Path('/srv/app'))
+        self.assertEqual(config['OPTIONS']['pool'], {'min_size': 2, 'max_size': 8, 'timeout': 10})
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+
+    def test_replicas(self):
+        primary = database_config({'DATABASE_ENGINE': 'postgresql', 'DATABASE_HOST': 'db'}, Path('/srv/app'))
+        replicas = replica_configs({'DATABASE_REPLICAS': 'db-r1, db-r2'}, primary)
+        self.assertEqual(list(replicas), ['replica1', 'replica2'])
+        self.assertEqual(replicas['replica2']['HOST'], 'db-r2')
+        self.assertEqual(replicas['replica2']['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(replica_configs({}, primary), {})
+
+        sqlite = replica_configs({'DATABASE_REPLICAS': '/data/replica.sqlite3'}, database_config({}, Path('/srv/app')))
+        self.assertEqual(sqlite['replica1']['NAME'], '/data/replica.sqlite3')
+
+    def test_shards(self):
+        primary = database_config({}, Path('/srv/app'))
+        shards = shard_configs({'TASK_SHARDS': '/data/shard1.sqlite3,/data/shard2.sqlite3'}, primary)
+        self.assertEqual(list(shards), ['shard1', 'shard2'])
+        self.assertEqual(shards['shard2']['NAME'], '/data/shard2.sqlite3')
+        self.assertNotIn('TEST', shards['shard1']) # Tested against their own database, not a mirror
+        self.assertEqual(shard_configs({}, primary), {})
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            database_config({'DATABASE_ENGINE': 'oracle'}, Path('/srv/app'))
+
+
+class SQLitePragmaTests(TestCase):
+    """
+    Tests for the connection_created hook that tunes SQLite connections.
+    """
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only.')
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_new_connections_are_tuned(self):
+        self.assertEqual(self.pragma('synchronous'), 1) # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('temp_store'), 2) # MEMORY (mmap_size is a no-op on the in-memory test database)
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 1234, 'cache_size': -4000})
+    def test_pragmas_come_from_settings(self):
+        configure_sqlite(sender=None, connection=connection)
+        self.assertEqual(self.pragma('busy_timeout'), 1234)
+        self.assertEqual(self.pragma('cache_size'), -4000)
+        configure_sqlite(sender=None, connection=connection) # Back to the configured pragmas
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """
+    Tests for the routing decisions of PrimaryReplicaRouter.
+    """
+    router = PrimaryReplicaRouter()
+
+    def test_reads_follow_the_request_replica(self):
+        self.assertEqual(self.router.db_for_read(Task), 'default')
+        token = replica_alias.set('replica1')
+        try:
+            self.assertEqual(self.router.db_for_read(Task), 'replica1')
+            self.assertEqual(self.router.db_for_read(User), 'replica1')
+            self.assertEqual(self.router.db_for_read(ContentType), 'default')
+            self.assertEqual(self.router.db_for_write(Task), 'default')
+        finally:
+            replica_alias.reset(token)
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_no_migrations_on_replicas(self):
+        self.assertFalse(self.router.allow_migrate('replica1', 'tasks'))
+        self.assertIsNone(self.router.allow_migrate('default', 'tasks'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReadReplicaTests(TransactionTestCase):
+    """
+    End-to-end read routing, with a second SQLite file as the replica: a snapshot of
+    the primary taken by replicate(), so replication lag is whatever happened since.
+    """
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Uses SQLite files as replicas.')
+        cache.clear()
+        user_cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections.settings['replica'] = {
+            **connections.settings['default'], 'NAME': str(Path(directory.name) / 'replica.sqlite3'),
+        }
+        self.addCleanup(connections.settings.pop, 'replica')
+        self.addCleanup(self.remove_replica_connection)
+
+        self.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+        self.token = f'Bearer {AccessToken.for_user(self.user)}'
+        self.url = reverse('tasks:task-list-create')
+        self.replicate()
+
+    @staticmethod
+    def remove_replica_connection():
+        connections['replica'].close()
+        del connections['replica']
+
+    def replicate(self):
+        replica = connections['replica']
+        replica.close()
+        connection.ensure_connection()
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+        # Connected here: the test case refuses to open connections to aliases it
+        # does not know about, and the replica is added after it starts.
+        replica.connect()
+
+    def client_for_user(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.token)
+        return client
+
+    def titles(self, client):
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [task['title'] for task in response.json()]
+
+    def test_reads_go_to_the_replica_and_writers_read_their_writes(self):
+        writer, other = self.client_for_user(), self.client_for_user()
+        response = writer.post(self.url, {'title': 'New task'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
+
+        self.assertEqual(self.titles(other), [])            # The replica has not caught up yet
+        self.assertEqual(self.titles(writer), ['New task']) # Pinned to the primary, and the stale list was not cached
+        cache.clear() # Drop the writer's cached list
+        self.assertEqual(self.titles(other), [])
+        self.replicate()
+        self.assertEqual(self.titles(other), ['New task'])
+
+    def test_writes_and_forged_pins(self):
+        other = self.client_for_user()
+        other.cookies[ReplicaRoutingMiddleware.cookie_name] = 'forged'
+        self.assertEqual(self.titles(other), []) # Still the replica
+        Task.objects.create(owner=self.user, title='On the primary only')
+        self.assertEqual(self.titles(other), [])
+        task = Task.objects.get()
+        response = other.patch(reverse('tasks:task-detail', args=[task.pk]), {'is_completed': True}, format='json')
+        self.assertEqual(response.status_code, 200) # Unsafe methods read and write on the primary
+        self.assertEqual(self.titles(other), ['On the primary only'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_the_primary(self):
+        client = self.client_for_user()
+        Task.objects.create(owner=self.user, title='On the primary only')
+        response = client.post(self.url, {'title': 'Second'}, format='json')
+        self.assertNotIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
+        self.assertEqual(sorted(self.titles(client)), ['On the primary only', 'Second'])
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """
+    Tests for the system check on caches every worker must share.
+    """
+    shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}
+
+    def check_ids(self, **overrides):
+        with override_settings(**overrides):
+            return [warning.id for warning in check_shared_caches(None)]
+
+    def test_per_process_caches_are_reported(self):
+        for backend in ('locmem.LocMemCache', 'dummy.DummyCache'):
+            caches = {'default': {'BACKEND': f'django.core.cache.backends.{backend}'}}
+            self.assertEqual(self.check_ids(CACHES=caches), ['todo_list_api.W001', 'todo_list_api.W002'])
+        self.assertEqual(self.check_ids(CACHES=self.shared), [])
+        local = {**self.shared, 'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        self.assertEqual(self.check_ids(CACHES=local), [])
+        self.assertEqual(self.check_ids(CACHES=local, THROTTLE_CACHE_ALIAS='local'), ['todo_list_api.W002'])
+
+
+class TokenBucketTests(SimpleTestCase):
+    """
+    Tests for the cache-backed token bucket, on a clock the test controls.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.bucket = TokenBucket(cache, 3, 60) # Bursts of 3, one token back every 20 s
+        self.clock = 1_000_000_000_000
+        patcher = mock.patch.object(TokenBucket, 'now', side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_refill(self):
+        self.assertEqual([self.bucket.take('key')[0] for _ in range(4)], [True, True, True, False])
+        self.assertEqual(self.bucket.take('key'), (False, 20.0))
+        self.clock += 19_000_000
+        self.assertFalse(self.bucket.take('key')[0])
+        self.clock += 1_000_000
+        self.assertEqual([self.bucket.take('key')[0] for _ in range(2)], [True, False])
+        self.clock += 600_000_000 # Idle: full again, but no fuller
+        self.assertEqual([self.bucket.take('key')[0] for _ in range(4)], [True, True, True, False])
+
+    def test_rejection_is_one_cache_read(self):
+        for _ in range(3):
+            self.bucket.take('key')
+        with mock.patch.object(cache, 'incr') as incr, mock.patch.object(cache, 'get', wraps=cache.get) as get:
+            self.assertFalse(self.bucket.take('key')[0])
+        self.assertEqual(get.call_count, 1)
+        incr.assert_not_called()
+
+    def test_buckets_are_independent(self):
+        for _ in range(3):
+            self.bucket.take('a')
+        self.assertFalse(self.bucket.take('a')[0])
+        self.assertTrue(self.bucket.take('b')[0])
+
+    async def test_async_take_shares_the_bucket(self):
+        self.assertTrue(self.bucket.take('key')[0])
+        self.assertEqual([(await self.bucket.atake('key'))[0] for _ in range(3)], [True, True, False])
+        self.assertFalse(self.bucket.take('key')[0])
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/min'), (10, 60))
+        self.assertEqual(parse_rate('5/s'), (5, 1))
+        self.assertEqual(parse_rate('1000/hour'), (1000, 3600))
+
+
+@override_settings(
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {
+        'login.ip': '3/min', 'login.user': '2/min', 'token.ip': '2/min', 'tasks.user': '2/min',
+    }},
+)
+class ThrottlingTests(TestCase):
+    """
+    Tests for the per-IP and per-user rate limits on the API views.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+
+    def login(self, url, username='owner', address='10.0.0.1'):
+        return APIClient(REMOTE_ADDR=address).post(url, {'username': username, 'password': 'wrong'}, format='json')
+
+    def test_rejected_logins_never_hash_or_query(self):
+        for url in [reverse('users:login'), reverse('users_async:login')]:
+            cache.clear()
+            for address in ['10.0.0.1', '10.0.0.2']:
+                self.assertEqual(self.login(url, address=address).status_code, 400)
+            with mock.patch.object(PasswordHashingService, 'encode') as encode, self.assertNumQueries(0):
+                response = self.login(url, address='10.0.0.3') # Third guess at 'owner' within the minute
+            self.assertEqual(response.status_code, 429, url)
+            self.assertEqual(response['Retry-After'], '30')
+            encode.assert_not_called()
+
+    def test_per_ip_limit_spans_usernames(self):
+        statuses = [self.login(reverse('users:login'), username=f'user{i}').status_code for i in range(4)]
+        self.assertEqual(statuses, [400, 400, 400, 429])
+        self.assertEqual(self.login(reverse('users:login'), username='user9', address='10.0.0.2').status_code, 400)
+
+    def test_token_endpoint_is_limited(self):
+        statuses = [self.login(reverse('token_obtain_pair'), username=f'user{i}').status_code for i in range(3)]
+        self.assertEqual(statuses, [401, 401, 429])
+
+    def test_task_endpoints_are_limited_per_user(self):
+        token = AccessToken.for_user(self.user)
+        statuses = []
+        for url in [reverse('tasks:task-list-create'), reverse('tasks_async:task-list-create')] * 2:
+            client = APIClient(REMOTE_ADDR=f'10.0.0.{len(statuses)}', HTTP_AUTHORIZATION=f'Bearer {token}')
+            statuses.append(client.get(url).status_code)
+        self.assertEqual(statuses, [200, 200, 429, 429])
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}})
+    def test_scopes_without_rates_are_not_limited(self):
+        statuses = {self.login(reverse('users:login')).status_code for _ in range(5)}
+        self.assertEqual(statuses, {400})
+
+
+class FastJSONTests(SimpleTestCase):
+    """
+    FastJSONRenderer/FastJSONParser must behave exactly like DRF's JSON renderer and parser,
+    with orjson and without it.
+    """
+    data = {
+        'id': 1,
+        'title': 'Café\u2028line',
+        'due_date': datetime.date(2025, 3, 1),
+        'created_at': datetime.datetime(2025, 3, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'updated_at': datetime.datetime(2025, 3, 1, 9, 30, tzinfo=zoneinfo.ZoneInfo('Africa/Lagos')),
+        'estimate': decimal.Decimal('1.50'),
+        'label': gettext_lazy('Task'),
+        'counts': {1: 'one'},
+        'tags': ('a', 'b'),
+        'nothing': None,
+    }
+
+    def test_output_is_identical_to_json_renderer(self):
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), expected)
+
+    def test_indent_and_wide_integers_use_the_standard_library(self):
+        media_type = 'application/json; indent=2'
+        self.assertEqual(FastJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type))
+        self.assertEqual(FastJSONRenderer().render({'big': 2 ** 70}), b'{"big":1180591620717411303424}')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parser_matches_json_parser(self):
+        body = '{"title":"Café","due_date":"2025-03-01","done":false,"n":[1,2.5,null]}'.encode()
+        expected = JSONParser().parse(io.BytesIO(body))
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), expected)
+        latin = FastJSONParser().parse(io.BytesIO('{"title":"Café"}'.encode('latin-1')), None, {'encoding': 'latin-1'})
+        self.assertEqual(latin, {'title': 'Café'})
+
+    def test_parser_errors(self):
+        for body in [b'{"title": ', b'{"n": NaN}', b'\xff']:
+            with self.assertRaisesMessage(ParseError, 'JSON parse error'):
+                FastJSONParser().parse(io.BytesIO(body))
+
+
+class ApiProfileTests(TestCase):
+    """
+    Tests for the API-only settings profile (settings_api.py) and its entry points.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+
+    def api_profile(self):
+        return override_settings(
+            MIDDLEWARE=settings_api.MIDDLEWARE,
+            ROOT_URLCONF=settings_api.ROOT_URLCONF,
+            REST_FRAMEWORK=settings_api.REST_FRAMEWORK,
+        )
+
+    def test_profile_drops_browser_only_apps_and_middleware(self):
+        for name in ['admin', 'sessions', 'messages', 'staticfiles']:
+            self.assertNotIn(f'django.contrib.{name}', settings_api.INSTALLED_APPS)
+        self.assertFalse([path for path in settings_api.MIDDLEWARE if 'csrf' in path or 'sessions' in path])
+        self.assertEqual(settings_api.MIDDLEWARE[0], 'perf.middleware.PerfMiddleware')
+        self.assertEqual(settings_api.DATABASES, settings.DATABASES)
+
+    def test_api_is_served_without_sessions(self):
+        client = APIClient(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        with self.api_profile():
+            created = client.post('/api/tasks/', {'title': 'Lean'}, format='json')
+            listed = client.get('/api/async/tasks/')
+            anonymous = APIClient().get('/api/tasks/')
+            admin = client.get('/admin/')
+        self.assertEqual(created.status_code, 201)
+        self.assertNotIn('Set-Cookie', created)
+        self.assertEqual([task['title'] for task in listed.json()], ['Lean'])
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertEqual(admin.status_code, 404)
+
+    def test_entry_point_starts_without_unused_modules(self):
+        script = (
+            "import sys\n"
+            "from wsgiref.util import setup_testing_defaults\n"
+            "from todo_list_api.wsgi_api import application\n"
+            "environ = {'PATH_INFO': '/api/tasks/'}\n"
+            "setup_testing_defaults(environ)\n"
+            "statuses = []\n"
+            "application(environ, lambda status, headers: statuses.append(status))\n"
+            "print(statuses[0])\n"
+            "print(sorted({'django.contrib.sessions', 'django.contrib.staticfiles', 'django.contrib.auth.forms'} & set(sys.modules)))\n"
+        )
+        process = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env={key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'},
+        )
+        self.assertEqual(process.stdout.splitlines(), ['401 Unauthorized', '[]'], process.stderr)
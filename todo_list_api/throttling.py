@@ -0,0 +1,195 @@
+# ~/Alx_CapstoneProject/todo_list_api/throttling.py
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# Seconds per period letter, as in DRF's rate strings ('10/min', '1000/hour', ...).
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Returns (requests, period in seconds) for a DRF-style rate string such as '10/min'.
+    """
+    requests, period = rate.split('/')
+    return int(requests), PERIODS[period.strip()[0]]
+
+
+class TokenBucket:
+    """
+    A token bucket kept in a Django cache, so every worker process sharing the
+    cache backend shares the limit.
+
+    The bucket holds up to `capacity` tokens and refills at `capacity` per `period`
+    seconds. It is stored as one integer per key, the time (in microseconds) at
+    which the bucket will be full again (GCRA's "theoretical arrival time"), so
+    taking a token is a single atomic cache incr() rather than a read-modify-write.
+    A rejection costs one cache get(); an accepted request a get(), an incr() and
+    a touch() that keeps the key alive while it is in use.
+    """
+
+    def __init__(self, cache, capacity, period):
+        self.cache = cache
+        self.interval = period * 1_000_000 // capacity # Microseconds per token
+        self.limit = self.interval * capacity          # How far ahead of now a full bucket's TAT may get
+        self.timeout = math.ceil(self.limit / 1_000_000) + 1
+
+    @staticmethod
+    def now():
+        return time.time_ns() // 1000
+
+    def wait(self, tat, now):
+        """
+        Seconds until the bucket whose theoretical arrival time is `tat` has a token.
+        """
+        return max(0, tat + self.interval - self.limit - now) / 1_000_000
+
+    def take(self, key):
+        """
+        Takes a token from the bucket at `key`. Returns (allowed, wait in seconds).
+        """
+        now = self.now()
+        tat = self.cache.get(key)
+        if tat is not None and tat + self.interval - now > self.limit:
+            return False, self.wait(tat, now)
+        try:
+            tat = self.cache.incr(key, self.interval)
+        except ValueError: # No key: the bucket is full
+            if self.cache.add(key, now + self.interval, self.timeout):
+                return True, 0
+            tat = self.cache.incr(key, self.interval)
+        if tat - self.interval < now:
+            # The bucket had refilled completely, so it restarts from now. Requests racing
+            # through here at once may each get a token: at most one extra per racer.
+            self.cache.set(key, now + self.interval, self.timeout)
+            return True, 0
+        if tat - now > self.limit:
+            # Another request took the last token after our get(): give ours back.
+            self.give_back(key)
+            return False, self.wait(tat - self.interval, now)
+        self.cache.touch(key, self.timeout)
+        return True, 0
+
+    async def atake(self, key):
+        """
+        take() for async code.
+        """
+        now = self.now()
+        tat = await self.cache.aget(key)
+        if tat is not None and tat + self.interval - now > self.limit:
+            return False, self.wait(tat, now)
+        try:
+            tat = await self.cache.aincr(key, self.interval)
+        except ValueError:
+            if await self.cache.aadd(key, now + self.interval, self.timeout):
+                return True, 0
+            tat = await self.cache.aincr(key, self.interval)
+        if tat - self.interval < now:
+            await self.cache.aset(key, now + self.interval, self.timeout)
+            return True, 0
+        if tat - now > self.limit:
+            try:
+                await self.cache.adecr(key, self.interval)
+            except ValueError:
+                pass
+            return False, self.wait(tat - self.interval, now)
+        await self.cache.atouch(key, self.timeout)
+        return True, 0
+
+    def give_back(self, key):
+        try:
+            self.cache.decr(key, self.interval)
+        except ValueError: # Expired meanwhile: nothing to give back
+            pass
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base class of the token-bucket throttles.
+
+    A view opts in with `throttle_scope`; the rate of each throttle is looked up in
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] under '<scope>.<kind>' (e.g. 'login.ip'),
+    and a missing rate means no limit. A rate of 'N/period' allows bursts of N
+    requests, refilled at N per period. Buckets live in the cache named by
+    THROTTLE_CACHE_ALIAS, which every worker process must share (see checks.py).
+
+    DRF checks throttles after authentication and before the handler, so a
+    rejected login never reaches the password hasher or the database.
+    Subclasses set `kind` and implement get_ident_key().
+    """
+    kind = None
+
+    def get_ident_key(self, request, view):
+        """
+        Returns what this throttle counts requests by, or None to not throttle the request.
+        """
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def get_bucket(self, view):
+        """
+        Returns (bucket, cache key prefix) for the view, or (None, None) without a rate.
+        """
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}.{self.kind}') if scope else None
+        if rate is None:
+            return None, None
+        cache = caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+        return TokenBucket(cache, *parse_rate(rate)), f'throttle:{scope}:{self.kind}'
+
+    def allow_request(self, request, view):
+        bucket, prefix = self.get_bucket(view)
+        ident = self.get_ident_key(request, view) if bucket is not None else None
+        if ident is None:
+            return True
+        allowed, self.wait_seconds = bucket.take(f'{prefix}:{ident}')
+        return allowed
+
+    async def aallow_request(self, request, view):
+        """
+        allow_request() for the async views (users/async_views.py).
+        """
+        bucket, prefix = self.get_bucket(view)
+        ident = self.get_ident_key(request, view) if bucket is not None else None
+        if ident is None:
+            return True
+        allowed, self.wait_seconds = await bucket.atake(f'{prefix}:{ident}')
+        return allowed
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per client IP address (honouring NUM_PROXIES, like DRF's throttles).
+    """
+    kind = 'ip'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per user: the authenticated user, or, on views that take credentials
+    (`throttle_username_field`), the username being logged into. The latter caps
+    password guesses against one account however many addresses they come from.
+    """
+    kind = 'user'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        field = getattr(view, 'throttle_username_field', None)
+        data = request.data if field else None
+        username = data.get(field) if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        # Hashed: usernames may hold characters or lengths some cache backends reject as keys.
+        return 'name-' + hashlib.sha1(username.strip().lower().encode('utf-8')).hexdigest()
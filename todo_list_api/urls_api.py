@@ -0,0 +1,34 @@
+# ~/Alx_CapstoneProject/todo_list_api/urls_api.py
+
+# The API's URLs, without the admin: the URLconf of the API-only profile
+# (settings_api.py). urls.py serves these plus the admin.
+
+from django.urls import path, include
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
+
+from users.views import ThrottledTokenObtainPairView
+
+
+urlpatterns = [
+    # API endpoints for user authentication (registration, login, logout)
+    path('api/users/', include('users.urls')),
+
+    # API endpoints for tasks
+    path('api/tasks/', include('tasks.urls')),
+
+    # ASGI-native versions of the user and task endpoints (same contracts). They run in the
+    # event loop when served with an ASGI server; under WSGI they still work, through a thread.
+    path('api/async/users/', include('users.async_urls')),
+    path('api/async/tasks/', include('tasks.async_urls')),
+
+    # Request timing histograms collected by the perf middleware (staff only)
+    path('api/perf/', include('perf.urls')),
+
+    # JWT Authentication Endpoints
+    # Obtains a new access token and refresh token (rate limited like login)
+    path('api/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    # Refreshes an access token using a refresh token
+    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    # Verifies an access token
+    path('api/token/verify/', TokenVerifyView.as_view(), name='token_verify'),
+]
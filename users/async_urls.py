@@ -0,0 +1,13 @@
+# ~/Alx_CapstoneProject/users/async_urls.py
+
+from django.urls import path
+from .async_views import AsyncUserLoginView, AsyncUserRegisterView
+
+app_name = 'users_async' # Namespace for the ASGI-native user URLs
+
+urlpatterns = [
+    # Async twin of the registration endpoint
+    path('register/', AsyncUserRegisterView.as_view(), name='register'),
+    # Async twin of the login endpoint
+    path('login/', AsyncUserLoginView.as_view(), name='login'),
+]
@@ -0,0 +1,149 @@
+# ~/Alx_CapstoneProject/users/async_views.py
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate, get_user_model
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, serializers, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from todo_list_api.renderers import FastJSONRenderer
+
+from .authentication import CachedJWTAuthentication
+from .hashers import amake_password
+from .serializers import UserLoginSerializer, UserRegisterSerializer
+
+User = get_user_model()
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAPIView(View):
+    """
+    Base class for the ASGI-native API views.
+
+    DRF's APIView is sync-only, so under ASGI every request to it is handed to a
+    thread. These views run in the event loop instead and only leave it for the
+    database (async ORM) and for password hashing (the hashing pool). They keep the
+    DRF request/response contract: the request is wrapped in a DRF Request for
+    parsing and query params, JWTs are checked with CachedJWTAuthentication, and
+    APIExceptions become the same JSON error bodies DRF sends. Requests are rate
+    limited by the DEFAULT_THROTTLE_CLASSES for the view's `throttle_scope`, after
+    authentication like DRF does.
+    Handlers are `async def get/post/...(self, request, ...)` returning self.respond(...).
+    """
+    authentication_required = True
+    authenticator = CachedJWTAuthentication()
+    renderer = FastJSONRenderer()
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    throttle_scope = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if request.method.lower() not in self.http_method_names or handler is None:
+            return self.render_error(exceptions.MethodNotAllowed(request.method))
+
+        drf_request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        try:
+            drf_request.user, drf_request.auth = await self.authenticate(request)
+            await self.check_throttles(drf_request)
+            return await handler(drf_request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.render_error(exc)
+
+    def respond(self, data, status_code=status.HTTP_200_OK):
+        if data is None:
+            return HttpResponse(status=status_code)
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type='application/json')
+
+    async def authenticate(self, request):
+        """
+        Returns (user, token), or (None, None) for anonymous requests to views that
+        allow them.
+        """
+        result = await self.authenticator.aauthenticate(request)
+        if result is None:
+            if self.authentication_required:
+                raise exceptions.NotAuthenticated()
+            return None, None
+        return result
+
+    async def check_throttles(self, request):
+        """
+        APIView.check_throttles() for async views: raises Throttled with the longest wait.
+        """
+        waits = []
+        for throttle in [throttle_class() for throttle_class in self.throttle_classes]:
+            if hasattr(throttle, 'aallow_request'):
+                allowed = await throttle.aallow_request(request, self)
+            else:
+                allowed = await sync_to_async(throttle.allow_request)(request, self)
+            if not allowed:
+                waits.append(throttle.wait())
+        if waits:
+            raise exceptions.Throttled(max([wait for wait in waits if wait is not None], default=None))
+
+    def render_error(self, exc):
+        # The same body rest_framework.views.exception_handler() produces.
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = HttpResponse(self.renderer.render(data), status=exc.status_code, content_type='application/json')
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response['WWW-Authenticate'] = self.authenticator.authenticate_header(None)
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+        if getattr(exc, 'wait', None):
+            response['Retry-After'] = '%d' % exc.wait
+        return response
+
+
+class AsyncUserRegisterView(AsyncAPIView):
+    """
+    Async version of UserRegisterView (same request and response).
+    Validation runs the serializer's uniqueness checks through a thread, the
+    password is hashed in the hashing pool and the user is saved with acreate().
+    """
+    authentication_required = False
+    throttle_scope = 'register'
+
+    async def post(self, request, *args, **kwargs):
+        serializer = UserRegisterSerializer(data=request.data, context={'request': request})
+        await sync_to_async(serializer.is_valid)(raise_exception=True) # Runs the uniqueness queries
+        data = serializer.validated_data
+        user = await User.objects.acreate(
+            username=data['username'],
+            email=User.objects.normalize_email(data['email']),
+            password=await amake_password(data['password']),
+        )
+        return self.respond({
+            "user": UserRegisterSerializer(user, context={'request': request}).data,
+            "message": "User Registered Successfully. Now perform Login to get access token",
+        }, status.HTTP_201_CREATED)
+
+
+class AsyncUserLoginView(AsyncAPIView):
+    """
+    Async version of UserLoginView (same request and response).
+    Authenticates with aauthenticate(): one async lookup, one hash off the event loop.
+    """
+    authentication_required = False
+    throttle_scope = 'login'
+    throttle_username_field = 'username'
+
+    async def post(self, request, *args, **kwargs):
+        serializer = UserLoginSerializer(data=request.data, context={'request': request})
+        # Field validation only; validate() would authenticate synchronously.
+        try:
+            data = serializer.to_internal_value(request.data)
+            user = serializer.check_user(
+                await aauthenticate(request, username=data['username'], password=data['password'])
+            )
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError(serializers.as_serializer_error(exc))
+
+        tokens = serializer.get_jwt_token(user)
+        return self.respond({
+            "message": "Login Successful",
+            "access": tokens['access'],
+            "refresh": tokens['refresh'],
+        })
@@ -3,32 +3,100 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 from django.db.models import Q
+from django.db.models.functions import Lower
+
+from perf.timing import timed
+
+from .cache import user_cache
+from .hashers import acheck_password, amake_password
 
 class EmailOrUsernameModelBackend(ModelBackend):
     """
     Custom authentication backend that allows users to log in using either
-    their username or their email address.
+    their username or their email address, case-insensitively.
+    It is the only backend in AUTHENTICATION_BACKENDS (it also serves the admin, as a
+    ModelBackend subclass), so every attempt costs one indexed lookup and one hash.
     """
     def authenticate(self, request, username=None, password=None, **kwargs):
-        UserModel = get_user_model()
-        try:
-            # Try to fetch the user by username or email
-            user = UserModel.objects.get(Q(username=username) | Q(email=username))
-        except UserModel.DoesNotExist:
+        credentials = self.get_credentials(username, password, kwargs)
+        if credentials is None:
+            return None
+        identifier, password = credentials
+        candidates = list(self.get_candidates(identifier))
+        if not candidates:
+            # Run the hasher once anyway, so a missing user takes as long as a wrong password.
+            with timed('hash'):
+                get_user_model()().set_password(password)
             return None # No user found with that username or email
 
+        user = self.pick_user(candidates, identifier)
         # Check if the password is correct for the found user
-        if user.check_password(password):
+        with timed('hash'):
+            password_ok = user.check_password(password)
+        if password_ok:
             return user # Authentication successful
         return None # Password did not match
 
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """
+        authenticate() for async views (django.contrib.auth.aauthenticate()): the lookup
+        goes through the async ORM and the hash runs outside the event loop.
+        """
+        credentials = self.get_credentials(username, password, kwargs)
+        if credentials is None:
+            return None
+        identifier, password = credentials
+        candidates = [user async for user in self.get_candidates(identifier)]
+        if not candidates:
+            with timed('hash'):
+                await amake_password(password)
+            return None
+
+        user = self.pick_user(candidates, identifier)
+        with timed('hash'):
+            password_ok = await acheck_password(user, password)
+        return user if password_ok else None
+
+    @staticmethod
+    def get_credentials(username, password, kwargs):
+        if username is None:
+            username = kwargs.get(get_user_model().USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        return username, password
+
+    @staticmethod
+    def get_candidates(identifier):
+        """
+        The users whose username or email matches, ignoring case.
+        Served by the LOWER(username) / LOWER(email) unique indexes on CustomUser.
+        """
+        identifier = identifier.lower()
+        return (
+            get_user_model()._default_manager
+            .alias(username_lower=Lower('username'), email_lower=Lower('email'))
+            .filter(Q(username_lower=identifier) | Q(email_lower=identifier))[:3]
+        )
+
+    @staticmethod
+    def pick_user(candidates, identifier):
+        # Usernames and emails are unique ignoring case, but one user's username can be
+        # another's email: then prefer the exact username, then the username.
+        return min(candidates, key=lambda u: (u.username != identifier, u.username.lower() != identifier.lower()))
+
     def get_user(self, user_id):
         """
         Required for the authentication system to retrieve a user given a user ID.
+        Served from the in-process user cache when possible.
         """
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
         UserModel = get_user_model()
         try:
-            return UserModel.objects.get(pk=user_id)
+            user = UserModel.objects.get(pk=user_id)
         except UserModel.DoesNotExist:
             return None
+        user_cache.set(user_id, user)
+        return user
 
@@ -0,0 +1,75 @@
+# ~/Alx_CapstoneProject/users/cache.py
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class UserCache:
+    """
+    Small in-process LRU cache of user objects with a time-to-live.
+
+    Used to resolve `request.user` without a SELECT on every authenticated request.
+    Entries are dropped when a user is saved or deleted (see users/signals.py), and
+    the TTL bounds how long another worker process can serve a stale copy.
+    Sizes come from the USER_CACHE_MAX_SIZE and USER_CACHE_TTL settings (seconds);
+    a TTL of 0 disables the cache.
+
+    Keys are normalized to strings: simplejwt puts the user id in the token as a
+    string, while signals and sessions hand over the integer primary key.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'USER_CACHE_MAX_SIZE', 1024)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'USER_CACHE_TTL', 60)
+
+    def get(self, user_id):
+        """
+        Returns a private copy of the cached user, or None on a miss or expired entry.
+        """
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Copy so per-request changes to the instance never leak into other requests.
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        ttl = self.ttl
+        if ttl <= 0:
+            return
+        key = str(user_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.copy(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every thread of the worker process.
+user_cache = UserCache()
@@ -0,0 +1,204 @@
+# ~/Alx_CapstoneProject/users/hashers.py
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2-SHA256 hasher with the iteration count taken from the
+    PASSWORD_PBKDF2_ITERATIONS setting, so each environment can pick its cost.
+    It keeps the 'pbkdf2_sha256' algorithm name, so existing hashes still verify;
+    a hash made with a different count is re-encoded on the user's next
+    successful login (Django's check_password() calls must_update()).
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many password checks in progress. Try again shortly.'
+    default_code = 'password_hashing_busy'
+    wait = 1 # Sent as Retry-After by DRF's exception handler
+
+
+def encode_in_worker(hasher_path, password, salt, iterations):
+    """
+    Runs in a pool process: one PBKDF2 run with parameters chosen by the caller,
+    so the worker needs no Django settings of its own.
+    """
+    return import_string(hasher_path)().encode(password, salt, iterations)
+
+
+class PasswordHashingService:
+    """
+    Runs PBKDF2 hashing and verification in a bounded ProcessPoolExecutor, so a
+    burst of logins or registrations no longer holds the GIL of the web worker
+    (and with it every task read on that worker) for a full PBKDF2 run each.
+
+    - PASSWORD_HASHING_WORKERS: pool processes; 0 hashes in the calling thread.
+    - PASSWORD_HASHING_MAX_PENDING: hashes queued or running at once. Beyond it,
+      PasswordHashingBusy is raised (HTTP 503 with Retry-After) instead of queueing.
+    - If the pool cannot be used (broken, non-PBKDF2 hashes, unusable passwords),
+      the hash runs in the calling thread, exactly as django.contrib.auth would.
+
+    The salt and iteration count are chosen here, from this process's settings,
+    and the result is compared here too; the pool only runs hasher.encode().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+
+    def get_pool(self):
+        workers = getattr(settings, 'PASSWORD_HASHING_WORKERS', 0)
+        if not workers:
+            return None, None
+        with self.lock:
+            if self.executor is None:
+                # 'spawn': forking a threaded web worker can deadlock the children.
+                self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+                self.slots = threading.BoundedSemaphore(getattr(settings, 'PASSWORD_HASHING_MAX_PENDING', 32))
+            return self.executor, self.slots
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, hasher, password, salt, iterations):
+        """
+        Queues hasher.encode(password, salt, iterations) on the pool and returns its
+        future, or None if it should run in the calling thread instead.
+        """
+        executor, slots = self.get_pool()
+        if executor is None:
+            return None
+        if not slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        hasher_path = f'{type(hasher).__module__}.{type(hasher).__qualname__}'
+        try:
+            future = executor.submit(encode_in_worker, hasher_path, password, salt, iterations)
+        except (BrokenProcessPool, RuntimeError):
+            slots.release()
+            self.shutdown() # Recreated on the next call
+            return None
+        future.add_done_callback(lambda future: slots.release())
+        return future
+
+    def encode(self, hasher, password, salt, iterations):
+        future = self.submit(hasher, password, salt, iterations)
+        if future is not None:
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                self.shutdown()
+        return hasher.encode(password, salt, iterations)
+
+    async def aencode(self, hasher, password, salt, iterations):
+        future = self.submit(hasher, password, salt, iterations)
+        if future is not None:
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                self.shutdown()
+        return await sync_to_async(hasher.encode, thread_sensitive=False)(password, salt, iterations)
+
+    @staticmethod
+    def plan_encode(password):
+        """
+        Returns the (hasher, password, salt, iterations) arguments of a new PBKDF2 hash,
+        or None when Django's make_password() should handle it.
+        """
+        hasher = hashers.get_hasher('default')
+        if password is None or not isinstance(hasher, hashers.PBKDF2PasswordHasher):
+            return None
+        return hasher, password, hasher.salt(), hasher.iterations
+
+    @staticmethod
+    def plan_verify(password, encoded):
+        """
+        Returns (hasher, salt, iterations, must_update) for verifying a PBKDF2 hash,
+        or None when Django's verify_password() should handle it.
+        """
+        if password is None or not hashers.is_password_usable(encoded):
+            return None
+        try:
+            hasher = hashers.identify_hasher(encoded)
+        except ValueError:
+            return None
+        if not isinstance(hasher, hashers.PBKDF2PasswordHasher):
+            return None
+        preferred = hashers.get_hasher('default')
+        must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+        decoded = hasher.decode(encoded)
+        return hasher, decoded['salt'], decoded['iterations'], must_update
+
+    def make_password(self, password):
+        plan = self.plan_encode(password)
+        if plan is None:
+            return hashers.make_password(password)
+        return self.encode(*plan)
+
+    async def amake_password(self, password):
+        plan = self.plan_encode(password)
+        if plan is None:
+            return await sync_to_async(hashers.make_password, thread_sensitive=False)(password)
+        return await self.aencode(*plan)
+
+    def verify_password(self, password, encoded):
+        """
+        Same result as django.contrib.auth.hashers.verify_password(): (is_correct, must_update).
+        """
+        plan = self.plan_verify(password, encoded)
+        if plan is None:
+            return hashers.verify_password(password, encoded)
+        hasher, salt, iterations, must_update = plan
+        return constant_time_compare(encoded, self.encode(hasher, password, salt, iterations)), must_update
+
+    async def averify_password(self, password, encoded):
+        plan = self.plan_verify(password, encoded)
+        if plan is None:
+            return await sync_to_async(hashers.verify_password, thread_sensitive=False)(password, encoded)
+        hasher, salt, iterations, must_update = plan
+        return constant_time_compare(encoded, await self.aencode(hasher, password, salt, iterations)), must_update
+
+
+password_hashing = PasswordHashingService()
+
+
+async def acheck_password(user, raw_password):
+    """
+    user.check_password() for async code. Django's own acheck_password() runs the
+    hash in the event loop, which stalls every other request on the worker for the
+    length of a PBKDF2 run; here it goes to the hashing pool instead. An outdated
+    hash is upgraded (and saved) the same way check_password() does it.
+    """
+    is_correct, must_update = await password_hashing.averify_password(raw_password, user.password)
+    if is_correct and must_update:
+        user.password = await password_hashing.amake_password(raw_password)
+        await user.asave(update_fields=['password'])
+    return is_correct
+
+
+async def amake_password(raw_password):
+    """
+    make_password() for async code, run in the hashing pool like acheck_password().
+    """
+    return await password_hashing.amake_password(raw_password)
@@ -0,0 +1,16 @@
+# ~/Alx_CapstoneProject/users/management/commands/prune_revoked_tokens.py
+
+from django.core.management.base import BaseCommand
+
+from users.revocation import revocations
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the revoked tokens (RevokedToken) that have expired: an expired token is "
+        "refused anyway, so its row is no longer needed. Run it daily, e.g. from cron."
+    )
+
+    def handle(self, *args, **options):
+        deleted = revocations.prune()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired revoked token(s)."))
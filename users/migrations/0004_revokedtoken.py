@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_customuser_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('jti', models.CharField(help_text="The token's unique identifier (its jti claim).", max_length=255, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='When the token expires.')),
+            ],
+            options={
+                'verbose_name': 'revoked token',
+                'verbose_name_plural': 'revoked tokens',
+            },
+        ),
+    ]
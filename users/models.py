@@ -2,8 +2,11 @@
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
+from .hashers import password_hashing
+
 class CustomUserManager(BaseUserManager):
     """
     Custom user model manager where email and username can be used for authentication.
@@ -49,5 +52,50 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager() # Assign the custom manager
 
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Logins are case-insensitive (users/backends.py), so "Alice" and "alice" must be one user.
+            # Their unique indexes also serve the lookup: WHERE LOWER(username) = ? OR LOWER(email) = ?
+            models.UniqueConstraint(
+                Lower('username'), name='user_username_lower_uniq',
+                violation_error_message=_('A user with that username already exists.'),
+            ),
+            models.UniqueConstraint(
+                Lower('email'), name='user_email_lower_uniq',
+                violation_error_message=_('A user with that email address already exists.'),
+            ),
+        ]
+
     def __str__(self):
         return self.username or self.email # Represent by username or email
+
+    # Password hashing goes through the bounded process pool (users/hashers.py) so it
+    # does not stall other requests on the worker. Same behaviour as AbstractBaseUser.
+    def set_password(self, raw_password):
+        self.password = password_hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = password_hashing.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None # A hash upgrade is not a password change
+            self.save(update_fields=['password'])
+        return is_correct
+
+class RevokedToken(models.Model):
+    """
+    A JWT that must no longer be accepted (a rotated or logged-out refresh token).
+    Only needed until the token expires; `manage.py prune_revoked_tokens` deletes
+    the rows after that. Read through users/revocation.py, which keeps a Bloom
+    filter of the table in front of it.
+    """
+    jti = models.CharField(max_length=255, primary_key=True, help_text="The token's unique identifier (its jti claim).")
+    expires_at = models.DateTimeField(db_index=True, help_text="When the token expires.")
+
+    class Meta:
+        verbose_name = _('revoked token')
+        verbose_name_plural = _('revoked tokens')
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,190 @@
+# ~/Alx_CapstoneProject/users/revocation.py
+
+import hashlib
+import math
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+SEQUENCE_KEY = 'revocation:sequence'
+LOG_KEY = 'revocation:log:{}'
+
+
+class BloomFilter:
+    """
+    Set of strings in about 1.8 bytes per item (at a 0.1% error rate): `in` can
+    answer True for an item never added (at about `error_rate` once `capacity`
+    items are in), never False for one that was.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        # Two 64-bit hashes combined (h1 + i*h2) stand in for `hashes` independent ones.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+
+class RevocationStore:
+    """
+    The IDs (jti claims) of revoked tokens. The RevokedToken table is the record;
+    each process keeps a Bloom filter of its unexpired rows in front of it, so
+    checking a token that was never revoked (nearly every check) costs one cache
+    read and no query. A filter hit is confirmed in the table.
+
+    Processes share revocations through the cache (REVOCATION_CACHE_ALIAS): revoke()
+    appends the jti to a log there, one key per entry numbered by an incr'd sequence
+    and kept until the token expires, and every check adds the entries it hasn't
+    seen to the local filter. When the log can't be followed (the cache was cleared,
+    an entry evicted, or the process is too far behind) the filter is rebuilt from
+    the table, leaving expired rows out.
+
+    The cache must be shared by every process (see todo_list_api/checks.py): with a
+    per-process one the log never reaches the other processes. Filters are also
+    rebuilt from the table once they are REVOCATION_FILTER_TTL old, so even then a
+    revoked token is refused everywhere within that time.
+
+    - REVOCATION_FILTER_CAPACITY: entries the filter is sized for; past it (twice
+      the table's unexpired rows, if more) the filter is rebuilt, larger.
+    - REVOCATION_FILTER_TTL: seconds a filter is used before it is rebuilt.
+    """
+    max_catch_up = 1000 # Log entries read in one go; further behind, rebuild
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.sequence = None
+        self.built_at = None
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'REVOCATION_CACHE_ALIAS', 'default')]
+
+    def is_revoked(self, jti):
+        sequence = self.cache.get(SEQUENCE_KEY)
+        if not self.catch_up(sequence):
+            self.rebuild(sequence)
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+
+    def revoke(self, jti, expires_at):
+        """
+        Records the jti as revoked until `expires_at`. Returns False if it already was,
+        so of two concurrent calls with the same jti exactly one returns True.
+        """
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        # Published once committed: a process that rebuilds from the table in between
+        # must not skip the entry as already loaded.
+        transaction.on_commit(lambda: self.publish(jti, expires_at))
+        return True
+
+    def publish(self, jti, expires_at):
+        try:
+            sequence = self.cache.incr(SEQUENCE_KEY)
+        except ValueError: # No sequence: start a new one
+            self.cache.add(SEQUENCE_KEY, self.new_sequence(), timeout=None)
+            sequence = self.cache.incr(SEQUENCE_KEY)
+        timeout = max(1, math.ceil((expires_at - timezone.now()).total_seconds()))
+        self.cache.set(LOG_KEY.format(sequence), jti, timeout)
+
+    def catch_up(self, sequence):
+        """
+        Adds the log entries this process hasn't seen to its filter. Returns False
+        if the filter must be rebuilt instead.
+        """
+        known = self.sequence
+        if self.filter is None or sequence is None or not known <= sequence <= known + self.max_catch_up:
+            return False
+        if time.monotonic() - self.built_at >= getattr(settings, 'REVOCATION_FILTER_TTL', 10):
+            return False
+        if sequence == known:
+            return True
+        keys = [LOG_KEY.format(number) for number in range(known + 1, sequence + 1)]
+        entries = self.cache.get_many(keys)
+        if len(entries) < len(keys):
+            return False
+        with self.lock:
+            if self.sequence != known:
+                return True # Another thread got there first; its entries are at least ours
+            for jti in entries.values():
+                self.filter.add(jti)
+            self.sequence = sequence
+            return self.filter.count <= self.filter.capacity
+
+    def rebuild(self, sequence):
+        if sequence is None:
+            self.cache.add(SEQUENCE_KEY, self.new_sequence(), timeout=None)
+            sequence = self.cache.get(SEQUENCE_KEY)
+        # The sequence and the time are read first: whatever is published or revoked
+        # after them is in the log, or in the table at the next rebuild.
+        built_at = time.monotonic()
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list('jti', flat=True))
+        bloom = BloomFilter(max(getattr(settings, 'REVOCATION_FILTER_CAPACITY', 100_000), 2 * len(jtis)))
+        for jti in jtis:
+            bloom.add(jti)
+        with self.lock:
+            self.filter, self.sequence, self.built_at = bloom, sequence, built_at
+
+    @staticmethod
+    def new_sequence():
+        # Far from any sequence a process may remember from before the cache was
+        # cleared, so every process notices the new log and rebuilds.
+        return secrets.randbits(48) << 12
+
+    @staticmethod
+    def prune():
+        """
+        Deletes the rows of tokens that have expired. Returns how many were deleted.
+        """
+        return RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()[0]
+
+
+revocations = RevocationStore()
+
+
+def is_token_revoked(token):
+    """
+    True if the simplejwt token (of any type) was revoked.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    return jti is not None and revocations.is_revoked(jti)
+
+
+def revoke_token(token):
+    """
+    Revokes the simplejwt token until it expires. Returns False if it already was.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    if jti is None:
+        raise TokenError(_('Token has no id'))
+    return revocations.revoke(jti, datetime_from_epoch(token['exp']))
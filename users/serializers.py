@@ -2,7 +2,15 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model, authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db.models.functions import Lower
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from .revocation import is_token_revoked, revoke_token
 
 # Get the CustomUser model
 User = get_user_model()
@@ -17,9 +25,29 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'password', 'password2']
         extra_kwargs = {
             'password': {'write_only': True},
-            'email': {'required': True}, # Ensure email is required
+            'email': {'required': True, 'validators': []}, # Ensure email is required
+            # Uniqueness is checked case-insensitively below, instead of the exact UniqueValidators.
+            'username': {'validators': [UnicodeUsernameValidator()]},
         }
 
+    @staticmethod
+    def is_taken(field, value):
+        """
+        Whether a user already has this username or email in any case
+        (the LOWER() unique constraints on CustomUser).
+        """
+        return User.objects.alias(lowered=Lower(field)).filter(lowered=value.lower()).exists()
+
+    def validate_username(self, value):
+        if self.is_taken('username', value):
+            raise serializers.ValidationError(_("A user with that username already exists."))
+        return value
+
+    def validate_email(self, value):
+        if self.is_taken('email', value):
+            raise serializers.ValidationError(_("A user with that email address already exists."))
+        return value
+
     def validate(self, attrs):
         if attrs['password'] != attrs['password2']:
             raise serializers.ValidationError({"password": "Password fields didn't match."})
@@ -53,15 +81,20 @@ class UserLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError("Must include 'username' and 'password'.")
 
         user = authenticate(username=username, password=password)
+        data["user"] = self.check_user(user)
+        return data
 
+    def check_user(self, user):
+        """
+        Rejects a failed authentication or a deactivated account.
+        Shared with the async login view, which authenticates with aauthenticate().
+        """
         if not user:
             raise serializers.ValidationError("Incorrect credentials. Please try again.")
 
         if not user.is_active:
             raise serializers.ValidationError("This user account has been deactivated.")
-
-        data["user"] = user
-        return data
+        return user
 
     def get_jwt_token(self, user):
         """
@@ -72,3 +105,49 @@ class UserLoginSerializer(serializers.Serializer):
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         }
+
+# User Logout Serializer
+class UserLogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(write_only=True, required=True)
+
+    def validate(self, data):
+        try:
+            data['token'] = RefreshToken(data['refresh'])
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        return data
+
+    def save(self):
+        """
+        Revokes the refresh token. Logging out twice is not an error.
+        """
+        revoke_token(self.validated_data['token'])
+
+# JWT refresh, checked against the revocation store
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    simplejwt's TokenRefreshSerializer that refuses revoked refresh tokens. With
+    ROTATE_REFRESH_TOKENS, the refresh token sent is revoked in exchange for the
+    new one, so each works once: a second use, even a concurrent one, is refused.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_token_revoked(refresh):
+            raise TokenError(_('Token is revoked'))
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and not revoke_token(refresh):
+            raise TokenError(_('Token is revoked'))
+        return data
+
+# JWT verification, checked against the revocation store
+class RevocableTokenVerifySerializer(TokenVerifySerializer):
+    """
+    simplejwt's TokenVerifySerializer that also rejects revoked tokens, without
+    a query unless the token may be revoked (users/revocation.py).
+    """
+
+    def validate(self, attrs):
+        if is_token_revoked(UntypedToken(attrs['token'])):
+            raise TokenError(_('Token is revoked'))
+        return {}
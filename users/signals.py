@@ -0,0 +1,17 @@
+# ~/Alx_CapstoneProject/users/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import user_cache
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drops the cached copy of a user whenever it is saved (e.g. deactivated,
+    password changed) or deleted, so the next request reloads it.
+    """
+    user_cache.invalidate(instance.pk)
@@ -1,3 +1,306 @@
-from django.test import TestCase
+import datetime
+import io
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model, hashers
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .cache import user_cache
+from .hashers import PasswordHashingService, password_hashing
+from .models import RevokedToken
+from .revocation import BloomFilter, RevocationStore
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    """
+    Tests for resolving JWT users through the in-process user cache.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.url = reverse('tasks:task-list-create')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_second_request_skips_user_query(self):
+        with self.assertNumQueries(3): # user lookup + ETag aggregate + task list
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        cache.clear() # Not the cached task list response
+        with self.assertNumQueries(2): # no user lookup: ETag aggregate + task list
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deactivating_user_invalidates_cache(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_cached_copies_are_independent(self):
+        user_cache.set(self.user.pk, self.user)
+        first = user_cache.get(self.user.pk)
+        first.username = 'changed'
+        self.assertEqual(user_cache.get(self.user.pk).username, 'owner')
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class EmailOrUsernameBackendTests(TestCase):
+    """
+    Tests for the single login backend: one lookup and one hash per attempt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            cls.user = User.objects.create_user(email='Owner@Example.com', username='Owner', password='pass12345')
+
+    def count_hashes(self, **credentials):
+        with mock.patch.object(PasswordHashingService, 'encode', autospec=True,
+                               side_effect=PasswordHashingService.encode) as encode:
+            with self.assertNumQueries(1):
+                user = authenticate(**credentials)
+        return user, encode.call_count
+
+    def test_login_by_username_or_email_any_case(self):
+        for identifier in ['Owner', 'owner', 'OWNER', 'owner@example.com', 'Owner@Example.com']:
+            user, hashes = self.count_hashes(username=identifier, password='pass12345')
+            self.assertEqual(user, self.user, identifier)
+            self.assertEqual(hashes, 1)
+
+    def test_failed_logins_hash_once(self):
+        self.assertEqual(self.count_hashes(username='owner', password='wrong'), (None, 1))
+        self.assertEqual(self.count_hashes(username='nobody', password='pass12345'), (None, 1))
+
+    def test_lookup_uses_lower_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN output is checked for SQLite only.')
+        with CaptureQueriesContext(connection) as queries:
+            authenticate(username='owner', password='pass12345')
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries.captured_queries[0]['sql'])
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('user_username_lower_uniq', plan)
+        self.assertIn('user_email_lower_uniq', plan)
+        self.assertNotIn('SCAN users_customuser', plan)
+
+    def test_usernames_and_emails_are_unique_ignoring_case(self):
+        response = self.client.post(reverse('users:register'), {
+            'username': 'OWNER', 'email': 'OWNER@example.com', 'password': 'pass12345', 'password2': 'pass12345',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            'username': ['A user with that username already exists.'],
+            'email': ['A user with that email address already exists.'],
+        })
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(email='other@example.com', username='owner', password='pass12345')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(email='owner@EXAMPLE.COM', username='other', password='pass12345')
+
+    def test_hash_is_upgraded_on_login(self):
+        self.assertIn('$1000$', self.user.password)
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1200):
+            self.assertEqual(authenticate(username='owner', password='pass12345'), self.user)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1200$'))
+            self.assertEqual(authenticate(username='owner', password='pass12345'), self.user)
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class PasswordHashingServiceTests(TestCase):
+    """
+    Tests for hashing in the bounded process pool, its fallbacks and its backpressure.
+    """
+
+    def test_pool_hashes_match_django(self):
+        encoded = password_hashing.make_password('pass12345')
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(hashers.check_password('pass12345', encoded))
+        self.assertIsNotNone(password_hashing.executor)
+
+        django_encoded = hashers.make_password('pass12345')
+        self.assertEqual(password_hashing.verify_password('pass12345', django_encoded), (True, False))
+        self.assertEqual(password_hashing.verify_password('wrong', django_encoded), (False, False))
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1200):
+            self.assertEqual(password_hashing.verify_password('pass12345', django_encoded), (True, True))
+
+    def test_unusable_and_foreign_hashes_use_django(self):
+        self.assertFalse(hashers.is_password_usable(password_hashing.make_password(None)))
+        self.assertEqual(password_hashing.verify_password('pass12345', '!unusable'), (False, False))
+        sha1 = hashers.PBKDF2SHA1PasswordHasher().encode('pass12345', 'salt', 1000)
+        self.assertEqual(password_hashing.verify_password('pass12345', sha1), (True, True))
+        md5 = hashers.MD5PasswordHasher().encode('pass12345', 'salt')
+        with override_settings(PASSWORD_HASHERS=[*settings.PASSWORD_HASHERS, 'django.contrib.auth.hashers.MD5PasswordHasher']):
+            self.assertEqual(password_hashing.verify_password('pass12345', md5), (True, True))
+
+    @override_settings(PASSWORD_HASHING_WORKERS=0)
+    def test_no_workers_hashes_in_thread(self):
+        with mock.patch('users.hashers.ProcessPoolExecutor') as executor:
+            encoded = password_hashing.make_password('pass12345')
+        executor.assert_not_called()
+        self.assertEqual(password_hashing.verify_password('pass12345', encoded), (True, False))
+
+    def test_broken_pool_falls_back_to_thread(self):
+        executor = mock.Mock(**{'submit.side_effect': BrokenProcessPool})
+        with mock.patch.object(PasswordHashingService, 'get_pool', return_value=(executor, BoundedSemaphore(1))), \
+                mock.patch.object(PasswordHashingService, 'shutdown') as shutdown:
+            encoded = password_hashing.make_password('pass12345')
+        shutdown.assert_called_once()
+        self.assertTrue(hashers.check_password('pass12345', encoded))
+
+    def full_pool(self):
+        slots = BoundedSemaphore(1)
+        slots.acquire()
+        return mock.patch.object(PasswordHashingService, 'get_pool', return_value=(mock.Mock(), slots))
+
+    def test_full_queue_returns_503(self):
+        User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+        for name in ['users:login', 'users_async:login']:
+            with self.full_pool():
+                response = self.client.post(reverse(name), {'username': 'owner', 'password': 'pass12345'},
+                                            content_type='application/json')
+            self.assertEqual(response.status_code, 503, name)
+            self.assertEqual(response['Retry-After'], '1')
+            self.assertEqual(response.json()['detail'], 'Too many password checks in progress. Try again shortly.')
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class AsyncUserViewsTests(TestCase):
+    """
+    Tests for the ASGI-native register and login views.
+    """
+
+    async def test_register_then_login(self):
+        response = await self.async_client.post(reverse('users_async:register'), {
+            'username': 'newbie', 'email': 'Newbie@EXAMPLE.com', 'password': 'pass12345', 'password2': 'pass12345',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user'], {'username': 'newbie', 'email': 'Newbie@example.com'})
+
+        response = await self.async_client.post(reverse('users_async:login'), {
+            'username': 'NEWBIE@example.com', 'password': 'pass12345',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+
+    async def test_errors_match_sync_views(self):
+        await User.objects.acreate(username='taken', email='taken@example.com')
+        for name, data in [
+            ('register', {'username': 'taken', 'email': 'x@example.com', 'password': 'a', 'password2': 'b'}),
+            ('login', {'username': 'taken', 'password': 'wrong'}),
+            ('login', {'username': 'taken'}),
+        ]:
+            sync = await sync_to_async(self.client.post)(reverse(f'users:{name}'), data, content_type='application/json')
+            response = await self.async_client.post(reverse(f'users_async:{name}'), data, content_type='application/json')
+            self.assertEqual(response.status_code, sync.status_code, data)
+            self.assertEqual(response.json(), sync.json(), data)
+
+    async def test_outdated_hash_is_upgraded(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=900):
+            user = await sync_to_async(User.objects.create_user)('old@example.com', 'old', 'pass12345')
+        response = await self.async_client.post(reverse('users_async:login'), {
+            'username': 'old', 'password': 'pass12345',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        await user.arefresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+
+class TokenRevocationTests(APITestCase):
+    """
+    Tests for refresh token rotation, logout and the revocation store.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='pass12345')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+
+    def post(self, name, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(name), data, format='json')
+
+    def test_refresh_tokens_work_once(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        response = self.post('token_refresh', {'refresh': refresh})
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()['refresh']
+        self.assertNotEqual(rotated, refresh)
+        self.assertEqual(self.post('token_refresh', {'refresh': refresh}).status_code, 401)
+        self.assertEqual(self.post('token_refresh', {'refresh': rotated}).status_code, 200)
+
+    def test_logout_revokes_the_refresh_token(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        self.assertEqual(self.post('users:logout', {'refresh': refresh}).status_code, 200)
+        self.assertEqual(self.post('users:logout', {'refresh': refresh}).status_code, 200)
+        response = self.post('token_refresh', {'refresh': refresh})
+        self.assertEqual((response.status_code, response.json()['detail']), (401, 'Token is revoked'))
+        self.assertEqual(self.post('token_verify', {'token': refresh}).status_code, 401)
+        self.assertEqual(self.post('users:logout', {'refresh': 'not-a-token'}).status_code, 401)
+        access = str(AccessToken.for_user(self.user))
+        self.assertEqual(self.post('users:logout', {'refresh': access}).status_code, 401)
+
+    def test_checks_skip_the_database_unless_the_filter_matches(self):
+        self.post('token_verify', {'token': str(AccessToken.for_user(self.user))}) # Builds the filter
+        revoked = RefreshToken.for_user(self.user)
+        self.post('users:logout', {'refresh': str(revoked)})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.post('token_verify', {'token': str(AccessToken.for_user(self.user))}).status_code, 200)
+        with self.assertNumQueries(1): # Confirms the filter's match
+            self.assertEqual(self.post('token_verify', {'token': str(revoked)}).status_code, 401)
+
+    def test_revocations_reach_other_processes(self):
+        worker, other = RevocationStore(), RevocationStore()
+        self.assertFalse(other.is_revoked('jti-1'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(worker.revoke('jti-1', timezone.now() + datetime.timedelta(hours=1)))
+            self.assertFalse(worker.revoke('jti-1', timezone.now() + datetime.timedelta(hours=1)))
+        with self.assertNumQueries(1): # Learnt from the cache; only the match is confirmed
+            self.assertTrue(other.is_revoked('jti-1'))
+        cache.clear()
+        with self.assertNumQueries(2): # Rebuilt from the table, then confirmed
+            self.assertTrue(other.is_revoked('jti-1'))
+
+        RevokedToken.objects.create(jti='jti-0', expires_at=timezone.now())
+        out = io.StringIO()
+        call_command('prune_revoked_tokens', stdout=out)
+        self.assertIn('Deleted 1 expired', out.getvalue())
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['jti-1'])
+
+    def test_filters_are_rebuilt_without_a_shared_cache(self):
+        worker, other = RevocationStore(), RevocationStore()
+        self.assertFalse(other.is_revoked('jti-1'))
+        # As with a per-process cache: the other process never sees the log entry.
+        with mock.patch.object(worker, 'publish'), self.captureOnCommitCallbacks(execute=True):
+            worker.revoke('jti-1', timezone.now() + datetime.timedelta(hours=1))
+        self.assertFalse(other.is_revoked('jti-1')) # Until the filter is REVOCATION_FILTER_TTL old
+        with override_settings(REVOCATION_FILTER_TTL=0):
+            self.assertTrue(other.is_revoked('jti-1'))
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000)
+        for i in range(1000):
+            bloom.add(f'added-{i}')
+        self.assertTrue(all(f'added-{i}' in bloom for i in range(1000)))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 50) # 0.1% expected
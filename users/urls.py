@@ -1,7 +1,7 @@
 # ~/Alx_CapstoneProject/users/urls.py
 
 from django.urls import path
-from .views import UserRegisterView, UserLoginView # Import your user authentication views
+from .views import UserRegisterView, UserLoginView, UserLogoutView # Import your user authentication views
 
 app_name = 'users' # Namespace for the users app URLs
 
@@ -10,5 +10,7 @@ urlpatterns = [
     path('register/', UserRegisterView.as_view(), name='register'),
     # User Login API endpoint
     path('login/', UserLoginView.as_view(), name='login'),
-    # Add other user-related API endpoints here (e.g., logout, profile update)
+    # User Logout API endpoint (revokes the refresh token)
+    path('logout/', UserLogoutView.as_view(), name='logout'),
+    # Add other user-related API endpoints here (e.g., profile update)
 ]
\ No newline at end of file
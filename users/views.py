@@ -3,7 +3,8 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from .serializers import UserRegisterSerializer, UserLoginSerializer # Import both serializers
+from rest_framework_simplejwt.views import TokenObtainPairView
+from .serializers import UserRegisterSerializer, UserLoginSerializer, UserLogoutSerializer
 
 # User Registration View
 class UserRegisterView(generics.CreateAPIView):
@@ -13,6 +14,7 @@ class UserRegisterView(generics.CreateAPIView):
     """
     serializer_class = UserRegisterSerializer
     permission_classes = [AllowAny] # Allow any user (even unauthenticated) to register
+    throttle_scope = 'register' # Rate limited per IP (REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'])
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -31,6 +33,8 @@ class UserLoginView(generics.GenericAPIView):
     """
     serializer_class = UserLoginSerializer # Use the UserLoginSerializer
     permission_classes = [AllowAny] # Allow any user (even unauthenticated) to login
+    throttle_scope = 'login' # Rate limited per IP and per username, before any password is hashed
+    throttle_username_field = 'username'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -46,4 +50,28 @@ class UserLoginView(generics.GenericAPIView):
             "refresh": tokens['refresh'],
         }, status=status.HTTP_200_OK)
 
+# User Logout View
+class UserLogoutView(generics.GenericAPIView):
+    """
+    API view for user logout.
+    Revokes the given refresh token, so no new access token can be obtained with it.
+    Access tokens already issued stay valid until they expire (ACCESS_TOKEN_LIFETIME).
+    """
+    serializer_class = UserLogoutSerializer
+    permission_classes = [AllowAny] # The refresh token is the credential; the access token may have expired
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response({"message": "Logout Successful"}, status=status.HTTP_200_OK)
+
+# JWT obtain-pair view, rate limited like UserLoginView
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    simplejwt's TokenObtainPairView with the login rate limits: per IP and per username.
+    """
+    throttle_scope = 'token'
+    throttle_username_field = 'username'
+
 # Add other user-related views here as needed, e.g., UserProfileView, PasswordResetView, etc.